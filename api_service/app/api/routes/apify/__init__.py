@@ -8,5 +8,6 @@ __all__ = [
     "router",
     "tiktok",
     "facebook",
-    "instagram"
+    "instagram",
+    "webhooks"
 ]
@@ -64,3 +64,17 @@ except Exception as e:
 
     print("WARNING: Instagram routes not available:")
     print(traceback.format_exc())
+
+try:
+    from .webhooks import router as webhooks_router
+    router.include_router(
+        webhooks_router,
+        # POST /webhook (destino de los webhooks de Apify)
+        prefix="/webhook"
+    )
+# si hay un error al importar, muestra una advertencia
+except Exception as e:
+    import traceback
+
+    print("WARNING: Webhook routes not available:")
+    print(traceback.format_exc())
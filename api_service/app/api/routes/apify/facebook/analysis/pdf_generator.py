@@ -17,6 +17,32 @@ from typing import Dict, Any, List
 from datetime import datetime
 import json
 
+# Estilos de las tablas de puntuaciones: se repiten por cada video/anuncio,
+# así que se construyen una sola vez
+_VIDEO_SCORE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+_AD_SCORE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3949ab')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1),
+     [colors.white, colors.HexColor('#f5f5f5')]),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+])
+
 
 def parse_analysis_json(analysis_json: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -239,17 +265,7 @@ def create_pdf_from_analysis(
 
                         score_table = Table(
                             score_data, colWidths=[3*inch, 1*inch])
-                        score_table.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                            ('ALIGN', (1, 1), (1, -1), 'CENTER'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('FONTSIZE', (0, 0), (-1, 0), 10),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                        ]))
+                        score_table.setStyle(_VIDEO_SCORE_TABLE_STYLE)
                         story.append(score_table)
                         story.append(Spacer(1, 0.1*inch))
 
@@ -356,19 +372,7 @@ def create_pdf_from_analysis(
                         score_data.append([metric_name, str(score)])
 
                     score_table = Table(score_data, colWidths=[10*cm, 3*cm])
-                    score_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0),
-                         colors.HexColor('#3949ab')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 9),
-                        ('ALIGN', (1, 1), (1, -1), 'CENTER'),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1),
-                         [colors.white, colors.HexColor('#f5f5f5')]),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ]))
+                    score_table.setStyle(_AD_SCORE_TABLE_STYLE)
 
                     story.append(score_table)
                     story.append(Spacer(1, 0.1*inch))
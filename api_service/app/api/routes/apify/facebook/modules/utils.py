@@ -3,11 +3,27 @@ Utilidades compartidas para los módulos de Facebook
 """
 
 from pathlib import Path
+from typing import Tuple
 import os
 
-# Rutas base
-repo_root = Path(__file__).resolve().parents[7]
-api_root = Path(__file__).resolve().parents[6]
+# Rutas base (__file__ se canonicaliza una sola vez)
+_THIS = Path(os.path.realpath(__file__))
+api_root = _THIS.parents[6]
+repo_root = api_root.parent
+
+
+# Ubicaciones candidatas de los datasets, construidas una sola vez
+_FB_BASE_CANDIDATES: Tuple[Path, ...] = (
+    # Nueva estructura: storage/facebook
+    api_root / 'storage' / 'facebook',
+    # Compatibilidad con estructura antigua
+    api_root / 'datasets' / 'datasets' / 'saved_datasets' / 'facebook',
+    api_root / 'datasets' / 'saved_datasets' / 'facebook',
+    repo_root / 'api_service' / 'storage' / 'facebook',
+    repo_root / 'api_service' / 'datasets' /
+    'datasets' / 'saved_datasets' / 'facebook',
+    repo_root / 'api_service' / 'datasets' / 'saved_datasets' / 'facebook',
+)
 
 
 def get_facebook_saved_base() -> Path:
@@ -15,21 +31,10 @@ def get_facebook_saved_base() -> Path:
     Resuelve la carpeta base donde están los datasets guardados de Facebook.
     NUEVA UBICACIÓN: storage/facebook/
     """
-    candidates = [
-        # Nueva estructura: storage/facebook
-        api_root / 'storage' / 'facebook',
-        # Compatibilidad con estructura antigua
-        api_root / 'datasets' / 'datasets' / 'saved_datasets' / 'facebook',
-        api_root / 'datasets' / 'saved_datasets' / 'facebook',
-        repo_root / 'api_service' / 'storage' / 'facebook',
-        repo_root / 'api_service' / 'datasets' /
-        'datasets' / 'saved_datasets' / 'facebook',
-        repo_root / 'api_service' / 'datasets' / 'saved_datasets' / 'facebook',
-    ]
-    for c in candidates:
+    for c in _FB_BASE_CANDIDATES:
         try:
             if c.exists():
                 return c
         except Exception:
             continue
-    return candidates[0]
+    return _FB_BASE_CANDIDATES[0]
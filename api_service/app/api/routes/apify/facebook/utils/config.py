@@ -3,40 +3,43 @@ Configuration and utility functions for Facebook routes
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
-# Ruta al root del repo (para resolver rutas relativas desde api_service)
-repo_root = Path(__file__).resolve().parents[7]
+# Se canonicaliza __file__ una sola vez; ambas rutas se derivan de ahí
+_THIS = Path(os.path.realpath(__file__))
 # Ruta al api_service (carpeta donde se ejecuta la app)
-api_root = Path(__file__).resolve().parents[6]
+api_root = _THIS.parents[6]
+# Ruta al root del repo (para resolver rutas relativas desde api_service)
+repo_root = api_root.parent
+
+
+# Ubicaciones candidatas de los datasets de Facebook, en orden de prioridad.
+# Se construyen una sola vez al importar el módulo.
+_FB_BASE_CANDIDATES: Tuple[Path, ...] = (
+    # Ubicación en app/processors (donde está actualmente)
+    api_root / 'app' / 'processors' / 'datasets' / 'saved_datasets' / 'facebook',
+    # Nueva estructura: storage/facebook
+    api_root / 'storage' / 'facebook',
+    # Compatibilidad con estructura antigua
+    api_root / 'datasets' / 'datasets' / 'saved_datasets' / 'facebook',
+    api_root / 'datasets' / 'saved_datasets' / 'facebook',
+    repo_root / 'api_service' / 'app' / 'processors' /
+    'datasets' / 'saved_datasets' / 'facebook',
+    repo_root / 'api_service' / 'storage' / 'facebook',
+    repo_root / 'api_service' / 'datasets' /
+    'datasets' / 'saved_datasets' / 'facebook',
+    repo_root / 'api_service' / 'datasets' / 'saved_datasets' / 'facebook',
+)
 
 
 def get_facebook_saved_base() -> Path:
     """Resuelve la carpeta base donde están los datasets guardados de Facebook.
     NUEVA UBICACIÓN: storage/facebook/
     """
-    candidates = [
-        # Ubicación en app/processors (donde está actualmente)
-        api_root / 'app' / 'processors' / 'datasets' / 'saved_datasets' / 'facebook',
-        # Nueva estructura: storage/facebook
-        api_root / 'storage' / 'facebook',
-        # Compatibilidad con estructura antigua
-        api_root / 'datasets' / 'datasets' / 'saved_datasets' / 'facebook',
-        api_root / 'datasets' / 'saved_datasets' / 'facebook',
-        repo_root / 'api_service' / 'app' / 'processors' /
-        'datasets' / 'saved_datasets' / 'facebook',
-        repo_root / 'api_service' / 'storage' / 'facebook',
-        repo_root / 'api_service' / 'datasets' /
-        'datasets' / 'saved_datasets' / 'facebook',
-        repo_root / 'api_service' / 'datasets' / 'saved_datasets' / 'facebook',
-    ]
-    for c in candidates:
+    for c in _FB_BASE_CANDIDATES:
         try:
             if c.exists():
                 return c
         except Exception:
             continue
-    return candidates[0]
-
-
-
+    return _FB_BASE_CANDIDATES[0]
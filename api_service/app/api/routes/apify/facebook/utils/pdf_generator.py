@@ -1,58 +1,180 @@
- """
+"""
 Generador de reportes PDF usando ReportLab
 Soporta estructura JSON forense detallada y legacy
+Motor alternativo fpdf2 seleccionable con PDF_ENGINE=fpdf2
+
+El contenido lineal (títulos, párrafos, bullets) se dibuja directamente con
+canvas.Canvas; solo las tablas usan Flowables (Table) para su layout.
 """
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Table, TableStyle
+
+logger = logging.getLogger(__name__)
+
+
+class _TextStyle(NamedTuple):
+    """Estilo de texto para el dibujado directo sobre canvas"""
+    font: str
+    size: float
+    leading: float
+    color: colors.Color = colors.black
+    space_before: float = 0
+    space_after: float = 0
+    indent: float = 0
+    centered: bool = False
+
+
+# Estilos
+_TITLE = _TextStyle(
+    'Helvetica-Bold', 18, 22, colors.HexColor('#1a1a2e'),
+    space_after=20, centered=True
+)
+_H2 = _TextStyle(
+    'Helvetica-Bold', 14, 18, colors.HexColor('#16213e'),
+    space_before=12, space_after=12
 )
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+_H3 = _TextStyle(
+    'Helvetica-BoldOblique', 12, 14, colors.HexColor('#0f3460'),
+    space_before=12, space_after=8
+)
+_NORMAL = _TextStyle('Helvetica', 10, 14, space_before=6)
+_BULLET = _NORMAL._replace(indent=20)
+
+# Campos de visual_forensics que se muestran, en orden
+_VF_LABELS = (
+    ('composition', 'Composición'),
+    ('lighting_color', 'Iluminación'),
+    ('subjects_elements', 'Sujetos'),
+)
+
+
+class _CanvasWriter:
+    """Escribe el reporte de arriba hacia abajo directamente sobre el canvas"""
+
+    def __init__(self, output_path: Path):
+        self.c = canvas.Canvas(str(output_path), pagesize=A4)
+        self.left = 0.75*inch
+        self.width = A4[0] - 1.5*inch
+        self.top = A4[1] - inch
+        self.bottom = inch
+        self.y = self.top
+
+    def page_break(self):
+        """Cierra la página actual (si tiene contenido) y abre otra"""
+        if self.y < self.top:
+            self.c.showPage()
+            self.y = self.top
+
+    def space(self, height: float):
+        self.y -= height
+        if self.y < self.bottom:
+            self.page_break()
+
+    def _wrap(self, text: str, font: str, size: float,
+              first_width: float, width: float) -> List[str]:
+        lines = []
+        current = ''
+        avail = first_width
+        for word in text.split():
+            candidate = f"{current} {word}" if current else word
+            if not current or stringWidth(candidate, font, size) <= avail:
+                current = candidate
+            else:
+                lines.append(current)
+                current = word
+                avail = width
+        if current or not lines:
+            lines.append(current)
+        return lines
+
+    def text(self, text, style: _TextStyle = _NORMAL,
+             label: Optional[str] = None):
+        """Dibuja un párrafo con ajuste de línea; label va en negrita"""
+        if self.y < self.top:
+            self.y -= style.space_before
+        x = self.left + style.indent
+        width = self.width - style.indent
+        bold = 'Helvetica-Bold'
+        label_w = 0
+        if label:
+            label = f"{label} "
+            label_w = stringWidth(label, bold, style.size)
+
+        lines = self._wrap(
+            str(text), style.font, style.size, width - label_w, width
+        )
+        self.c.setFillColor(style.color)
+        for i, line in enumerate(lines):
+            if self.y - style.leading < self.bottom:
+                self.page_break()
+            self.y -= style.leading
+            baseline = self.y + (style.leading - style.size)
+            if style.centered:
+                self.c.setFont(style.font, style.size)
+                self.c.drawCentredString(
+                    self.left + self.width / 2, baseline, line
+                )
+                continue
+            line_x = x
+            if i == 0 and label:
+                self.c.setFont(bold, style.size)
+                self.c.drawString(x, baseline, label)
+                line_x += label_w
+            self.c.setFont(style.font, style.size)
+            self.c.drawString(line_x, baseline, line)
+        self.y -= style.space_after
+
+    def table(self, table: Table):
+        """Dibuja una tabla (Flowable) en la posición actual"""
+        width, height = table.wrapOn(
+            self.c, self.width, self.top - self.bottom
+        )
+        if self.y - height < self.bottom:
+            self.page_break()
+        x = self.left + (self.width - width) / 2
+        table.drawOn(self.c, x, self.y - height)
+        self.y -= height
+
+    def save(self):
+        self.c.save()
 
 
 def generar_reporte_pdf(json_data: dict, output_path: Path) -> Path:
     """Genera PDF forense completo desde JSON de OpenAI"""
-    doc = SimpleDocTemplate(
-        str(output_path), pagesize=A4,
-        leftMargin=0.75*inch, rightMargin=0.75*inch
-    )
-    elements = []
-    styles = getSampleStyleSheet()
-
-    # Estilos
-    title = ParagraphStyle(
-        'Title', parent=styles['Heading1'], alignment=TA_CENTER,
-        textColor=colors.HexColor('#1a1a2e'), fontSize=18, spaceAfter=20
-    )
-    h2 = ParagraphStyle(
-        'H2', parent=styles['Heading2'],
-        textColor=colors.HexColor('#16213e'), fontSize=14, spaceAfter=12
-    )
-    h3 = ParagraphStyle(
-        'H3', parent=styles['Heading3'],
-        textColor=colors.HexColor('#0f3460'), fontSize=12, spaceAfter=8
-    )
-    normal = ParagraphStyle(
-        'Normal', parent=styles['BodyText'],
-        alignment=TA_JUSTIFY, fontSize=10, leading=14
-    )
-    bullet = ParagraphStyle(
-        'Bullet', parent=normal, leftIndent=20, bulletIndent=10
-    )
-
-    # Detectar estructura
-    is_forensic = 'assets_analysis' in json_data
-    is_legacy = 'comparative_analysis' in json_data
+    if os.getenv('PDF_ENGINE', 'reportlab').lower() == 'fpdf2':
+        try:
+            from .pdf_generator_fpdf2 import (
+                generar_reporte_pdf as generar_reporte_pdf_fpdf2
+            )
+        except ImportError:
+            logger.warning(
+                "PDF_ENGINE=fpdf2 pero fpdf2 no está instalado, usando ReportLab"
+            )
+        else:
+            return generar_reporte_pdf_fpdf2(json_data, output_path)
+
+    pdf = _CanvasWriter(output_path)
+
+    # Detectar estructura (una sola pasada sobre las claves)
+    keys = json_data.keys()
+    is_forensic = 'assets_analysis' in keys
+    is_legacy = 'comparative_analysis' in keys
+    exec_summary = json_data.get('executive_summary')
+    meta = json_data.get('metadata') if is_forensic else None
 
     # METADATA
-    if is_forensic and 'metadata' in json_data:
-        meta = json_data['metadata']
-        elements.append(
-            Paragraph(meta.get('report_title', 'Análisis Forense'), title)
-        )
+    if meta:
+        pdf.text(meta.get('report_title', 'Análisis Forense'), _TITLE)
         meta_table = Table([
             ['Fecha:', meta.get('date', 'N/A')],
             ['Analista:', meta.get('analyst', 'N/A')],
@@ -63,104 +185,78 @@ def generar_reporte_pdf(json_data: dict, output_path: Path) -> Path:
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
         ]))
-        elements.append(meta_table)
+        pdf.table(meta_table)
     else:
-        elements.append(
-            Paragraph(
-                f"Análisis: {json_data.get('campaign_name', 'N/A')}", title
-            )
-        )
-    elements.append(Spacer(1, 20))
+        pdf.text(f"Análisis: {json_data.get('campaign_name', 'N/A')}", _TITLE)
+    pdf.space(20)
 
     # RESUMEN EJECUTIVO
-    elements.append(Paragraph("Resumen Ejecutivo", h2))
-    if is_forensic and isinstance(json_data.get('executive_summary'), dict):
+    pdf.text("Resumen Ejecutivo", _H2)
+    if is_forensic and isinstance(exec_summary, dict):
         for k in ['overview', 'key_patterns', 'critical_findings']:
-            if k in json_data['executive_summary']:
-                elements.append(
-                    Paragraph(json_data['executive_summary'][k], normal)
-                )
-                elements.append(Spacer(1, 10))
+            if k in exec_summary:
+                pdf.text(exec_summary[k])
+                pdf.space(10)
     else:
-        elements.append(
-            Paragraph(
-                json_data.get('executive_summary', 'No disponible'), normal
-            )
-        )
-    elements.append(Spacer(1, 20))
+        pdf.text(exec_summary or 'No disponible')
+    pdf.space(20)
 
     # ANÁLISIS DE ACTIVOS (FORENSIC)
-    if is_forensic and 'assets_analysis' in json_data:
-        elements.append(PageBreak())
-        elements.append(Paragraph("Análisis Detallado de Activos", h2))
-
-        for idx, asset in enumerate(json_data['assets_analysis'], 1):
-            elements.append(
-                Paragraph(
-                    f"Activo #{idx}: {asset.get('file_name', 'N/A')}", h3
-                )
-            )
+    if is_forensic:
+        pdf.page_break()
+        pdf.text("Análisis Detallado de Activos", _H2)
+
+        assets = json_data['assets_analysis']
+        for idx, asset in enumerate(assets, 1):
+            get = asset.get
+            vf = get('visual_forensics')
+            sa = get('semiotic_analysis')
+            pt = get('psychological_triggers')
+            es = get('effectiveness_scores')
+            roadmap = get('optimization_roadmap')
+
+            pdf.text(f"Activo #{idx}: {get('file_name', 'N/A')}", _H3)
 
             # Info básica
             info = Table([
-                ['ID:', asset.get('asset_id', 'N/A')],
-                ['Tipo:', asset.get('asset_type', 'N/A')]
+                ['ID:', get('asset_id', 'N/A')],
+                ['Tipo:', get('asset_type', 'N/A')]
             ], colWidths=[1*inch, 4.5*inch])
             info.setStyle(TableStyle([
                 ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
                 ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
             ]))
-            elements.append(info)
-            elements.append(Spacer(1, 12))
+            pdf.table(info)
+            pdf.space(12)
 
             # Visual Forensics
-            if 'visual_forensics' in asset:
-                elements.append(
-                    Paragraph("<b>Análisis Visual:</b>", normal)
-                )
-                vf = asset['visual_forensics']
-                for key, label in [
-                    ('composition', 'Composición'),
-                    ('lighting_color', 'Iluminación'),
-                    ('subjects_elements', 'Sujetos')
-                ]:
-                    if key in vf:
-                        elements.append(
-                            Paragraph(f"• <b>{label}:</b> {vf[key]}", bullet)
-                        )
-                elements.append(Spacer(1, 10))
+            if vf:
+                pdf.text("", label="Análisis Visual:")
+                for key, label in _VF_LABELS:
+                    if (value := vf.get(key)) is not None:
+                        pdf.text(value, _BULLET, label=f"• {label}:")
+                pdf.space(10)
 
             # Semiótica
-            if 'semiotic_analysis' in asset:
-                elements.append(Paragraph("<b>Semiótica:</b>", normal))
-                sa = asset['semiotic_analysis']
-                for key in sa:
-                    elements.append(
-                        Paragraph(f"• <b>{key}:</b> {sa[key]}", bullet)
-                    )
-                elements.append(Spacer(1, 10))
+            if sa:
+                pdf.text("", label="Semiótica:")
+                for key, value in sa.items():
+                    pdf.text(value, _BULLET, label=f"• {key}:")
+                pdf.space(10)
 
             # Triggers
-            if 'psychological_triggers' in asset:
-                elements.append(Paragraph("<b>Triggers:</b>", normal))
-                pt = asset['psychological_triggers']
-                elements.append(
-                    Paragraph(
-                        f"• Principal: {pt.get('primary_trigger', 'N/A')}",
-                        bullet
-                    )
+            if pt:
+                pdf.text("", label="Triggers:")
+                pdf.text(
+                    f"• Principal: {pt.get('primary_trigger', 'N/A')}",
+                    _BULLET
                 )
-                elements.append(
-                    Paragraph(
-                        f"• {pt.get('trigger_explanation', 'N/A')}", bullet
-                    )
-                )
-                elements.append(Spacer(1, 10))
+                pdf.text(f"• {pt.get('trigger_explanation', 'N/A')}", _BULLET)
+                pdf.space(10)
 
             # Scores
-            if 'effectiveness_scores' in asset:
-                elements.append(Paragraph("<b>Efectividad:</b>", normal))
-                es = asset['effectiveness_scores']
+            if es:
+                pdf.text("", label="Efectividad:")
                 scores = Table([
                     ['Métrica', 'Score'],
                     ['Stopping Power', str(es.get('stopping_power', '-'))],
@@ -177,34 +273,29 @@ def generar_reporte_pdf(json_data: dict, output_path: Path) -> Path:
                     ('GRID', (0, 0), (-1, -1), 1, colors.grey),
                     ('ALIGN', (1, 0), (1, -1), 'CENTER'),
                 ]))
-                elements.append(scores)
-                elements.append(Spacer(1, 10))
+                pdf.table(scores)
+                pdf.space(10)
 
             # Optimización
-            if 'optimization_roadmap' in asset:
-                elements.append(Paragraph("<b>Optimización:</b>", normal))
-                for o in asset['optimization_roadmap']:
+            if roadmap:
+                pdf.text("", label="Optimización:")
+                for o in roadmap:
                     pri = o.get('priority', 'MEDIA')
-                    elements.append(
-                        Paragraph(
-                            f"<b>[{pri}]</b> {o.get('action', '')}", bullet)
-                    )
-                    elements.append(Spacer(1, 5))
+                    pdf.text(o.get('action', ''), _BULLET, label=f"[{pri}]")
+                    pdf.space(5)
 
-            elements.append(Spacer(1, 20))
+            pdf.space(20)
 
     # ANÁLISIS LEGACY
-    elif is_legacy and 'comparative_analysis' in json_data:
+    elif is_legacy:
         for video in json_data['comparative_analysis']:
             color = (
                 colors.green if "Ganador" in video.get('status', '')
                 else colors.red
             )
-            elements.append(
-                Paragraph(
-                    f"{video.get('status', '')} (ID: {video.get('ad_id', '')})",
-                    ParagraphStyle('S', parent=h3, textColor=color)
-                )
+            pdf.text(
+                f"{video.get('status', '')} (ID: {video.get('ad_id', '')})",
+                _H3._replace(color=color)
             )
 
             # Métricas
@@ -219,57 +310,72 @@ def generar_reporte_pdf(json_data: dict, output_path: Path) -> Path:
                 ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
                 ('GRID', (0, 0), (-1, -1), 1, colors.black),
             ]))
-            elements.append(mt)
-            elements.append(Spacer(1, 10))
+            pdf.table(mt)
+            pdf.space(10)
 
             # Forense
             f = video.get('forensic_analysis', {})
-            elements.append(
-                Paragraph(
-                    f"<b>Hook:</b> {f.get('hook_0_3s', 'N/A')}", normal
-                )
-            )
-            elements.append(
-                Paragraph(f"<b>Audio:</b> {f.get('audio', 'N/A')}", normal)
-            )
-            elements.append(Spacer(1, 15))
+            pdf.text(f.get('hook_0_3s', 'N/A'), label="Hook:")
+            pdf.text(f.get('audio', 'N/A'), label="Audio:")
+            pdf.space(15)
 
     # CONCLUSIONES
-    elements.append(PageBreak())
-    elements.append(Paragraph("Conclusiones", h2))
+    pdf.page_break()
+    pdf.text("Conclusiones", _H2)
 
-    if is_forensic and 'global_conclusions' in json_data:
-        gc = json_data['global_conclusions']
-        for key in gc:
-            elements.append(Paragraph(f"<b>{key}:</b> {gc[key]}", normal))
-            elements.append(Spacer(1, 10))
+    gc = json_data.get('global_conclusions') if is_forensic else None
+    if gc:
+        for key, value in gc.items():
+            pdf.text(value, label=f"{key}:")
+            pdf.space(10)
 
     # Recomendaciones
-    if 'general_recommendations' in json_data:
-        elements.append(Paragraph("Recomendaciones", h2))
-        for rec in json_data['general_recommendations']:
-            elements.append(Paragraph(f"• {rec}", bullet))
+    recommendations = json_data.get('general_recommendations')
+    if recommendations is not None:
+        pdf.text("Recomendaciones", _H2)
+        for rec in recommendations:
+            pdf.text(f"• {rec}", _BULLET)
 
     # ROADMAP
-    if is_forensic and 'strategic_roadmap' in json_data:
-        elements.append(PageBreak())
-        elements.append(Paragraph("Roadmap Estratégico", h2))
-        sr = json_data['strategic_roadmap']
-
-        if 'immediate_actions' in sr:
-            elements.append(Paragraph("<b>Inmediato (48h):</b>", normal))
-            for a in sr['immediate_actions']:
-                elements.append(Paragraph(f"• {a}", bullet))
-            elements.append(Spacer(1, 10))
-
-        if 'short_term_plan' in sr:
-            elements.append(Paragraph("<b>Corto Plazo:</b>", normal))
-            elements.append(Paragraph(sr['short_term_plan'], normal))
-            elements.append(Spacer(1, 10))
-
-        if 'long_term_strategy' in sr:
-            elements.append(Paragraph("<b>Largo Plazo:</b>", normal))
-            elements.append(Paragraph(sr['long_term_strategy'], normal))
-
-    doc.build(elements)
+    sr = json_data.get('strategic_roadmap') if is_forensic else None
+    if sr:
+        pdf.page_break()
+        pdf.text("Roadmap Estratégico", _H2)
+
+        if (immediate := sr.get('immediate_actions')) is not None:
+            pdf.text("", label="Inmediato (48h):")
+            for a in immediate:
+                pdf.text(f"• {a}", _BULLET)
+            pdf.space(10)
+
+        if (short_term := sr.get('short_term_plan')) is not None:
+            pdf.text("", label="Corto Plazo:")
+            pdf.text(short_term)
+            pdf.space(10)
+
+        if (long_term := sr.get('long_term_strategy')) is not None:
+            pdf.text("", label="Largo Plazo:")
+            pdf.text(long_term)
+
+    pdf.save()
     return output_path
+
+
+def generar_reportes_batch(jobs: List[Tuple[dict, Path]]) -> List[Path]:
+    """Genera varios PDFs en paralelo usando un pool de procesos.
+
+    Cada job es una tupla (json_data, output_path). Los resultados se
+    devuelven en el mismo orden que los jobs recibidos.
+    """
+    if not jobs:
+        return []
+    if len(jobs) == 1:
+        return [generar_reporte_pdf(*jobs[0])]
+
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(generar_reporte_pdf, json_data, output_path)
+            for json_data, output_path in jobs
+        ]
+        return [f.result() for f in futures]
@@ -0,0 +1,303 @@
+"""
+Generador de reportes PDF usando fpdf2
+Misma firma y estructura que pdf_generator.py (ReportLab), pensado como
+motor alternativo más rápido. Se activa con PDF_ENGINE=fpdf2
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fpdf import FPDF
+
+# Colores (RGB) equivalentes a los de la versión ReportLab
+TITLE_COLOR = (26, 26, 46)
+H2_COLOR = (22, 33, 62)
+H3_COLOR = (15, 52, 96)
+TEXT_COLOR = (0, 0, 0)
+GREEN = (0, 128, 0)
+RED = (255, 0, 0)
+
+# Fuentes TTF Unicode (comillas tipográficas, €, guiones largos...): las
+# core de fpdf2 solo cubren latin-1. PDF_FONT_PATH / PDF_FONT_BOLD_PATH las
+# sustituyen y PDF_SYMBOL_FONT_PATH añade una fuente de respaldo (emoji)
+_DEJAVU_DIR = Path('/usr/share/fonts/truetype/dejavu')
+_FONT_CANDIDATES = (
+    (_DEJAVU_DIR / 'DejaVuSans.ttf', _DEJAVU_DIR / 'DejaVuSans-Bold.ttf'),
+)
+UNICODE_FAMILY = 'ReportSans'
+SYMBOL_FAMILY = 'ReportSymbol'
+
+
+@lru_cache(maxsize=1)
+def _unicode_fonts() -> Optional[Tuple[Path, Path]]:
+    """(regular, bold) TTF disponibles, o None para usar Helvetica"""
+    env_regular = os.getenv('PDF_FONT_PATH')
+    if env_regular:
+        env_bold = os.getenv('PDF_FONT_BOLD_PATH', env_regular)
+        return Path(env_regular), Path(env_bold)
+
+    candidates = list(_FONT_CANDIDATES)
+    try:  # ReportLab (motor por defecto) incluye Bitstream Vera
+        import reportlab
+        rl_fonts = Path(reportlab.__file__).parent / 'fonts'
+        candidates.append((rl_fonts / 'Vera.ttf', rl_fonts / 'VeraBd.ttf'))
+    except ImportError:
+        pass
+    for regular, bold in candidates:
+        if regular.exists() and bold.exists():
+            return regular, bold
+    return None
+
+
+def _latin1(value) -> str:
+    """Normaliza texto a latin-1 para las fuentes core de fpdf2"""
+    text = str(value).replace('•', '-').replace('–', '-')
+    text = text.replace('—', '-')
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+
+class _ReportePDF(FPDF):
+    """FPDF con helpers de estilo para el reporte forense"""
+
+    def __init__(self):
+        super().__init__(unit='pt', format='A4')
+        self.set_margins(54, 54, 54)  # 0.75 inch
+        self.set_auto_page_break(auto=True, margin=54)
+        fonts = _unicode_fonts()
+        if fonts:
+            regular, bold = fonts
+            self.add_font(UNICODE_FAMILY, '', str(regular))
+            self.add_font(UNICODE_FAMILY, 'B', str(bold))
+            self._family = UNICODE_FAMILY
+            self._txt = str
+            symbol = os.getenv('PDF_SYMBOL_FONT_PATH')
+            if symbol:
+                self.add_font(SYMBOL_FAMILY, '', symbol)
+                self.set_fallback_fonts([SYMBOL_FAMILY])
+        else:
+            self._family = 'Helvetica'
+            self._txt = _latin1
+        self.add_page()
+
+    def doc_title(self, text: str):
+        self.set_font(self._family, 'B', 18)
+        self.set_text_color(*TITLE_COLOR)
+        self.multi_cell(0, 22, self._txt(text), align='C',
+                        new_x='LMARGIN', new_y='NEXT')
+        self.ln(20)
+
+    def h2(self, text: str):
+        self.set_font(self._family, 'B', 14)
+        self.set_text_color(*H2_COLOR)
+        self.multi_cell(0, 18, self._txt(text), new_x='LMARGIN', new_y='NEXT')
+        self.ln(12)
+
+    def h3(self, text: str, color=H3_COLOR):
+        self.set_font(self._family, 'B', 12)
+        self.set_text_color(*color)
+        self.multi_cell(0, 15, self._txt(text), new_x='LMARGIN', new_y='NEXT')
+        self.ln(8)
+
+    def paragraph(self, text: str, label: str = None, indent: float = 0):
+        self.set_text_color(*TEXT_COLOR)
+        # Etiqueta en negrita como fragmento aparte: el texto del modelo
+        # nunca se interpreta como markdown (**, __, -- son literales)
+        with self.text_columns(text_align='J', line_height=1.4,
+                               l_margin=self.l_margin + indent) as cols:
+            with cols.paragraph() as par:
+                if label:
+                    self.set_font(self._family, 'B', 10)
+                    par.write(f"{self._txt(label)} ")
+                self.set_font(self._family, '', 10)
+                par.write(self._txt(text))
+
+    def bullet(self, text: str, label: str = None):
+        if label:
+            self.paragraph(text, label=f"- {label}:", indent=20)
+        else:
+            self.paragraph(f"- {text}", indent=20)
+
+    def bold_line(self, text: str):
+        self.set_font(self._family, 'B', 10)
+        self.set_text_color(*TEXT_COLOR)
+        self.multi_cell(0, 14, self._txt(text), new_x='LMARGIN', new_y='NEXT')
+
+    def table(self, rows, col_widths, header: bool = False,
+              header_fill=None, header_text=(255, 255, 255), border=1):
+        self.set_text_color(*TEXT_COLOR)
+        for i, row in enumerate(rows):
+            is_header = header and i == 0
+            if is_header and header_fill:
+                self.set_fill_color(*header_fill)
+                self.set_text_color(*header_text)
+            for j, (cell, width) in enumerate(zip(row, col_widths)):
+                bold = is_header or (not header and j == 0)
+                self.set_font(self._family, 'B' if bold else '', 9)
+                self.cell(width, 16, self._txt(cell), border=border,
+                          fill=bool(is_header and header_fill),
+                          align='C' if header and j > 0 else 'L')
+            self.ln(16)
+            if is_header and header_fill:
+                self.set_text_color(*TEXT_COLOR)
+
+
+def generar_reporte_pdf(json_data: dict, output_path: Path) -> Path:
+    """Genera PDF forense completo desde JSON de OpenAI (motor fpdf2)"""
+    pdf = _ReportePDF()
+
+    # Detectar estructura
+    is_forensic = 'assets_analysis' in json_data
+    is_legacy = 'comparative_analysis' in json_data
+
+    # METADATA
+    if is_forensic and 'metadata' in json_data:
+        meta = json_data['metadata']
+        pdf.doc_title(meta.get('report_title', 'Análisis Forense'))
+        pdf.table([
+            ['Fecha:', meta.get('date', 'N/A')],
+            ['Analista:', meta.get('analyst', 'N/A')],
+            ['Assets:', str(meta.get('total_assets_analyzed', 'N/A'))],
+            ['ID:', meta.get('campaign_id', 'N/A')]
+        ], col_widths=[108, 288], border=0)
+    else:
+        pdf.doc_title(f"Análisis: {json_data.get('campaign_name', 'N/A')}")
+    pdf.ln(20)
+
+    # RESUMEN EJECUTIVO
+    pdf.h2("Resumen Ejecutivo")
+    if is_forensic and isinstance(json_data.get('executive_summary'), dict):
+        for k in ['overview', 'key_patterns', 'critical_findings']:
+            if k in json_data['executive_summary']:
+                pdf.paragraph(json_data['executive_summary'][k])
+                pdf.ln(10)
+    else:
+        pdf.paragraph(json_data.get('executive_summary') or 'No disponible')
+    pdf.ln(20)
+
+    # ANÁLISIS DE ACTIVOS (FORENSIC)
+    if is_forensic:
+        pdf.add_page()
+        pdf.h2("Análisis Detallado de Activos")
+
+        for idx, asset in enumerate(json_data['assets_analysis'], 1):
+            pdf.h3(f"Activo #{idx}: {asset.get('file_name', 'N/A')}")
+            pdf.table([
+                ['ID:', asset.get('asset_id', 'N/A')],
+                ['Tipo:', asset.get('asset_type', 'N/A')]
+            ], col_widths=[72, 324])
+            pdf.ln(12)
+
+            if 'visual_forensics' in asset:
+                pdf.bold_line("Análisis Visual:")
+                vf = asset['visual_forensics']
+                for key, label in [
+                    ('composition', 'Composición'),
+                    ('lighting_color', 'Iluminación'),
+                    ('subjects_elements', 'Sujetos')
+                ]:
+                    if key in vf:
+                        pdf.bullet(vf[key], label=label)
+                pdf.ln(10)
+
+            if 'semiotic_analysis' in asset:
+                pdf.bold_line("Semiótica:")
+                sa = asset['semiotic_analysis']
+                for key in sa:
+                    pdf.bullet(sa[key], label=key)
+                pdf.ln(10)
+
+            if 'psychological_triggers' in asset:
+                pdf.bold_line("Triggers:")
+                pt = asset['psychological_triggers']
+                pdf.bullet(f"Principal: {pt.get('primary_trigger', 'N/A')}")
+                pdf.bullet(pt.get('trigger_explanation', 'N/A'))
+                pdf.ln(10)
+
+            if 'effectiveness_scores' in asset:
+                pdf.bold_line("Efectividad:")
+                es = asset['effectiveness_scores']
+                pdf.table([
+                    ['Métrica', 'Score'],
+                    ['Stopping Power', str(es.get('stopping_power', '-'))],
+                    ['Claridad', str(es.get('message_clarity', '-'))],
+                    ['Emoción', str(es.get('emotional_relevance', '-'))],
+                    ['CTA', str(es.get('cta_strength', '-'))],
+                    ['Recall', str(es.get('brand_recall', '-'))],
+                    ['GENERAL', str(es.get('overall_score', '-'))]
+                ], col_widths=[216, 108], header=True, header_fill=H3_COLOR)
+                pdf.ln(10)
+
+            if 'optimization_roadmap' in asset:
+                pdf.bold_line("Optimización:")
+                for o in asset['optimization_roadmap']:
+                    pri = o.get('priority', 'MEDIA')
+                    pdf.paragraph(o.get('action', ''), label=f"[{pri}]",
+                                  indent=20)
+                    pdf.ln(5)
+
+            pdf.ln(20)
+
+    # ANÁLISIS LEGACY
+    elif is_legacy:
+        for video in json_data['comparative_analysis']:
+            color = GREEN if "Ganador" in video.get('status', '') else RED
+            pdf.h3(
+                f"{video.get('status', '')} (ID: {video.get('ad_id', '')})",
+                color=color
+            )
+
+            m = video.get('real_metrics', {})
+            pdf.table([
+                ['Métrica', 'Valor'],
+                ['VTR', m.get('vtr', 'N/A')],
+                ['CTR', m.get('ctr', 'N/A')],
+                ['Shares', m.get('shares', 'N/A')]
+            ], col_widths=[144, 144], header=True,
+                header_fill=(211, 211, 211), header_text=TEXT_COLOR)
+            pdf.ln(10)
+
+            f = video.get('forensic_analysis', {})
+            pdf.paragraph(f.get('hook_0_3s', 'N/A'), label="Hook:")
+            pdf.paragraph(f.get('audio', 'N/A'), label="Audio:")
+            pdf.ln(15)
+
+    # CONCLUSIONES
+    pdf.add_page()
+    pdf.h2("Conclusiones")
+
+    if is_forensic and 'global_conclusions' in json_data:
+        gc = json_data['global_conclusions']
+        for key in gc:
+            pdf.paragraph(gc[key], label=f"{key}:")
+            pdf.ln(10)
+
+    # Recomendaciones
+    if 'general_recommendations' in json_data:
+        pdf.h2("Recomendaciones")
+        for rec in json_data['general_recommendations']:
+            pdf.bullet(rec)
+
+    # ROADMAP
+    if is_forensic and 'strategic_roadmap' in json_data:
+        pdf.add_page()
+        pdf.h2("Roadmap Estratégico")
+        sr = json_data['strategic_roadmap']
+
+        if 'immediate_actions' in sr:
+            pdf.bold_line("Inmediato (48h):")
+            for a in sr['immediate_actions']:
+                pdf.bullet(a)
+            pdf.ln(10)
+
+        if 'short_term_plan' in sr:
+            pdf.bold_line("Corto Plazo:")
+            pdf.paragraph(sr['short_term_plan'])
+            pdf.ln(10)
+
+        if 'long_term_strategy' in sr:
+            pdf.bold_line("Largo Plazo:")
+            pdf.paragraph(sr['long_term_strategy'])
+
+    pdf.output(str(output_path))
+    return output_path
@@ -2,13 +2,19 @@
 General Routes - Endpoints generales para operaciones con Apify
 Lista actores, datasets y runs de la cuenta
 """
+import asyncio
 import os
+import time
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import (
+    Optional, List, Dict, Any, Iterable, Iterator, Tuple, Type
+)
 
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
-from apify_client import ApifyClient
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.api.routes.dependencies import get_apify_client
 
 router = APIRouter(tags=["Apify General"])
 
@@ -19,6 +25,8 @@ router = APIRouter(tags=["Apify General"])
 
 class ActorInfo(BaseModel):
     """Información básica de un actor"""
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
     id: str
     name: str
     username: str
@@ -28,12 +36,11 @@ class ActorInfo(BaseModel):
     created_at: Optional[datetime] = Field(None, alias="createdAt")
     modified_at: Optional[datetime] = Field(None, alias="modifiedAt")
 
-    class Config:
-        populate_by_name = True
-
 
 class DatasetInfo(BaseModel):
     """Información básica de un dataset"""
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
     id: str
     name: Optional[str] = None
     created_at: Optional[datetime] = Field(None, alias="createdAt")
@@ -42,12 +49,11 @@ class DatasetInfo(BaseModel):
     item_count: int = Field(0, alias="itemCount")
     clean_item_count: int = Field(0, alias="cleanItemCount")
 
-    class Config:
-        populate_by_name = True
-
 
 class RunInfo(BaseModel):
     """Información básica de un run"""
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
     id: str
     actor_id: str = Field(..., alias="actId")
     status: str
@@ -62,23 +68,102 @@ class RunInfo(BaseModel):
     )
     stats: Optional[Dict[str, Any]] = None
 
-    class Config:
-        populate_by_name = True
-
 
 # ==========================================
 # HELPER FUNCTIONS
 # ==========================================
 
-def get_apify_client() -> ApifyClient:
-    """Obtiene cliente de Apify autenticado"""
-    token = os.getenv("APIFY_TOKEN")
-    if not token:
-        raise HTTPException(
-            status_code=500,
-            detail="APIFY_TOKEN no configurado en variables de entorno"
-        )
-    return ApifyClient(token)
+# Los items del SDK ya vienen de una fuente confiable: se devuelven como
+# dicts y el response_model de FastAPI los valida una sola vez.
+
+def _actor_payload(actor: Dict[str, Any]) -> Dict[str, Any]:
+    """Selecciona los campos de ActorInfo desde un item del SDK"""
+    return {
+        "id": actor.get("id", ""),
+        "name": actor.get("name", ""),
+        "username": actor.get("username", ""),
+        "title": actor.get("title"),
+        "description": actor.get("description"),
+        "stats": actor.get("stats"),
+        "createdAt": actor.get("createdAt"),
+        "modifiedAt": actor.get("modifiedAt"),
+    }
+
+
+def _dataset_payload(dataset: Dict[str, Any]) -> Dict[str, Any]:
+    """Selecciona los campos de DatasetInfo desde un item del SDK"""
+    return {
+        "id": dataset.get("id", ""),
+        "name": dataset.get("name"),
+        "createdAt": dataset.get("createdAt"),
+        "modifiedAt": dataset.get("modifiedAt"),
+        "accessedAt": dataset.get("accessedAt"),
+        "itemCount": dataset.get("itemCount", 0),
+        "cleanItemCount": dataset.get("cleanItemCount", 0),
+    }
+
+
+def _run_payload(run: Dict[str, Any]) -> Dict[str, Any]:
+    """Selecciona los campos de RunInfo desde un item del SDK"""
+    return {
+        "id": run.get("id", ""),
+        "actId": run.get("actId", ""),
+        "status": run.get("status", "UNKNOWN"),
+        "startedAt": run.get("startedAt"),
+        "finishedAt": run.get("finishedAt"),
+        "buildId": run.get("buildId"),
+        "defaultDatasetId": run.get("defaultDatasetId"),
+        "defaultKeyValueStoreId": run.get("defaultKeyValueStoreId"),
+        "stats": run.get("stats"),
+    }
+
+
+# Cache en memoria de los listados (clave: endpoint + parámetros).
+# Los listados son de solo lectura y la UI los consulta repetidamente,
+# así que un TTL corto evita llamadas redundantes a Apify.
+LIST_CACHE_TTL = 5.0
+LIST_CACHE_MAXSIZE = 256
+_list_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = {}
+
+
+def _list_cache_get(key: Tuple) -> Optional[List[Dict[str, Any]]]:
+    """Devuelve el listado cacheado si no ha expirado"""
+    entry = _list_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, payloads = entry
+    if expires_at < time.monotonic():
+        _list_cache.pop(key, None)
+        return None
+    return payloads
+
+
+def _list_cache_set(key: Tuple, payloads: List[Dict[str, Any]]) -> None:
+    """Guarda un listado; descarta la entrada más antigua si está lleno"""
+    if len(_list_cache) >= LIST_CACHE_MAXSIZE and key not in _list_cache:
+        _list_cache.pop(next(iter(_list_cache)))
+    _list_cache[key] = (time.monotonic() + LIST_CACHE_TTL, payloads)
+
+
+def _ndjson_lines(
+    payloads: Iterable[Dict[str, Any]],
+    model: Type[BaseModel]
+) -> Iterator[str]:
+    """Valida y serializa cada item como una línea JSON independiente"""
+    for payload in payloads:
+        yield model.model_validate(payload).model_dump_json(by_alias=True)
+        yield "\n"
+
+
+def _ndjson_response(
+    payloads: Iterable[Dict[str, Any]],
+    model: Type[BaseModel]
+) -> StreamingResponse:
+    """Respuesta NDJSON (application/x-ndjson) emitida item por item"""
+    return StreamingResponse(
+        _ndjson_lines(payloads, model),
+        media_type="application/x-ndjson"
+    )
 
 
 # ==========================================
@@ -98,6 +183,10 @@ async def list_actors(
     my: bool = Query(
         default=False,
         description="Solo mis actores (creados por mí)"
+    ),
+    stream: bool = Query(
+        default=False,
+        description="Emitir NDJSON en streaming (un item por línea)"
     )
 ):
     """
@@ -109,6 +198,7 @@ async def list_actors(
     - **limit**: Cantidad máxima de actores (1-1000, default: 100)
     - **offset**: Cantidad de actores a omitir para paginación
     - **my**: Si es True, solo lista actores propios
+    - **stream**: Si es True, responde NDJSON (un actor por línea)
 
     **Returns:**
     Lista de actores con información básica
@@ -118,33 +208,26 @@ async def list_actors(
     GET /api/v1/apify/general/actors?limit=50&my=true
     ```
     """
+    cache_key = ("actors", my, limit, offset)
     try:
-        client = get_apify_client()
-
-        # Listar actores
-        if my:
-            # Solo actores propios
-            actors_page = client.actors().list(limit=limit, offset=offset)
-        else:
-            # Todos los actores (requiere filtro adicional si es necesario)
-            actors_page = client.actors().list(limit=limit, offset=offset)
-
-        # Extraer items
-        actors = actors_page.items if hasattr(actors_page, 'items') else []
-
-        return [
-            ActorInfo(
-                id=actor.get("id", ""),
-                name=actor.get("name", ""),
-                username=actor.get("username", ""),
-                title=actor.get("title"),
-                description=actor.get("description"),
-                stats=actor.get("stats"),
-                createdAt=actor.get("createdAt"),
-                modifiedAt=actor.get("modifiedAt")
+        payloads = _list_cache_get(cache_key)
+        if payloads is None:
+            client = get_apify_client()
+
+            # Listar actores (my=True filtra solo los creados por el usuario)
+            actors_page = await asyncio.to_thread(
+                client.actors().list, my=my, limit=limit, offset=offset
             )
-            for actor in actors
-        ]
+
+            # Extraer items
+            actors = getattr(actors_page, 'items', None) or []
+
+            payloads = [_actor_payload(actor) for actor in actors]
+            _list_cache_set(cache_key, payloads)
+
+        if stream:
+            return _ndjson_response(payloads, ActorInfo)
+        return payloads
 
     except Exception as e:
         raise HTTPException(
@@ -166,6 +249,10 @@ async def list_datasets(
     unnamed: bool = Query(
         default=False,
         description="Incluir datasets sin nombre"
+    ),
+    stream: bool = Query(
+        default=False,
+        description="Emitir NDJSON en streaming (un item por línea)"
     )
 ):
     """
@@ -177,6 +264,7 @@ async def list_datasets(
     - **limit**: Cantidad máxima de datasets (1-1000, default: 100)
     - **offset**: Cantidad de datasets a omitir para paginación
     - **unnamed**: Si es True, incluye datasets sin nombre
+    - **stream**: Si es True, responde NDJSON (un dataset por línea)
 
     **Returns:**
     Lista de datasets con información básica
@@ -187,32 +275,29 @@ async def list_datasets(
     GET /api/v1/apify/general/datasets?limit=50&unnamed=true
     ```
     """
+    cache_key = ("datasets", unnamed, limit, offset)
     try:
-        client = get_apify_client()
+        payloads = _list_cache_get(cache_key)
+        if payloads is None:
+            client = get_apify_client()
+
+            # Listar datasets
+            datasets_page = await asyncio.to_thread(
+                client.datasets().list,
+                limit=limit,
+                offset=offset,
+                unnamed=unnamed
+            )
 
-        # Listar datasets
-        datasets_page = client.datasets().list(
-            limit=limit,
-            offset=offset,
-            unnamed=unnamed
-        )
+            # Extraer items
+            datasets = getattr(datasets_page, 'items', None) or []
 
-        # Extraer items
-        datasets = (datasets_page.items
-                    if hasattr(datasets_page, 'items') else [])
-
-        return [
-            DatasetInfo(
-                id=dataset.get("id", ""),
-                name=dataset.get("name"),
-                createdAt=dataset.get("createdAt"),
-                modifiedAt=dataset.get("modifiedAt"),
-                accessedAt=dataset.get("accessedAt"),
-                itemCount=dataset.get("itemCount", 0),
-                cleanItemCount=dataset.get("cleanItemCount", 0)
-            )
-            for dataset in datasets
-        ]
+            payloads = [_dataset_payload(dataset) for dataset in datasets]
+            _list_cache_set(cache_key, payloads)
+
+        if stream:
+            return _ndjson_response(payloads, DatasetInfo)
+        return payloads
 
     except Exception as e:
         raise HTTPException(
@@ -235,6 +320,10 @@ async def list_runs(
         default=None,
         description="Filtrar por estado "
         "(READY, RUNNING, SUCCEEDED, FAILED, ABORTED)"
+    ),
+    stream: bool = Query(
+        default=False,
+        description="Emitir NDJSON en streaming (un item por línea)"
     )
 ):
     """
@@ -251,6 +340,7 @@ async def list_runs(
       - `SUCCEEDED`: Completado exitosamente
       - `FAILED`: Falló
       - `ABORTED`: Abortado
+    - **stream**: Si es True, responde NDJSON (un run por línea)
 
     **Returns:**
     Lista de runs con información de estado, tiempos y IDs de datasets
@@ -260,40 +350,34 @@ async def list_runs(
     GET /api/v1/apify/general/runs?limit=50&status=SUCCEEDED
     ```
     """
+    cache_key = ("runs", status.upper() if status else None, limit, offset)
     try:
-        client = get_apify_client()
+        payloads = _list_cache_get(cache_key)
+        if payloads is None:
+            client = get_apify_client()
+
+            # Construir parámetros - el filtro de status lo aplica Apify
+            list_params: Dict[str, Any] = {
+                "limit": limit,
+                "offset": offset
+            }
+            if status:
+                list_params["status"] = status.upper()
+
+            # Listar runs
+            runs_page = await asyncio.to_thread(
+                client.runs().list, **list_params
+            )
 
-        # Construir parámetros - solo limit y offset
-        list_params: Dict[str, Any] = {
-            "limit": limit,
-            "offset": offset
-        }
+            # Extraer items
+            runs = getattr(runs_page, 'items', None) or []
 
-        # Listar runs (sin filtro de status por limitaciones del SDK)
-        runs_page = client.runs().list(**list_params)
-
-        # Extraer items
-        runs = runs_page.items if hasattr(runs_page, 'items') else []
-
-        # Filtrar por status si se especificó (post-procesamiento)
-        if status:
-            status_upper = status.upper()
-            runs = [r for r in runs if r.get("status") == status_upper]
-
-        return [
-            RunInfo(
-                id=run.get("id", ""),
-                actId=run.get("actId", ""),
-                status=run.get("status", "UNKNOWN"),
-                startedAt=run.get("startedAt"),
-                finishedAt=run.get("finishedAt"),
-                buildId=run.get("buildId"),
-                defaultDatasetId=run.get("defaultDatasetId"),
-                defaultKeyValueStoreId=run.get("defaultKeyValueStoreId"),
-                stats=run.get("stats")
-            )
-            for run in runs
-        ]
+            payloads = [_run_payload(run) for run in runs]
+            _list_cache_set(cache_key, payloads)
+
+        if stream:
+            return _ndjson_response(payloads, RunInfo)
+        return payloads
 
     except Exception as e:
         raise HTTPException(
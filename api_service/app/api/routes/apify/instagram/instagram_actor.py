@@ -3,10 +3,28 @@ Instagram Actor - Logica de interaccion con el actor de Apify para Instagram
 Usa el cliente oficial ApifyClient para simplificar la comunicacion
 """
 
-import os
+import asyncio
+import base64
+import json
 from typing import Dict, List, Optional
+
+import httpx
 from apify_client import ApifyClient
 
+from app.config.settings import get_settings
+from app.api.routes.dependencies import (
+    get_apify_client,
+    get_apify_http_client,
+    get_run_webhooks,
+)
+
+# Estados finales de un run de Apify
+TERMINAL_STATUSES = frozenset({"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"})
+
+# Paginacion de items: tamaño de pagina y requests simultaneos a Apify
+DATASET_PAGE_SIZE = 125
+DATASET_MAX_CONCURRENCY = 8
+
 
 class InstagramActor:
     """
@@ -14,9 +32,21 @@ class InstagramActor:
     usando el cliente oficial de Apify
     """
 
-    def __init__(self):
-        """Inicializa el cliente de Apify con las credenciales"""
-        token = os.getenv("APIFY_TOKEN")
+    def __init__(
+        self,
+        client: Optional[ApifyClient] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Inicializa el actor con las credenciales
+
+        Args:
+            client: ApifyClient inyectado (por defecto el compartido)
+            http_client: httpx.AsyncClient inyectado (por defecto el
+                compartido)
+        """
+        settings = get_settings()
+        token = settings.apify_token
         if not token:
             raise ValueError(
                 "APIFY_TOKEN no configurado en variables de entorno"
@@ -24,11 +54,13 @@ class InstagramActor:
 
         self.token = token
         # Usar APIFY_INSTAGRAM_ACTOR que es la variable definida en .env
-        self.actor_id = os.getenv(
-            "APIFY_INSTAGRAM_ACTOR",
-            "apify/instagram-scraper"
-        )
-        self.client = ApifyClient(token)
+        self.actor_id = settings.apify_instagram_actor
+        self.client = client or get_apify_client()
+        self.http_client = http_client or get_apify_http_client()
+        # Webhooks de fin de run (None si no estan configurados)
+        self.webhooks = get_run_webhooks()
+        # Fallback: usar el ApifyClient sincrono en un hilo
+        self.use_sync_client = settings.instagram_sync_client
 
     async def __aenter__(self):
         """Context manager para compatibilidad con codigo existente"""
@@ -89,7 +121,10 @@ class InstagramActor:
         Returns:
             Dict con informacion del run iniciado o None
         """
-        run = self.client.actor(self.actor_id).start(run_input=actor_input)
+        run = self.client.actor(self.actor_id).start(
+            run_input=actor_input,
+            webhooks=self.webhooks
+        )
         return run
 
     def get_run_status(self, run_id: str) -> Optional[Dict]:
@@ -149,19 +184,163 @@ class InstagramActor:
 
         return run_data, items
 
+    async def _api_get(
+        self, path: str, params: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """GET a la API REST de Apify; None si el recurso no existe"""
+        response = await self.http_client.get(
+            path,
+            params=params,
+            headers={"Authorization": f"Bearer {self.token}"}
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def start_run(self, actor_input: Dict) -> Optional[Dict]:
+        """Version asincrona de run_async (POST /acts/{actor_id}/runs)"""
+        if self.use_sync_client:
+            return await asyncio.to_thread(self.run_async, actor_input)
+
+        actor_path = self.actor_id.replace("/", "~")
+        params = None
+        if self.webhooks:
+            # La API REST recibe los webhooks como JSON en base64
+            params = {"webhooks": base64.b64encode(
+                json.dumps(self.webhooks).encode()
+            ).decode()}
+        response = await self.http_client.post(
+            f"/acts/{actor_path}/runs",
+            json=actor_input,
+            params=params,
+            headers={"Authorization": f"Bearer {self.token}"}
+        )
+        response.raise_for_status()
+        return response.json().get("data")
+
+    async def fetch_run_status(self, run_id: str) -> Optional[Dict]:
+        """Version asincrona de get_run_status (GET /actor-runs/{run_id})"""
+        if self.use_sync_client:
+            return await asyncio.to_thread(self.get_run_status, run_id)
+
+        body = await self._api_get(f"/actor-runs/{run_id}")
+        return body.get("data") if body else None
+
+    async def wait_for_status_change(
+        self, run_id: str, wait: float
+    ) -> Optional[Dict]:
+        """
+        Long-polling: espera hasta que el run cambie de estado
+
+        Consulta Apify con backoff (1s, 2s, 4s, 5s...) y retorna en cuanto
+        el estado cambia, llega a un estado final o se agotan `wait`
+        segundos. Con wait=0 equivale a fetch_run_status.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+
+        run_data = await self.fetch_run_status(run_id)
+        if not run_data:
+            return None
+        initial_status = run_data.get("status")
+
+        attempt = 0
+        while (
+            run_data.get("status") == initial_status
+            and initial_status not in TERMINAL_STATUSES
+        ):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(2 ** attempt, 5, remaining))
+            attempt += 1
+            run_data = await self.fetch_run_status(run_id) or run_data
+
+        return run_data
+
+    async def fetch_results(
+        self,
+        run_id: str,
+        limit: int = 100,
+        offset: int = 0
+    ) -> tuple[Optional[Dict], List[Dict]]:
+        """
+        Version asincrona de get_results
+
+        Raises:
+            ValueError: Si el run no esta completo o no tiene datos
+        """
+        if self.use_sync_client:
+            return await asyncio.to_thread(
+                self.get_results, run_id, limit, offset
+            )
+
+        run_data = await self.fetch_run_status(run_id)
+        if not run_data:
+            raise ValueError("No se pudo obtener informacion del run")
+
+        status = run_data.get("status")
+        if status != "SUCCEEDED":
+            raise ValueError(
+                f"Run no completado. Estado actual: {status}"
+            )
+
+        dataset_id = run_data.get("defaultDatasetId")
+        if not dataset_id:
+            raise ValueError("El run no tiene dataset asociado")
+
+        items = await self.fetch_dataset_items(dataset_id, limit, offset)
+        return run_data, items
+
+    async def fetch_dataset_items(
+        self,
+        dataset_id: str,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Descarga items de un dataset en paginas paralelas
+
+        Divide [offset, offset + limit) en paginas de DATASET_PAGE_SIZE y
+        las pide a la vez (maximo DATASET_MAX_CONCURRENCY en vuelo). El
+        resultado conserva el orden del dataset.
+        """
+        semaphore = asyncio.Semaphore(DATASET_MAX_CONCURRENCY)
+
+        async def fetch_page(page_offset: int, page_limit: int) -> List[Dict]:
+            async with semaphore:
+                page = await self._api_get(
+                    f"/datasets/{dataset_id}/items",
+                    params={
+                        "limit": page_limit,
+                        "offset": page_offset,
+                        "clean": "true"
+                    }
+                )
+            return page or []
+
+        end = offset + limit
+        pages = await asyncio.gather(*(
+            fetch_page(start, min(DATASET_PAGE_SIZE, end - start))
+            for start in range(offset, end, DATASET_PAGE_SIZE)
+        ))
+        return [item for page in pages for item in page]
+
     @staticmethod
     def normalize_post(item: Dict) -> Dict:
         """Normaliza un post de Instagram a un formato limpio"""
+        get = item.get
         return {
-            "id": item.get("id", ""),
-            "username": item.get("ownerUsername"),
-            "caption": item.get("caption", ""),
-            "url": item.get("url", ""),
-            "image_url": item.get("displayUrl"),
-            "likes": item.get("likesCount", 0),
-            "comments": item.get("commentsCount", 0),
-            "timestamp": item.get("timestamp"),
-            "is_video": item.get("isVideo", False)
+            "id": get("id", ""),
+            "username": get("ownerUsername"),
+            "caption": get("caption", ""),
+            "url": get("url", ""),
+            "image_url": get("displayUrl"),
+            "likes": get("likesCount", 0),
+            "comments": get("commentsCount", 0),
+            "timestamp": get("timestamp"),
+            "is_video": get("isVideo", False)
         }
 
     @staticmethod
@@ -2,13 +2,32 @@
 Instagram Routes - Endpoints para el scraper de Instagram
 """
 
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional, List, Dict
 from pydantic import BaseModel, Field
+from app.services.run_status_store import (
+    RunStatusStore,
+    get_run_status_store,
+)
 from .instagram_actor import InstagramActor
 
 router = APIRouter(tags=["Instagram"])
 
+# true = encolar el inicio del run en Celery (requiere worker + Redis)
+CELERY_ENABLED = os.getenv("CELERY_ENABLED", "false").lower() == "true"
+
+
+async def get_instagram_actor() -> InstagramActor:
+    """Actor de Instagram sobre los clientes compartidos del proceso"""
+    try:
+        return InstagramActor()
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 
 class InstagramScraperInput(BaseModel):
     """Input para el scraper de Instagram"""
@@ -31,7 +50,8 @@ class InstagramScraperInput(BaseModel):
 class InstagramStartResponse(BaseModel):
     """Respuesta al iniciar el scraper"""
     status: str
-    run_id: str
+    run_id: Optional[str] = None
+    task_id: Optional[str] = None
     message: str
 
 
@@ -46,7 +66,10 @@ class InstagramResponse(BaseModel):
 
 
 @router.post("/scrape", status_code=202)
-def scrape_instagram(request: InstagramScraperInput):
+async def scrape_instagram(
+    request: InstagramScraperInput,
+    actor: InstagramActor = Depends(get_instagram_actor)
+):
     """
     Inicia el scraper de Instagram (asíncrono)
     Retorna inmediatamente con run_id para consultar estado después
@@ -62,8 +85,6 @@ def scrape_instagram(request: InstagramScraperInput):
                 detail="Debe proporcionar usernames o hashtags"
             )
 
-        actor = InstagramActor()
-
         # Construir input
         actor_input = actor.build_actor_input(
             usernames=request.usernames,
@@ -71,8 +92,24 @@ def scrape_instagram(request: InstagramScraperInput):
             max_posts=request.max_posts
         )
 
+        if CELERY_ENABLED:
+            # Fire-and-forget: el worker hace el POST a Apify
+            from app.tasks.apify_tasks import start_apify_run
+            task = await asyncio.to_thread(
+                start_apify_run.delay,
+                actor.actor_id, actor_input, actor.webhooks
+            )
+            return InstagramStartResponse(
+                status="queued",
+                task_id=task.id,
+                message=(
+                    f"Inicio encolado. "
+                    f"Use GET /tasks/{task.id} para obtener el run_id"
+                )
+            )
+
         # Iniciar actor asíncrono
-        run_data = actor.run_async(actor_input=actor_input)
+        run_data = await actor.start_run(actor_input)
 
         if not run_data or not run_data.get("id"):
             raise HTTPException(
@@ -97,12 +134,62 @@ def scrape_instagram(request: InstagramScraperInput):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/tasks/{task_id}")
+async def get_task_status(task_id: str):
+    """Consulta el estado de una tarea encolada en Celery"""
+    if not CELERY_ENABLED:
+        raise HTTPException(
+            status_code=404,
+            detail="Cola de tareas no habilitada (CELERY_ENABLED)"
+        )
+
+    from celery.result import AsyncResult
+    from app.celery_app import celery_app
+
+    def _read():
+        result = AsyncResult(task_id, app=celery_app)
+        return result.state, result.result
+
+    try:
+        state, value = await asyncio.to_thread(_read)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    response = {"task_id": task_id, "status": state}
+    if state == "SUCCESS":
+        response["run_id"] = value.get("id")
+        response["run"] = value
+    elif state == "FAILURE":
+        response["error"] = str(value)
+    return response
+
+
 @router.get("/runs/{run_id}")
-def get_run_status(run_id: str):
-    """Consulta el estado de una ejecución"""
+async def get_run_status(
+    run_id: str,
+    wait: int = Query(
+        default=0,
+        ge=0,
+        le=55,
+        description=(
+            "Segundos máximos de long-polling. El endpoint responde en "
+            "cuanto cambia el estado del run; si vence el tiempo, el "
+            "cliente debe volver a llamar de inmediato"
+        )
+    ),
+    actor: InstagramActor = Depends(get_instagram_actor),
+    store: RunStatusStore = Depends(get_run_status_store)
+):
+    """
+    Consulta el estado de una ejecución (con long-polling opcional)
+
+    Si el webhook de Apify ya reportó el final del run se responde desde
+    el store sin llamar a Apify.
+    """
     try:
-        actor = InstagramActor()
-        run_data = actor.get_run_status(run_id)
+        run_data = await store.get(run_id)
+        if not run_data:
+            run_data = await actor.wait_for_status_change(run_id, wait)
 
         if not run_data:
             raise HTTPException(
@@ -123,18 +210,21 @@ def get_run_status(run_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/runs/{run_id}/results")
-def get_run_results(
+@router.get(
+    "/runs/{run_id}/results",
+    # Solo para la documentación: la respuesta se serializa sin revalidar
+    responses={200: {"model": InstagramResponse}}
+)
+async def get_run_results(
     run_id: str,
     limit: int = Query(default=100, ge=1, le=1000),
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0),
+    actor: InstagramActor = Depends(get_instagram_actor)
 ):
     """Obtiene los resultados de una ejecución completada"""
     try:
-        actor = InstagramActor()
-
         try:
-            run_data, items = actor.get_results(
+            run_data, items = await actor.fetch_results(
                 run_id=run_id,
                 limit=limit,
                 offset=offset
@@ -145,13 +235,16 @@ def get_run_results(
                 InstagramActor.normalize_post(item) for item in items
             ]
 
-            return InstagramResponse(
-                status="success",
-                run_id=run_id,
-                actor_status=run_data.get("status") if run_data else None,
-                count=len(normalized_data),
-                data=normalized_data
-            )
+            return ORJSONResponse(content={
+                "status": "success",
+                "run_id": run_id,
+                "actor_status": (
+                    run_data.get("status") if run_data else None
+                ),
+                "count": len(normalized_data),
+                "data": normalized_data,
+                "message": None
+            })
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
@@ -161,10 +254,11 @@ def get_run_results(
 
 
 @router.get("/health")
-def health_check():
+async def health_check(
+    actor: InstagramActor = Depends(get_instagram_actor)
+):
     """Verifica la configuración del servicio"""
     try:
-        actor = InstagramActor()
         return {
             "status": "healthy",
             "service": "Instagram Scraper",
@@ -3,9 +3,20 @@ TikTok Actor - Logica de interaccion con el actor de Apify para TikTok
 Usa el cliente oficial ApifyClient para simplificar la comunicacion
 """
 
-import os
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional
 from apify_client import ApifyClient
+from pydantic import TypeAdapter
+
+from app.api.routes.dependencies import get_apify_client
+from app.config.settings import get_settings
+from app.models.apify_models import TikTokVideoMetadata
+
+# Validacion en lote (una sola llamada a pydantic-core por respuesta)
+VIDEO_LIST_ADAPTER = TypeAdapter(List[TikTokVideoMetadata])
+
+# Default compartido (solo lectura) para sub-dicts ausentes
+_EMPTY = MappingProxyType({})
 
 
 class TikTokActor:
@@ -14,9 +25,15 @@ class TikTokActor:
     usando el cliente oficial de Apify
     """
 
-    def __init__(self):
-        """Inicializa el cliente de Apify con las credenciales"""
-        token = os.getenv("APIFY_TOKEN")
+    def __init__(self, client: Optional[ApifyClient] = None):
+        """
+        Inicializa el actor con las credenciales
+
+        Args:
+            client: ApifyClient inyectado (por defecto el compartido)
+        """
+        settings = get_settings()
+        token = settings.apify_token
         if not token:
             raise ValueError(
                 "APIFY_TOKEN no configurado en variables de entorno"
@@ -25,11 +42,8 @@ class TikTokActor:
         self.token = token
         # Usar APIFY_TIKTOK_NAME que tiene el formato completo
         # clockworks/tiktok-scraper
-        self.actor_id = os.getenv(
-            "APIFY_TIKTOK_NAME",
-            "clockworks/tiktok-scraper"
-        )
-        self.client = ApifyClient(token)
+        self.actor_id = settings.apify_tiktok_name
+        self.client = client or get_apify_client()
 
     async def __aenter__(self):
         """Context manager para compatibilidad con codigo existente"""
@@ -166,7 +180,32 @@ class TikTokActor:
         return run_data, items
 
     @staticmethod
-    def normalize_video(item: Dict):
+    def _video_fields(item: Dict) -> Dict[str, Any]:
+        """Mapea un item raw de Apify a los campos de TikTokVideoMetadata"""
+        # Sub-dicts leidos una sola vez; _EMPTY evita crear {} por item
+        get = item.get
+        author = get("authorMeta") or _EMPTY
+        covers = get("covers") or _EMPTY
+        music = get("musicMeta") or _EMPTY
+        return {
+            "id": get("id", ""),
+            "author_username": author.get("name"),
+            "author_name": author.get("nickName"),
+            "text": get("text", ""),
+            "video_url": get("videoUrl", ""),
+            "cover_url": covers.get("default"),
+            "play_count": get("playCount", 0),
+            "digg_count": get("diggCount", 0),
+            "comment_count": get("commentCount", 0),
+            "share_count": get("shareCount", 0),
+            "create_time": get("createTime"),
+            "music_title": music.get("musicName"),
+            "music_author": music.get("musicAuthor"),
+            "hashtags": [tag.get("name") for tag in get("hashtags") or ()]
+        }
+
+    @staticmethod
+    def normalize_video(item: Dict) -> TikTokVideoMetadata:
         """
         Normaliza un item del dataset a un formato limpio y consistente
 
@@ -176,23 +215,14 @@ class TikTokActor:
         Returns:
             TikTokVideoMetadata con datos normalizados del video
         """
-        from app.models.apify_models import TikTokVideoMetadata
-
-        return TikTokVideoMetadata(
-            id=item.get("id", ""),
-            author_username=item.get("authorMeta", {}).get("name"),
-            author_name=item.get("authorMeta", {}).get("nickName"),
-            text=item.get("text", ""),
-            video_url=item.get("videoUrl", ""),
-            cover_url=item.get("covers", {}).get("default"),
-            play_count=item.get("playCount", 0),
-            digg_count=item.get("diggCount", 0),
-            comment_count=item.get("commentCount", 0),
-            share_count=item.get("shareCount", 0),
-            create_time=item.get("createTime"),
-            music_title=item.get("musicMeta", {}).get("musicName"),
-            music_author=item.get("musicMeta", {}).get("musicAuthor"),
-            hashtags=[tag.get("name") for tag in item.get("hashtags", [])]
+        return TikTokVideoMetadata(**TikTokActor._video_fields(item))
+
+    @staticmethod
+    def normalize_videos(items: List[Dict]) -> List[TikTokVideoMetadata]:
+        """Normaliza una lista de items validandolos en una sola pasada"""
+        fields = TikTokActor._video_fields
+        return VIDEO_LIST_ADAPTER.validate_python(
+            [fields(item) for item in items]
         )
 
     @staticmethod
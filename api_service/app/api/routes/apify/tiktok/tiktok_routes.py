@@ -4,7 +4,10 @@ Usa TikTokActor para encapsular toda la logica de interaccion
 Incluye endpoints para construccion de datasets
 """
 
-from fastapi import APIRouter, HTTPException, Query, status, BackgroundTasks
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+)
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional
 import json
@@ -13,7 +16,7 @@ from app.models.apify_models import (
     TikTokScraperInput,
     TikTokResponse
 )
-from .tiktok_actor import TikTokActor
+from .tiktok_actor import TikTokActor, VIDEO_LIST_ADAPTER
 
 # Importar funciones de datasets
 from app.processors.tiktok import (
@@ -27,6 +30,14 @@ from app.processors.tiktok import (
 router = APIRouter(tags=["TikTok"])
 
 
+async def get_tiktok_actor() -> TikTokActor:
+    """Actor de TikTok sobre el ApifyClient compartido del proceso"""
+    try:
+        return TikTokActor()
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ==========================================
 # MODELOS PARA ENDPOINTS DE DATASETS
 # ==========================================
@@ -76,7 +87,10 @@ class DatasetStatsResponse(BaseModel):
     response_model=TikTokResponse,
     status_code=status.HTTP_202_ACCEPTED
 )
-async def scrape_tiktok_videos(request: TikTokScraperInput):
+async def scrape_tiktok_videos(
+    request: TikTokScraperInput,
+    actor: TikTokActor = Depends(get_tiktok_actor)
+):
     """
     Inicia el scraper de TikTok de forma asíncrona
 
@@ -112,9 +126,6 @@ async def scrape_tiktok_videos(request: TikTokScraperInput):
                 )
             )
 
-        # Crear actor (no requiere context manager con ApifyClient)
-        actor = TikTokActor()
-
         # Construir input
         actor_input = actor.build_actor_input(
             hashtags=request.hashtags,
@@ -149,7 +160,10 @@ async def scrape_tiktok_videos(request: TikTokScraperInput):
 
 
 @router.get("/runs/{run_id}")
-async def get_run_status_endpoint(run_id: str):
+async def get_run_status_endpoint(
+    run_id: str,
+    actor: TikTokActor = Depends(get_tiktok_actor)
+):
     """
     Consulta el estado de una ejecucion del actor TikTok
 
@@ -161,7 +175,6 @@ async def get_run_status_endpoint(run_id: str):
         (RUNNING, SUCCEEDED, FAILED, etc)
     """
     try:
-        actor = TikTokActor()
         run_data = actor.get_run_status(run_id)
 
         return {
@@ -180,7 +193,11 @@ async def get_run_status_endpoint(run_id: str):
         )
 
 
-@router.get("/runs/{run_id}/results", response_model=TikTokResponse)
+@router.get(
+    "/runs/{run_id}/results",
+    # Solo para la documentación: la respuesta se serializa sin revalidar
+    responses={200: {"model": TikTokResponse}}
+)
 async def get_run_results(
     run_id: str,
     limit: int = Query(
@@ -193,7 +210,8 @@ async def get_run_results(
         default=0,
         ge=0,
         description="Offset para paginacion"
-    )
+    ),
+    actor: TikTokActor = Depends(get_tiktok_actor)
 ):
     """
     Obtiene los resultados de una ejecucion completada del actor TikTok
@@ -207,8 +225,6 @@ async def get_run_results(
         TikTokResponse con los videos scrapeados y normalizados
     """
     try:
-        actor = TikTokActor()
-
         try:
             # Obtener resultados
             run_data, items = actor.get_results(
@@ -217,17 +233,18 @@ async def get_run_results(
                 offset=offset
             )
 
-            # Normalizar
-            normalized_data = [
-                TikTokActor.normalize_video(item) for item in items
-            ]
+            # Normalizar (validacion en lote)
+            videos = TikTokActor.normalize_videos(items)
 
-            return TikTokResponse(
-                status="success",
-                run_id=run_id,
-                count=len(normalized_data),
-                data=normalized_data
-            )
+            # Los modelos ya estan validados: se serializan una vez y se
+            # evita la segunda validacion de response_model
+            return ORJSONResponse(content={
+                "status": "success",
+                "run_id": run_id,
+                "count": len(videos),
+                "data": VIDEO_LIST_ADAPTER.dump_python(videos, mode="json"),
+                "message": None
+            })
 
         except ValueError as e:
             # Error de validacion (no tiene dataset, estado invalido)
@@ -243,13 +260,11 @@ async def get_run_results(
 
 
 @router.get("/health")
-async def health_check():
+async def health_check(actor: TikTokActor = Depends(get_tiktok_actor)):
     """
     Verifica que el servicio TikTok este configurado correctamente
     """
     try:
-        actor = TikTokActor()
-
         return {
             "status": "healthy",
             "service": "TikTok Scraper",
@@ -0,0 +1,6 @@
+"""
+Paquete webhooks - Recepcion de webhooks de Apify
+"""
+from .webhook_routes import router
+
+__all__ = ["router"]
@@ -0,0 +1,59 @@
+"""
+Webhook Routes - Recibe los avisos de fin de run que envia Apify
+
+Apify llama a este endpoint (registrado al iniciar cada run, ver
+get_run_webhooks) y el estado queda en el RunStatusStore. Los endpoints
+/runs/{run_id} lo leen antes de consultar Apify.
+"""
+import hmac
+import logging
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+
+from app.api.routes.dependencies.dependencies import WEBHOOK_SECRET_HEADER
+from app.services.run_status_store import (
+    RunStatusStore,
+    get_run_status_store,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Apify Webhooks"])
+
+
+@router.post("", status_code=204)
+async def apify_webhook(
+    request: Request,
+    secret: str = Header(default="", alias=WEBHOOK_SECRET_HEADER),
+    store: RunStatusStore = Depends(get_run_status_store)
+):
+    """Guarda el estado final de un run reportado por Apify"""
+    expected = os.getenv("APIFY_WEBHOOK_SECRET")
+    if not expected:
+        raise HTTPException(
+            status_code=404,
+            detail="Webhooks no configurados (APIFY_WEBHOOK_SECRET)"
+        )
+    # Comparación en tiempo constante
+    if not hmac.compare_digest(secret.encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Firma inválida")
+
+    try:
+        payload = await request.json()
+        resource = payload["resource"]
+        run_id = resource["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Payload inválido")
+
+    await store.set(run_id, {
+        "id": run_id,
+        "status": resource.get("status"),
+        "startedAt": resource.get("startedAt"),
+        "finishedAt": resource.get("finishedAt"),
+        "defaultDatasetId": resource.get("defaultDatasetId"),
+    })
+    logger.info(
+        "Webhook %s: run %s -> %s",
+        payload.get("eventType"), run_id, resource.get("status")
+    )
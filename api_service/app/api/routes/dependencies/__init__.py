@@ -1,6 +1,22 @@
 """
 Paquete Dependencies - Funciones de dependencia compartidas
 """
-from .dependencies import get_apify_token, get_apify_service, get_actor_id
+from .dependencies import (
+    get_apify_token,
+    get_apify_client,
+    get_apify_http_client,
+    close_apify_clients,
+    get_run_webhooks,
+    get_apify_service,
+    get_actor_id,
+)
 
-__all__ = ["get_apify_token", "get_apify_service", "get_actor_id"]
+__all__ = [
+    "get_apify_token",
+    "get_apify_client",
+    "get_apify_http_client",
+    "close_apify_clients",
+    "get_run_webhooks",
+    "get_apify_service",
+    "get_actor_id",
+]
@@ -1,14 +1,25 @@
 """
 Dependencias comunes para los endpoints de la API
 """
+import json
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import httpx
+from apify_client import ApifyClient
 from fastapi import HTTPException
+from app.config.settings import get_settings
 from app.services.apify_service import ApifyService
 import os
 
+APIFY_API_BASE = "https://api.apify.com/v2"
 
-def get_apify_token() -> str:
-    """Obtiene el token de Apify de las variables de entorno"""
-    token = os.getenv("APIFY_TOKEN")
+# Header con el secreto compartido que Apify envia en cada webhook
+WEBHOOK_SECRET_HEADER = "X-Apify-Webhook-Secret"
+
+
+def _require_apify_token() -> str:
+    token = get_settings().apify_token
     if not token:
         raise HTTPException(
             status_code=500,
@@ -17,13 +28,74 @@ def get_apify_token() -> str:
     return token
 
 
-def get_apify_service() -> ApifyService:
+# get_apify_token, get_apify_service y get_actor_id son `async def` para que
+# FastAPI las ejecute en el event loop: como no hacen I/O, evitan el salto
+# al threadpool.
+async def get_apify_token() -> str:
+    """Obtiene el token de Apify de las variables de entorno"""
+    return _require_apify_token()
+
+
+@lru_cache(maxsize=1)
+def get_apify_client() -> ApifyClient:
+    """
+    Cliente ApifyClient compartido por todo el proceso
+
+    Se crea una sola vez para reutilizar el pool de conexiones
+    (keep-alive) hacia api.apify.com entre requests.
+    """
+    return ApifyClient(_require_apify_token())
+
+
+@lru_cache(maxsize=1)
+def get_apify_http_client() -> httpx.AsyncClient:
+    """Cliente httpx asincrono compartido para la API REST de Apify"""
+    return httpx.AsyncClient(base_url=APIFY_API_BASE, timeout=30.0)
+
+
+async def close_apify_clients() -> None:
+    """Cierra los clientes compartidos (llamar al apagar la app)"""
+    if get_apify_http_client.cache_info().currsize:
+        await get_apify_http_client().aclose()
+    get_apify_http_client.cache_clear()
+    get_apify_client.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_run_webhooks() -> Optional[List[Dict]]:
+    """
+    Webhooks ad-hoc para registrar al iniciar un run
+
+    Requiere APIFY_WEBHOOK_URL (URL publica de POST /api/v1/apify/webhook)
+    y APIFY_WEBHOOK_SECRET. Sin ellas retorna None y no se registran.
+    """
+    url = os.getenv("APIFY_WEBHOOK_URL")
+    secret = os.getenv("APIFY_WEBHOOK_SECRET")
+    if not url or not secret:
+        return None
+
+    return [{
+        "eventTypes": [
+            "ACTOR.RUN.SUCCEEDED",
+            "ACTOR.RUN.FAILED",
+            "ACTOR.RUN.ABORTED",
+            "ACTOR.RUN.TIMED_OUT",
+        ],
+        "requestUrl": url,
+        "payloadTemplate": (
+            '{"eventType": {{eventType}}, "resource": {{resource}}}'
+        ),
+        "headersTemplate": json.dumps({WEBHOOK_SECRET_HEADER: secret}),
+    }]
+
+
+async def get_apify_service() -> ApifyService:
     """Obtiene una instancia de ApifyService con el token configurado"""
-    token = get_apify_token()
+    token = await get_apify_token()
     return ApifyService(token)
 
 
-def get_actor_id(env_var_name: str) -> str:
+async def get_actor_id(env_var_name: str) -> str:
     """Obtiene el ID de un actor desde variables de entorno"""
     actor_id = os.getenv(env_var_name)
     if not actor_id:
@@ -0,0 +1,34 @@
+"""
+Celery App - Cola de tareas en background (broker y backend en Redis)
+
+Iniciar el worker desde api_service/:
+    celery -A app.celery_app worker --loglevel=info
+"""
+import os
+
+from celery import Celery
+
+from app.config.env_loader import load_env
+
+load_env()
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+celery_app = Celery(
+    "ads_analyzer",
+    broker=os.getenv("CELERY_BROKER_URL", REDIS_URL),
+    backend=os.getenv("CELERY_RESULT_BACKEND", REDIS_URL),
+    include=["app.tasks.apify_tasks"],
+)
+
+celery_app.conf.update(
+    # Confirmar la tarea al terminar: si el worker muere se reintenta
+    task_acks_late=True,
+    # Tareas de red largas: un mensaje por worker a la vez
+    worker_prefetch_multiplier=1,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    result_expires=3600,
+)
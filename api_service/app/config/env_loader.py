@@ -1,14 +1,18 @@
+from functools import lru_cache
 from pathlib import Path
 import os
 from dotenv import load_dotenv
 
 
+@lru_cache(maxsize=None)
 def load_env(env_path: str | None = None) -> Path:
     """
     Carga el archivo .env para la aplicación.
 
     - Si `env_path` es None, busca primero en raíz del proyecto, luego en api_service/.env
     - Retorna el Path cargado (útil para registros y debugging).
+    - Se ejecuta una sola vez por `env_path`; las siguientes llamadas no
+      tocan el disco (usar `load_env.cache_clear()` para recargar).
     """
     if env_path:
         p = Path(env_path)
@@ -0,0 +1,39 @@
+"""
+Settings - Configuración resuelta una sola vez por proceso
+
+Lee las variables de entorno (tras cargar el .env) al primer uso y las
+deja en memoria; las dependencias de FastAPI la consultan en cada
+request sin volver a parsear el entorno.
+"""
+import os
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel
+
+from app.config.env_loader import load_env
+
+
+class Settings(BaseModel):
+    """Variables de entorno usadas por las rutas de Apify"""
+    apify_token: Optional[str] = None
+    apify_tiktok_name: str = "clockworks/tiktok-scraper"
+    apify_instagram_actor: str = "apify/instagram-scraper"
+    instagram_sync_client: bool = False
+    profiling_enabled: bool = False
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        values = {
+            name: os.environ[name.upper()]
+            for name in cls.model_fields
+            if os.environ.get(name.upper())
+        }
+        return cls(**values)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Settings compartidos (usar get_settings.cache_clear() en tests)"""
+    load_env()
+    return Settings.from_env()
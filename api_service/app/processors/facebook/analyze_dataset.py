@@ -13,28 +13,132 @@ functions are `analyze(csv_path, method, weights)` and
 from __future__ import annotations
 
 import ast
-import csv
 import json
+import logging
 import math
+import mmap
+import os
+import re
+from collections import Counter
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any, Dict, Iterator, List, Optional, Tuple
+)
+
+import numpy as np
+import orjson
+import pandas as pd
+
+try:  # pyarrow is optional: without it the CSV goes through pandas
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# Columns read from the CSV; everything else is skipped at parse time.
+_CSV_COLUMNS = frozenset(
+    {"ad_archive_id", "ad_id", "snapshot", "reach_estimate", "spend"}
+)
+
+
+# Python-literal tokens that need rewriting to become JSON. Strings are
+# matched first so None/True/False inside them are left untouched.
+_PY_LITERAL_RE = re.compile(
+    r"'[^'\\]*(?:\\.[^'\\]*)*'"
+    r'|"[^"\\]*(?:\\.[^"\\]*)*"'
+    r"|\b(?:None|True|False)\b"
+)
+_PY_KEYWORDS = {"None": "null", "True": "true", "False": "false"}
+# Python escapes that have no JSON equivalent
+_NON_JSON_ESCAPE_RE = re.compile(r"\\[^\\\"/bfnrtu]")
+# Escapes and bare double quotes inside a single-quoted Python string
+_SQ_BODY_RE = re.compile(r'\\(.)|"', re.DOTALL)
+_JSON_ESCAPES = frozenset('\\"/bfnrtu')
+
+# How often each parse path is taken (ast.literal_eval should be rare)
+parse_stats: Counter = Counter()
+
+
+class _NotJSONCompatible(ValueError):
+    pass
+
+
+def _sq_body_to_json(match: "re.Match[str]") -> str:
+    escaped = match.group(1)
+    if escaped is None:
+        return '\\"'
+    if escaped == "'":
+        return "'"
+    if escaped in _JSON_ESCAPES:
+        return match.group(0)
+    raise _NotJSONCompatible(match.group(0))
+
+
+def _py_token_to_json(match: "re.Match[str]") -> str:
+    tok = match.group(0)
+    if tok in _PY_KEYWORDS:
+        return _PY_KEYWORDS[tok]
+    if tok[0] == "'":
+        body = tok[1:-1]
+        if "\\" in body or '"' in body:
+            body = _SQ_BODY_RE.sub(_sq_body_to_json, body)
+        return '"' + body + '"'
+    if "\\" in tok and _NON_JSON_ESCAPE_RE.search(tok):
+        raise _NotJSONCompatible(tok)
+    return tok
+
+
+def _loads_dict(raw: Any) -> Optional[Dict[str, Any]]:
+    try:
+        obj = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return obj if isinstance(obj, dict) else None
 
 
 def parse_snapshot(raw: Any) -> Optional[Dict[str, Any]]:
+    """Parse a snapshot cell written either as JSON or as a Python repr.
+
+    Tries orjson directly, then orjson on the Python literal rewritten
+    to JSON, and only then `ast.literal_eval` (counted in `parse_stats`).
+    """
     if not raw:
         return None
+    if isinstance(raw, dict):
+        return raw
+
+    obj = _loads_dict(raw)
+    if obj is not None:
+        parse_stats["orjson"] += 1
+        return obj
+
+    if isinstance(raw, str):
+        try:
+            obj = _loads_dict(_PY_LITERAL_RE.sub(_py_token_to_json, raw))
+        except _NotJSONCompatible:
+            obj = None
+        if obj is not None:
+            parse_stats["normalized"] += 1
+            return obj
+
     try:
         obj = ast.literal_eval(raw)
         if isinstance(obj, dict):
+            parse_stats["literal_eval"] += 1
             return obj
     except Exception:
         pass
     try:
         obj = json.loads(raw)
         if isinstance(obj, dict):
+            parse_stats["json"] += 1
             return obj
     except Exception:
         pass
+    parse_stats["failed"] += 1
     return None
 
 
@@ -79,13 +183,17 @@ def _compute_score(ent: Dict[str, Any], weights: Dict[str, float]) -> float:
     spend = ent.get("spend") or 0
     images = ent.get("images", 0) or 0
     videos = ent.get("videos", 0) or 0
+    page_like = ent.get("page_like_count", 0) or 0
+    # Low-signal ads (no reach, spend, media or likes) always score 0
+    if not (reach or spend or images or videos or page_like):
+        return 0.0
 
     media = float(images + videos)
     has_video = 1.0 if videos > 0 else 0.0
 
     reach_s = math.log1p(reach) if reach else 0.0
     spend_s = math.log1p(spend) if spend else 0.0
-    page_like_s = math.log1p(ent.get("page_like_count", 0) or 0)
+    page_like_s = math.log1p(page_like)
 
     score = (
         weights.get("reach", 0.6) * reach_s
@@ -97,6 +205,217 @@ def _compute_score(ent: Dict[str, Any], weights: Dict[str, float]) -> float:
     return float(score)
 
 
+def _snapshot_features(
+    snapshot: Optional[Dict[str, Any]],
+) -> Tuple[int, int, List[str], Optional[float]]:
+    """Return (images, videos, urls, page_like) for one parsed snapshot."""
+    if not snapshot:
+        return 0, 0, [], None
+    imgs = len(snapshot.get("images") or [])
+    imgs += len(snapshot.get("cards") or [])
+    vids = len(snapshot.get("videos") or [])
+    return (
+        imgs,
+        vids,
+        extract_media_urls(snapshot),
+        to_number(snapshot.get("page_like_count")),
+    )
+
+
+def _to_numeric(series: pd.Series) -> pd.Series:
+    """Vectorized `to_number` for a string column (allows ',' separators)."""
+    return pd.to_numeric(
+        series.str.replace(",", "", regex=False).str.strip(),
+        errors="coerce",
+    )
+
+
+try:  # numba is optional: without it scoring stays in NumPy
+    from numba import config as numba_config, njit, prange
+except ImportError:
+    njit = None
+
+# Below this many ads the JIT/thread start-up costs more than it saves
+NUMBA_MIN_ADS = 20_000
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _score_kernel(
+        images, videos, reach, spend, page_like,
+        w_reach, w_spend, w_media, w_video, w_page_like,
+    ):
+        out = np.empty(reach.size)
+        for i in prange(reach.size):
+            out[i] = (
+                w_reach * math.log1p(reach[i])
+                + w_spend * math.log1p(spend[i])
+                + w_media * (images[i] + videos[i])
+                + w_video * (1.0 if videos[i] > 0 else 0.0)
+                + w_page_like * math.log1p(page_like[i])
+            )
+        return out
+    # The kernel only beats NumPy when prange can actually fan out
+    if numba_config.NUMBA_NUM_THREADS < 2:
+        _score_kernel = None
+else:
+    _score_kernel = None
+
+
+def _log1p_nonzero(values: np.ndarray) -> np.ndarray:
+    """`np.log1p` evaluated only on non-zero slots (zeros stay 0.0)."""
+    values = np.asarray(values, dtype=np.float64)
+    return np.log1p(values, out=np.zeros_like(values), where=values != 0)
+
+
+def _compute_scores(
+    images: np.ndarray,
+    videos: np.ndarray,
+    reach: np.ndarray,
+    spend: np.ndarray,
+    page_like: np.ndarray,
+    weights: Dict[str, float],
+) -> np.ndarray:
+    """Array version of `_compute_score` (NaN reach/spend count as 0)."""
+    reach = np.nan_to_num(reach)
+    spend = np.nan_to_num(spend)
+    w_reach = weights.get("reach", 0.6)
+    w_spend = weights.get("spend", 0.2)
+    w_media = weights.get("media", 1.0)
+    w_video = weights.get("video", 0.5)
+    w_page_like = weights.get("page_like", 0.1)
+
+    if _score_kernel is not None and reach.size >= NUMBA_MIN_ADS:
+        return _score_kernel(
+            images.astype(np.float64), videos.astype(np.float64),
+            reach, spend, page_like.astype(np.float64),
+            float(w_reach), float(w_spend), float(w_media),
+            float(w_video), float(w_page_like),
+        )
+
+    # Sparse exports are mostly zeros: skip log1p on those slots
+    return (
+        w_reach * _log1p_nonzero(reach)
+        + w_spend * _log1p_nonzero(spend)
+        + w_media * (images + videos)
+        + w_video * (videos > 0)
+        + w_page_like * _log1p_nonzero(page_like)
+    )
+
+
+def _aggregate(
+    frame: pd.DataFrame,
+    method: str,
+    weights: Dict[str, float],
+) -> Dict[str, Dict[str, Any]]:
+    """Group per-row features by ad_id and score each ad.
+
+    `frame` has one row per dataset row with columns ad_id, images,
+    videos, urls, page_like, reach and spend.
+    """
+    grouped = frame.groupby("ad_id", sort=False)
+    agg = grouped.agg(
+        rows=("images", "size"),
+        images=("images", "sum"),
+        videos=("videos", "sum"),
+        reach=("reach", "max"),
+        spend=("spend", "max"),
+        page_like_count=("page_like", "max"),
+    )
+    urls = grouped["urls"].agg(
+        lambda col: list(dict.fromkeys(chain.from_iterable(col)))
+    )
+
+    images = agg["images"].to_numpy()
+    videos = agg["videos"].to_numpy()
+    # Same floor as the scalar path: max(value, 0) over non-null values
+    reach = agg["reach"].clip(lower=0).to_numpy(dtype=float)
+    spend = agg["spend"].clip(lower=0).to_numpy(dtype=float)
+    page_like = agg["page_like_count"].clip(lower=0).to_numpy(dtype=float)
+
+    total_media = images + videos
+    if method == "heuristic":
+        scores = _compute_scores(
+            images, videos, reach, spend, page_like, weights
+        )
+    else:
+        scores = total_media.astype(float)
+
+    def _opt(values: np.ndarray) -> List[Optional[float]]:
+        return [None if math.isnan(v) else v for v in values.tolist()]
+
+    stats: Dict[str, Dict[str, Any]] = {}
+    for row in zip(
+        agg.index.tolist(),
+        agg["rows"].tolist(),
+        images.tolist(),
+        videos.tolist(),
+        urls.tolist(),
+        _opt(reach),
+        _opt(spend),
+        page_like.tolist(),
+        total_media.tolist(),
+        scores.tolist(),
+    ):
+        ad_id = row[0]
+        stats[ad_id] = {
+            "ad_id": ad_id,
+            "rows": row[1],
+            "images": row[2],
+            "videos": row[3],
+            "urls": row[4],
+            "reach": row[5],
+            "spend": row[6],
+            "page_like_count": row[7],
+            "total_media": row[8],
+            "score": row[9],
+        }
+    return stats
+
+
+def _read_csv(csv_path: Path) -> pd.DataFrame:
+    """Read the `_CSV_COLUMNS` present in the CSV as str, empty -> "".
+
+    Uses the multithreaded pyarrow reader when available and falls back
+    to pandas' C parser otherwise (or if pyarrow rejects the file).
+    A CSV with no columns at all reads as an empty frame.
+    """
+    if pa is not None:
+        names = sorted(_CSV_COLUMNS)
+        try:
+            table = pacsv.read_csv(
+                csv_path,
+                read_options=pacsv.ReadOptions(block_size=8 << 20),
+                parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=names,
+                    include_missing_columns=True,
+                    column_types={name: pa.string() for name in names},
+                    strings_can_be_null=False,
+                ),
+            )
+        except (pa.ArrowInvalid, UnicodeDecodeError) as exc:
+            logger.debug("pyarrow could not read %s: %s", csv_path, exc)
+        else:
+            # Columns absent from the file come back entirely null
+            present = [
+                name for name in table.column_names
+                if table.column(name).null_count < table.num_rows
+            ]
+            return table.select(present).to_pandas(self_destruct=True)
+
+    try:
+        return pd.read_csv(
+            csv_path,
+            usecols=lambda col: col in _CSV_COLUMNS,
+            dtype=str,
+            keep_default_na=False,
+            encoding="utf-8",
+        )
+    except pd.errors.EmptyDataError:
+        # A run with 0 items is written as a blank/newline-only CSV
+        return pd.DataFrame()
+
+
 def analyze(
     csv_path: Path,
     method: str = "heuristic",
@@ -104,59 +423,70 @@ def analyze(
 ) -> Dict[str, Dict[str, Any]]:
     if weights is None:
         weights = {}
-    stats: Dict[str, Dict[str, Any]] = {}
-    with csv_path.open(newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        for row in reader:
-            ad_id = row.get("ad_archive_id") or row.get("ad_id") or "unknown"
-            raw = row.get("snapshot")
-            snapshot = parse_snapshot(raw)
-            imgs = 0
-            vids = 0
-            urls: List[str] = []
-            page_like = None
-            if snapshot:
-                urls = extract_media_urls(snapshot)
-                imgs = len(snapshot.get("images") or [])
-                imgs += len(snapshot.get("cards") or [])
-                vids = len(snapshot.get("videos") or [])
-                page_like = to_number(snapshot.get("page_like_count"))
-            reach = to_number(row.get("reach_estimate"))
-            spend = to_number(row.get("spend"))
-
-            ent = stats.setdefault(
-                ad_id,
-                {
-                    "ad_id": ad_id,
-                    "rows": 0,
-                    "images": 0,
-                    "videos": 0,
-                    "urls": [],
-                    "reach": None,
-                    "spend": None,
-                    "page_like_count": 0,
-                },
+    df = _read_csv(csv_path)
+
+    # ad_archive_id -> ad_id -> "unknown" (empty strings fall through)
+    ad_ids = pd.Series("unknown", index=df.index, dtype=object)
+    for col in ("ad_id", "ad_archive_id"):
+        if col in df:
+            ad_ids = df[col].where(df[col] != "", ad_ids)
+
+    if "snapshot" in df:
+        # Multi-row ads repeat the same snapshot cell verbatim: parse and
+        # extract features once per distinct string, then fan out by code.
+        codes, uniques = pd.factorize(df["snapshot"], sort=False)
+        slow_before = parse_stats["literal_eval"]
+        unique_features = [
+            _snapshot_features(parse_snapshot(raw)) for raw in uniques
+        ]
+        slow = parse_stats["literal_eval"] - slow_before
+        if slow:
+            logger.debug(
+                "%s: %d snapshots needed ast.literal_eval", csv_path, slow
             )
-            ent["rows"] += 1
-            ent["images"] += imgs
-            ent["videos"] += vids
-            ent["urls"].extend(urls)
-            if page_like:
-                cur = ent.get("page_like_count") or 0
-                ent["page_like_count"] = max(cur, page_like)
-            if reach is not None:
-                ent["reach"] = max(reach, ent.get("reach") or 0)
-            if spend is not None:
-                ent["spend"] = max(spend, ent.get("spend") or 0)
-
-    for ad_id, ent in stats.items():
-        ent["urls"] = list(dict.fromkeys(ent["urls"]))
-        ent["total_media"] = ent["images"] + ent["videos"]
-        if method == "heuristic":
-            ent["score"] = _compute_score(ent, weights)
-        else:
-            ent["score"] = float(ent["total_media"])
-    return stats
+        features = [unique_features[code] for code in codes.tolist()]
+    else:
+        features = [_snapshot_features(None)] * len(df)
+    imgs, vids, urls, page_like = (
+        zip(*features) if features else ((), (), (), ())
+    )
+
+    empty = pd.Series(np.nan, index=df.index)
+    frame = pd.DataFrame({
+        "ad_id": ad_ids,
+        "images": np.asarray(imgs, dtype=np.int64),
+        "videos": np.asarray(vids, dtype=np.int64),
+        "urls": list(urls),
+        "page_like": np.asarray(
+            [np.nan if v is None else v for v in page_like], dtype=float
+        ),
+        "reach": (
+            _to_numeric(df["reach_estimate"])
+            if "reach_estimate" in df else empty
+        ),
+        "spend": _to_numeric(df["spend"]) if "spend" in df else empty,
+    })
+    frame["page_like"] = frame["page_like"].fillna(0)
+    return _aggregate(frame, method, weights)
+
+
+def _iter_jsonl(jsonl_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield each JSON object line of a JSONL file, skipping bad lines.
+
+    The file is memory-mapped and decoded with orjson straight from the
+    mapped bytes, so no per-line str is built.
+    """
+    with jsonl_path.open("rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                try:
+                    item = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                if isinstance(item, dict):
+                    yield item
 
 
 def analyze_jsonl(
@@ -166,69 +496,43 @@ def analyze_jsonl(
 ) -> Dict[str, Dict[str, Any]]:
     if weights is None:
         weights = {}
-    stats: Dict[str, Dict[str, Any]] = {}
-    with jsonl_path.open("r", encoding="utf-8") as jf:
-        for line in jf:
-            try:
-                item = json.loads(line)
-            except Exception:
-                continue
-            ad_id = (
-                item.get("ad_archive_id")
-                or item.get("adArchiveID")
-                or item.get("id")
-                or "unknown"
-            )
-            snap = item.get("snapshot") or {}
-            if isinstance(snap, dict):
-                imgs = len(snap.get("images") or [])
-                imgs += len(snap.get("cards") or [])
-                vids = len(snap.get("videos") or [])
-                urls = extract_media_urls(snap)
-                page_like = to_number(snap.get("page_like_count"))
-            else:
-                imgs = 0
-                vids = 0
-                urls = []
-                page_like = None
-
-            reach = to_number(item.get("reach_estimate"))
-            spend = to_number(item.get("spend"))
-
-            ent = stats.setdefault(
-                ad_id,
-                {
-                    "ad_id": ad_id,
-                    "rows": 0,
-                    "images": 0,
-                    "videos": 0,
-                    "urls": [],
-                    "reach": None,
-                    "spend": None,
-                    "page_like_count": 0,
-                },
-            )
-            ent["rows"] += 1
-            ent["images"] += imgs
-            ent["videos"] += vids
-            ent["urls"].extend(urls)
-            if page_like:
-                cur = ent.get("page_like_count") or 0
-                ent["page_like_count"] = max(cur, page_like)
-            if reach is not None:
-                ent["reach"] = max(reach, ent.get("reach") or 0)
-            if spend is not None:
-                ent["spend"] = max(spend, ent.get("spend") or 0)
-
-    for ad_id, ent in stats.items():
-        ent["urls"] = list(dict.fromkeys(ent["urls"]))
-        ent["total_media"] = ent["images"] + ent["videos"]
-        if method == "heuristic":
-            ent["score"] = _compute_score(ent, weights)
-        else:
-            ent["score"] = float(ent["total_media"])
-
-    return stats
+    # Plain per-row columns; grouping and max/sum happen once in _aggregate
+    ad_ids: List[Any] = []
+    images: List[int] = []
+    videos: List[int] = []
+    urls: List[List[str]] = []
+    page_like: List[float] = []
+    reach: List[Optional[float]] = []
+    spend: List[Optional[float]] = []
+
+    for item in _iter_jsonl(jsonl_path):
+        ad_ids.append(
+            item.get("ad_archive_id")
+            or item.get("adArchiveID")
+            or item.get("id")
+            or "unknown"
+        )
+        snap = item.get("snapshot")
+        imgs, vids, ad_urls, likes = _snapshot_features(
+            snap if isinstance(snap, dict) else None
+        )
+        images.append(imgs)
+        videos.append(vids)
+        urls.append(ad_urls)
+        page_like.append(likes or 0)
+        reach.append(to_number(item.get("reach_estimate")))
+        spend.append(to_number(item.get("spend")))
+
+    frame = pd.DataFrame({
+        "ad_id": pd.Series(ad_ids, dtype=object),
+        "images": np.asarray(images, dtype=np.int64),
+        "videos": np.asarray(videos, dtype=np.int64),
+        "urls": urls,
+        "page_like": np.asarray(page_like, dtype=float),
+        "reach": np.asarray(reach, dtype=float),
+        "spend": np.asarray(spend, dtype=float),
+    })
+    return _aggregate(frame, method, weights)
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -6,11 +6,12 @@ con procesamiento asíncrono y optimización automática
 
 from .image_optimizer import ImageOptimizer, optimize_image
 from .async_encoder import AsyncMediaEncoder
-from .batch_processor import BatchMediaProcessor
+from .batch_processor import BatchMediaProcessor, load_media_item
 
 __all__ = [
     'ImageOptimizer',
     'optimize_image',
     'AsyncMediaEncoder',
-    'BatchMediaProcessor'
+    'BatchMediaProcessor',
+    'load_media_item'
 ]
@@ -4,15 +4,65 @@ Codificación asíncrona masiva de imágenes y frames
 """
 
 import asyncio
-import base64
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
-import aiofiles
 from .image_optimizer import ImageOptimizer
 
 logger = logging.getLogger(__name__)
 
+# Cada cuántos archivos completados se reporta progreso (y siempre al final)
+PROGRESS_EVERY = 50
+
+# Por debajo de este tamaño el IPC con el proceso hijo cuesta más que
+# optimizar la imagen: se queda en el pool de threads
+PROCESS_POOL_MIN_BYTES = 50 * 1024
+
+
+def _read_and_encode(
+    file_path: Path,
+    optimizer_settings: Dict
+) -> Tuple[int, Tuple[str, dict]]:
+    """
+    Lee, optimiza y codifica un archivo en un proceso hijo
+
+    Función de módulo para que sea picklable; el archivo se lee en el hijo
+    y solo el base64 resultante vuelve por IPC. `optimizer_settings` son
+    los kwargs del ImageOptimizer del encoder (el optimizador no es
+    picklable: guarda buffers por thread).
+    """
+    image_bytes = file_path.read_bytes()
+    optimizer = ImageOptimizer(**optimizer_settings)
+    return len(image_bytes), optimizer.optimize_and_encode(image_bytes)
+
+
+def scan_media_files(
+    directory: Path,
+    extensions: tuple = ('.jpg', '.jpeg', '.png'),
+    recursive: bool = False
+) -> List[Path]:
+    """
+    Lista archivos de `directory` con extensión en `extensions`
+
+    Usa os.scandir: el tipo de cada entrada viene del propio listado,
+    sin un stat extra por archivo, y solo se crea Path para los elegidos.
+    """
+    wanted = {ext.lower() for ext in extensions}
+    files: List[Path] = []
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in wanted:
+                        files.append(Path(entry.path))
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+    return files
+
 
 class AsyncMediaEncoder:
     """
@@ -23,21 +73,77 @@ class AsyncMediaEncoder:
         self,
         max_concurrent: int = 10,
         max_size: int = 1024,
-        quality: int = 85
+        quality: int = 85,
+        processes: Optional[int] = None,
+        optimize: bool = True
     ):
         """
         Args:
             max_concurrent: Máximo de archivos procesados simultáneamente
             max_size: Tamaño máximo de imagen (px)
             quality: Calidad JPEG
+            processes: Procesos para optimizar imágenes grandes
+                (None = os.cpu_count(); con 1 o menos se usan solo threads)
+            optimize: Pasada de Huffman del JPEG (ver ImageOptimizer)
         """
         self.max_concurrent = max_concurrent
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.optimizer = ImageOptimizer(
-            max_width=max_size,
-            max_height=max_size,
-            quality=quality
+        self.max_size = max_size
+        self.quality = quality
+        self.processes = (
+            (os.cpu_count() or 1) if processes is None else processes
         )
+        # Pool de procesos perezoso, vivo entre lotes; ver aclose()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.optimizer_settings = {
+            'max_width': max_size,
+            'max_height': max_size,
+            'quality': quality,
+            'optimize': optimize,
+        }
+        self.optimizer = ImageOptimizer(**self.optimizer_settings)
+
+    async def __aenter__(self) -> "AsyncMediaEncoder":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Cierra el pool de procesos (si se creó)"""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Pool de procesos perezoso, reutilizado entre lotes"""
+        if self._pool is None:
+            # spawn: el proceso padre (servidor) ya tiene threads vivos
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._pool
+
+    def _read_and_encode_sync(self, file_path: Path) -> Tuple[int, Tuple[str, dict]]:
+        """Lee el archivo completo y lo optimiza/codifica (bloqueante)"""
+        image_bytes = file_path.read_bytes()
+        return len(image_bytes), self.optimizer.optimize_and_encode(image_bytes)
+
+    async def _encode_file(self, file_path: Path) -> Tuple[int, Tuple[str, dict]]:
+        """
+        Optimiza en el pool de procesos si hay más de un CPU y la imagen
+        es grande; si no, en un thread (Pillow suelta el GIL solo en parte)
+        """
+        if (
+            self.processes > 1
+            and file_path.stat().st_size >= PROCESS_POOL_MIN_BYTES
+        ):
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), _read_and_encode,
+                file_path, self.optimizer_settings
+            )
+        return await asyncio.to_thread(self._read_and_encode_sync, file_path)
 
     async def encode_single_file(
         self,
@@ -58,20 +164,15 @@ class AsyncMediaEncoder:
         """
         async with self.semaphore:
             try:
-                # Leer archivo de forma asíncrona
-                async with aiofiles.open(file_path, 'rb') as f:
-                    image_bytes = await f.read()
-
-                # Optimizar y codificar (síncrono pero rápido)
-                base64_str, opt_metadata = await asyncio.to_thread(
-                    self.optimizer.optimize_and_encode,
-                    image_bytes
+                # Leer + optimizar + codificar en un solo salto a thread/proceso
+                size, (base64_str, opt_metadata) = await self._encode_file(
+                    file_path
                 )
 
                 # Combinar metadata
                 result_metadata = {
                     'filename': file_path.name,
-                    'size_kb': len(image_bytes) / 1024,
+                    'size_kb': size / 1024,
                     **opt_metadata
                 }
 
@@ -103,29 +204,32 @@ class AsyncMediaEncoder:
 
         Args:
             file_paths: Lista de rutas a procesar
-            progress_callback: Función callback(completed, total)
+            progress_callback: Función callback(completed, total), llamada
+                cada PROGRESS_EVERY archivos y al terminar
 
         Returns:
             Lista de resultados
         """
-        tasks = []
-
-        for file_path in file_paths:
-            task = self.encode_single_file(file_path)
-            tasks.append(task)
-
-        results = []
+        total = len(file_paths)
+        results: List[Optional[Dict]] = [None] * total
         completed = 0
+        # Iterador compartido: cada worker toma el siguiente archivo libre
+        pending = iter(enumerate(file_paths))
 
-        # Procesar con callback de progreso
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            results.append(result)
-            completed += 1
-
-            if progress_callback:
-                progress_callback(completed, len(file_paths))
+        async def worker() -> None:
+            nonlocal completed
+            for index, file_path in pending:
+                results[index] = await self.encode_single_file(file_path)
+                completed += 1
+                if progress_callback and (
+                    completed % PROGRESS_EVERY == 0 or completed == total
+                ):
+                    progress_callback(completed, total)
 
+        # max_concurrent workers fijos: memoria O(concurrencia), no O(archivos)
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.max_concurrent, total)))
+        )
         return results
 
     async def encode_directory(
@@ -148,16 +252,7 @@ class AsyncMediaEncoder:
             }
         """
         # Buscar archivos
-        if recursive:
-            files = [
-                p for p in directory.rglob('*')
-                if p.is_file() and p.suffix.lower() in extensions
-            ]
-        else:
-            files = [
-                p for p in directory.iterdir()
-                if p.is_file() and p.suffix.lower() in extensions
-            ]
+        files = scan_media_files(directory, extensions, recursive)
 
         logger.info(f"Encontrados {len(files)} archivos en {directory}")
 
@@ -193,5 +288,5 @@ async def encode_images_async(
     Returns:
         Lista de resultados codificados
     """
-    encoder = AsyncMediaEncoder(max_concurrent, max_size)
-    return await encoder.encode_batch(image_paths)
+    async with AsyncMediaEncoder(max_concurrent, max_size) as encoder:
+        return await encoder.encode_batch(image_paths)
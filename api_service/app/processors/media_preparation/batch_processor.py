@@ -4,17 +4,26 @@ Procesador de alto nivel para preparar lotes grandes de multimedia
 """
 
 import asyncio
-import aiohttp
+import httpx
+import orjson
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import BinaryIO, List, Dict, Optional
 import logging
 from tqdm.asyncio import tqdm as async_tqdm
 
-from .async_encoder import AsyncMediaEncoder
+from .async_encoder import AsyncMediaEncoder, PROGRESS_EVERY, scan_media_files
 from .image_optimizer import ImageOptimizer
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 multiplexa las descargas al CDN sobre una conexión (requiere h2)
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+DOWNLOAD_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
 
 class BatchMediaProcessor:
     """
@@ -45,6 +54,8 @@ class BatchMediaProcessor:
             quality=quality
         )
         self.detail_level = detail_level
+        # Cliente HTTP compartido entre lotes (pool + DNS); ver aclose()
+        self._client: Optional[httpx.AsyncClient] = None
         self.stats = {
             'total_processed': 0,
             'total_errors': 0,
@@ -52,6 +63,30 @@ class BatchMediaProcessor:
             'total_size_optimized': 0
         }
 
+    async def __aenter__(self) -> "BatchMediaProcessor":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Cierra el cliente HTTP compartido y el pool del encoder"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        await self.encoder.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Cliente HTTP perezoso, reutilizado entre llamadas"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=10,
+                limits=DOWNLOAD_LIMITS,
+                follow_redirects=True
+            )
+        return self._client
+
     async def process_ad_images(
         self,
         ad_id: str,
@@ -169,7 +204,8 @@ class BatchMediaProcessor:
     async def process_multiple_ads(
         self,
         ads_data: List[Dict],
-        show_progress: bool = True
+        show_progress: bool = True,
+        out_stream: Optional[BinaryIO] = None
     ) -> Dict:
         """
         Procesa múltiples anuncios con imágenes y frames
@@ -181,6 +217,11 @@ class BatchMediaProcessor:
                 'frame_paths': [Path, ...]
             }
             show_progress: Mostrar barra de progreso
+            out_stream: Stream binario opcional (p.ej.
+                gzip.open(path, 'wb', compresslevel=1)). Si se pasa, cada
+                imagen/frame se escribe ahí como una línea JSON y en
+                memoria solo queda su 'offset' en lugar del 'base64'
+                (ver load_media_item)
 
         Returns:
             {
@@ -191,63 +232,77 @@ class BatchMediaProcessor:
         media_by_ad = {}
         tasks = []
 
+        async def tagged(task_type: str, ad_id: str, coro) -> tuple:
+            return task_type, ad_id, await coro
+
         # Crear tareas para imágenes y frames
         for ad_data in ads_data:
             ad_id = ad_data['ad_id']
 
             if ad_data.get('image_paths'):
-                tasks.append(('images', ad_id, self.process_ad_images(
+                tasks.append(tagged('images', ad_id, self.process_ad_images(
                     ad_id,
                     ad_data['image_paths'],
                     ad_data.get('max_images', 5)
                 )))
 
             if ad_data.get('frame_paths'):
-                tasks.append(('frames', ad_id, self.process_ad_frames(
+                tasks.append(tagged('frames', ad_id, self.process_ad_frames(
                     ad_id,
                     ad_data['frame_paths'],
                     ad_data.get('max_frames', 10)
                 )))
 
-        # Procesar con barra de progreso
-        if show_progress:
-            results = []
-            for task_type, ad_id, coro in async_tqdm(
-                tasks,
-                desc="Procesando multimedia"
-            ):
-                result = await coro
-                results.append((task_type, ad_id, result))
-        else:
-            coros = [coro for _, _, coro in tasks]
-            task_results = await asyncio.gather(*coros)
-            results = [
-                (tasks[i][0], tasks[i][1], task_results[i])
-                for i in range(len(tasks))
-            ]
-
-        # Organizar resultados por anuncio
-        for task_type, ad_id, result in results:
-            if ad_id not in media_by_ad:
+            # Entradas creadas en el orden de ads_data, no de finalización
+            if (ad_data.get('image_paths') or ad_data.get('frame_paths')) \
+                    and ad_id not in media_by_ad:
                 media_by_ad[ad_id] = {
                     'images': [],
                     'frames': [],
                     'errors': []
                 }
 
-            if task_type == 'images':
-                media_by_ad[ad_id]['images'] = result['images']
-            else:
-                media_by_ad[ad_id]['frames'] = result['frames']
+        bar = async_tqdm(
+            total=len(tasks),
+            desc="Procesando multimedia",
+            disable=not show_progress
+        )
+        # Cada resultado se organiza (y se vuelca a out_stream) en cuanto
+        # termina, sin esperar a que acabe todo el lote
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                task_type, ad_id, result = await next_done
+                media_by_ad[ad_id][task_type] = self._spill(
+                    result[task_type], out_stream)
 
-            if result.get('errors'):
-                media_by_ad[ad_id]['errors'].extend(result['errors'])
+                if result.get('errors'):
+                    media_by_ad[ad_id]['errors'].extend(result['errors'])
+                bar.update(1)
+        finally:
+            bar.close()
 
         return {
             'media_by_ad': media_by_ad,
             'stats': self.stats
         }
 
+    @staticmethod
+    def _spill(
+        items: List[Dict],
+        out_stream: Optional[BinaryIO]
+    ) -> List[Dict]:
+        """Escribe cada item en out_stream (JSONL) y deja solo su offset"""
+        if out_stream is None:
+            return items
+        spilled = []
+        for item in items:
+            offset = out_stream.tell()
+            out_stream.write(orjson.dumps(item) + b"\n")
+            ref = {k: v for k, v in item.items() if k != 'base64'}
+            ref['offset'] = offset
+            spilled.append(ref)
+        return spilled
+
     async def prepare_images_from_urls(
         self,
         urls: List[str],
@@ -263,36 +318,38 @@ class BatchMediaProcessor:
         Returns:
             Lista de resultados {'success': bool, 'base64': str, ...}
         """
-        results = []
+        # Conexiones reutilizadas entre lotes: se cierran con aclose()
+        session = self._get_client()
+        total = len(urls)
+        done = 0
+        bar = async_tqdm(total=total, desc=desc)
+
+        async def track(url: str) -> Dict:
+            # Barra actualizada por lotes, no en cada descarga
+            nonlocal done
+            result = await self._download_and_encode(session, url)
+            done += 1
+            if done % PROGRESS_EVERY == 0 or done == total:
+                bar.update(done - bar.n)
+            return result
 
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for url in urls:
-                task = self._download_and_encode(session, url)
-                tasks.append(task)
-
-            # Procesar con barra de progreso
-            for coro in async_tqdm.as_completed(
-                tasks,
-                total=len(tasks),
-                desc=desc
-            ):
-                result = await coro
-                results.append(result)
+        try:
+            results = await asyncio.gather(*(track(url) for url in urls))
+        finally:
+            bar.close()
 
         return results
 
     async def _download_and_encode(
         self,
-        session: aiohttp.ClientSession,
+        session: httpx.AsyncClient,
         url: str
     ) -> Dict:
         """Descarga URL y codifica"""
         try:
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with session.get(url, timeout=timeout) as response:
-                response.raise_for_status()
-                image_bytes = await response.read()
+            response = await session.get(url)
+            response.raise_for_status()
+            image_bytes = response.content
 
             # Optimizar y codificar
             base64_str, metadata = await asyncio.to_thread(
@@ -332,11 +389,7 @@ class BatchMediaProcessor:
             Lista de resultados {'success': bool, 'base64': str, ...}
         """
         # Buscar archivos de imagen
-        image_extensions = ('.jpg', '.jpeg', '.png')
-        frame_files = [
-            f for f in frames_dir.iterdir()
-            if f.is_file() and f.suffix.lower() in image_extensions
-        ]
+        frame_files = scan_media_files(frames_dir, ('.jpg', '.jpeg', '.png'))
 
         if not frame_files:
             logger.warning(f"No se encontraron frames en {frames_dir}")
@@ -386,3 +439,14 @@ class BatchMediaProcessor:
                 else 0
             )
         }
+
+
+def load_media_item(stream: BinaryIO, offset: int) -> Dict:
+    """
+    Relee un item escrito por process_multiple_ads(out_stream=...)
+
+    `stream` debe estar abierto en lectura (gzip.open(path, 'rb') para
+    un stream gzip) y `offset` es el guardado en el item en memoria.
+    """
+    stream.seek(offset)
+    return orjson.loads(stream.readline())
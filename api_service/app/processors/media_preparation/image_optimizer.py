@@ -3,16 +3,64 @@ Image Optimizer
 Redimensiona y optimiza imágenes para OpenAI Vision
 """
 
-import base64
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 from PIL import Image
 import io
 import logging
+import struct
+import threading
+
+try:
+    import pybase64 as base64  # Opcional: base64 SIMD, misma API
+except ImportError:
+    import base64
 
 logger = logging.getLogger(__name__)
 
 
+# Marcadores SOFn (inicio de frame): todos C0-CF salvo DHT, JPG y DAC
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_frame_info(data: bytes) -> Optional[Tuple[int, int, int]]:
+    """
+    (ancho, alto, componentes) leídos del marcador SOF de un JPEG, sin
+    decodificarlo; None si no es JPEG o la cabecera no se puede leer
+    """
+    if data[:3] != b'\xff\xd8\xff':
+        return None
+    pos, size = 2, len(data)
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # byte de relleno
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # sin longitud
+            pos += 2
+            continue
+        if marker == 0xDA:  # SOS: empiezan los datos sin haber visto SOF
+            return None
+        (length,) = struct.unpack_from('>H', data, pos + 2)
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 10 > size:
+                return None
+            height, width, components = struct.unpack_from(
+                '>HHB', data, pos + 5
+            )
+            return width, height, components
+        pos += 2 + length
+    return None
+
+
+def _release(data: Union[bytes, memoryview]) -> None:
+    """Libera la vista devuelta por _optimize (el buffer vuelve a ser usable)"""
+    if isinstance(data, memoryview):
+        data.release()
+
+
 class ImageOptimizer:
     """
     Optimiza imágenes para Vision API:
@@ -25,17 +73,35 @@ class ImageOptimizer:
         self,
         max_width: int = 1024,
         max_height: int = 1024,
-        quality: int = 85
+        quality: int = 85,
+        optimize: bool = True
     ):
         """
         Args:
             max_width: Ancho máximo en píxeles
             max_height: Alto máximo en píxeles
             quality: Calidad JPEG (1-100)
+            optimize: Segunda pasada de Huffman: duplica el costo del
+                encode (~4 ms más a 1024px) pero reduce ~20% el base64
+                que se sube a Vision
         """
         self.max_width = max_width
         self.max_height = max_height
         self.quality = quality
+        self.optimize = optimize
+        # Buffer de salida por thread, reutilizado entre imágenes
+        self._local = threading.local()
+
+    def _output_buffer(self) -> io.BytesIO:
+        """BytesIO del thread actual, rebobinado (conserva su capacidad)"""
+        buffer = getattr(self._local, 'buffer', None)
+        try:
+            buffer.seek(0)
+            # write falla si sigue exportada una vista sin liberar
+            buffer.write(b'')
+        except (AttributeError, BufferError):
+            buffer = self._local.buffer = io.BytesIO()
+        return buffer
 
     def optimize_image_bytes(
         self,
@@ -48,6 +114,43 @@ class ImageOptimizer:
         Returns:
             (bytes_optimizados, metadata)
         """
+        optimized, metadata = self._optimize(image_bytes, format)
+        try:
+            return bytes(optimized), metadata
+        finally:
+            _release(optimized)
+
+    def _optimize(
+        self,
+        image_bytes: bytes,
+        format: str = 'JPEG'
+    ) -> Tuple[Union[bytes, memoryview], dict]:
+        """
+        Igual que optimize_image_bytes pero devuelve una vista del buffer
+        de salida (sin la copia de BytesIO.getvalue()); el buffer es del
+        thread y se reutiliza, así que hay que liberarla con _release()
+        """
+        # JPEG a color que ya cabe en el máximo: se devuelve tal cual, sin
+        # decodificar ni recomprimir
+        if format == 'JPEG':
+            info = _jpeg_frame_info(image_bytes)
+            if info is not None:
+                width, height, components = info
+                if (
+                    components == 3
+                    and 0 < width <= self.max_width
+                    and 0 < height <= self.max_height
+                ):
+                    return image_bytes, {
+                        'original_size': len(image_bytes),
+                        'optimized_size': len(image_bytes),
+                        'original_dimensions': (width, height),
+                        'final_dimensions': (width, height),
+                        'compression_ratio': 1.0,
+                        'format': format,
+                        'unchanged': True
+                    }
+
         try:
             # Abrir imagen
             img = Image.open(io.BytesIO(image_bytes))
@@ -56,7 +159,15 @@ class ImageOptimizer:
             original_size = len(image_bytes)
             original_dims = img.size
 
-            # Convertir a RGB si es necesario
+            # JPEG: libjpeg-turbo decodifica ya reducido (escala DCT 1/2..1/8)
+            # a un tamaño >= el objetivo; el thumbnail termina el ajuste
+            if img.width > self.max_width or img.height > self.max_height:
+                img.draft('RGB', (self.max_width, self.max_height))
+
+            # Convertir a RGB si es necesario (fondo blanco bajo la
+            # transparencia). paste con máscara es C puro: un blend en NumPy
+            # (uint16) mide ~3.5x más lento, y componer tras el thumbnail no
+            # gana nada por la premultiplicación RGBa del resize
             if img.mode in ('RGBA', 'LA', 'P'):
                 background = Image.new('RGB', img.size, (255, 255, 255))
                 if img.mode == 'P':
@@ -67,27 +178,29 @@ class ImageOptimizer:
             elif img.mode != 'RGB':
                 img = img.convert('RGB')
 
-            # Redimensionar si es necesario
+            # Redimensionar si es necesario (BOX = promedio de área, como
+            # INTER_AREA de OpenCV: ~3x más rápido que LANCZOS al reducir)
             if img.width > self.max_width or img.height > self.max_height:
                 img.thumbnail((self.max_width, self.max_height),
-                              Image.Resampling.LANCZOS)
+                              Image.Resampling.BOX)
 
-            # Comprimir
-            output = io.BytesIO()
+            # Comprimir (sin truncate: liberaría la memoria del buffer; los
+            # bytes viejos tras tell() quedan fuera de la vista)
+            output = self._output_buffer()
             img.save(output, format=format,
-                     quality=self.quality, optimize=True)
-            optimized_bytes = output.getvalue()
+                     quality=self.quality, optimize=self.optimize)
+            optimized = output.getbuffer()[:output.tell()]
 
             metadata = {
                 'original_size': original_size,
-                'optimized_size': len(optimized_bytes),
+                'optimized_size': len(optimized),
                 'original_dimensions': original_dims,
                 'final_dimensions': img.size,
-                'compression_ratio': original_size / len(optimized_bytes) if optimized_bytes else 1,
+                'compression_ratio': original_size / len(optimized) if optimized else 1,
                 'format': format
             }
 
-            return optimized_bytes, metadata
+            return optimized, metadata
 
         except Exception as e:
             logger.error(f"Error optimizando imagen: {e}")
@@ -108,9 +221,12 @@ class ImageOptimizer:
         Returns:
             (base64_string, metadata)
         """
-        optimized_bytes, metadata = self.optimize_image_bytes(
-            image_bytes, format)
-        base64_str = base64.b64encode(optimized_bytes).decode('utf-8')
+        optimized, metadata = self._optimize(image_bytes, format)
+        # base64 directo desde el buffer del encoder: una copia menos
+        try:
+            base64_str = base64.b64encode(optimized).decode('ascii')
+        finally:
+            _release(optimized)
 
         metadata['base64_size'] = len(base64_str)
 
@@ -9,7 +9,7 @@ from .build import (
     build_from_json,
     get_dataset_stats
 )
-from .transform import normalize_item, filter_valid_items
+from .transform import normalize_item, normalize_items, filter_valid_items
 from .media import download_image, bulk_download
 
 __all__ = [
@@ -25,6 +25,7 @@ __all__ = [
     "get_dataset_stats",
     # Transformación
     "normalize_item",
+    "normalize_items",
     "filter_valid_items",
     # Medios
     "download_image",
@@ -5,14 +5,37 @@ Coordina: fetch → transform → download → persist
 from __future__ import annotations
 from typing import List, Dict, Any
 from pathlib import Path
-import json
+import numpy as np
+import orjson
 import pandas as pd
-from tqdm import tqdm
 
-from .schema import infer_item_id
-from .transform import normalize_item, filter_valid_items
+from .schema import dotted_get, infer_item_id
+from .transform import normalize_items
 from .media import bulk_download
 
+# Columnas copiadas tal cual al manifest (tras id, image y caption)
+MANIFEST_COLUMNS = [
+    "duration_s",
+    "playCount",
+    "diggCount",
+    "shareCount",
+    "commentCount",
+    "collectCount",
+    "ER_play",
+    "total_engagement",
+    "label_viral",
+    "webVideoUrl",
+    "hashtags",
+    "n_hashtags",
+]
+
+
+def _json_default(obj: Any) -> Any:
+    """Serializa los faltantes de pandas (pd.NA) como null"""
+    if obj is pd.NA:
+        return None
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
 
 def build_from_items(
     items: List[Dict[str, Any]],
@@ -27,7 +50,7 @@ def build_from_items(
 
     Proceso:
     1. Filtrar items válidos
-    2. Normalizar items y calcular métricas
+    2. Normalizar items y calcular métricas (por columnas)
     3. Descargar imágenes (opcional)
     4. Crear label de viralidad
     5. Persistir: parquet, csv, jsonl
@@ -51,50 +74,66 @@ def build_from_items(
     out_dir.mkdir(parents=True, exist_ok=True)
     img_dir.mkdir(parents=True, exist_ok=True)
 
-    # 1. Filtrar items válidos
+    # 1. Filtrar items válidos (mismo criterio que filter_valid_items) e
+    # inferir su ID en la misma pasada
     print("🔍 Filtrando items válidos...")
-    valid_items = filter_valid_items(items)
+    valid_items: List[Dict[str, Any]] = []
+    item_ids: List[str] = []
+    for it in items:
+        if dotted_get(it, "webVideoUrl"):
+            item_ids.append(infer_item_id(it, str(len(valid_items))))
+            valid_items.append(it)
     print(f"   ✓ {len(valid_items)} items válidos de {len(items)}")
 
-    # 2. Normalizar items
+    # 2. Normalizar items (por columnas, sin un dict por item)
     print("🔄 Normalizando items...")
-    rows: List[Dict[str, Any]] = []
-    for idx, it in enumerate(tqdm(valid_items, desc="Normalizando")):
-        item_id = infer_item_id(it, str(idx))
-        rows.append(normalize_item(it, item_id))
+    df = normalize_items(valid_items, item_ids)
 
     # 3. Descargar imágenes
     if download_images:
         print("🖼️  Descargando imágenes...")
-        rows = bulk_download(rows, img_dir, max_workers=max_workers)
+        # Faltantes como None (no NaN): bulk_download los descarta por falsy
+        urls = df[["id", "avatar_url", "cover_url"]].astype(object)
+        rows = bulk_download(
+            urls.where(urls.notna(), None).to_dict(orient="records"),
+            img_dir,
+            max_workers=max_workers
+        )
+        df["avatar_path"] = [r.get("avatar_path") for r in rows]
+        df["cover_path"] = [r.get("cover_path") for r in rows]
     else:
         print("⏭️  Omitiendo descarga de imágenes")
         # Agregar columnas vacías
-        for row in rows:
-            row["avatar_path"] = None
-            row["cover_path"] = None
+        df["avatar_path"] = None
+        df["cover_path"] = None
 
-    # 4. Crear DataFrame
-    print("📋 Creando DataFrame...")
-    df = pd.DataFrame(rows)
-
-    # 5. Calcular label de viralidad (percentil 75 de ER)
+    # 4. Calcular label de viralidad (percentil 75 de ER)
     print("🏷️  Calculando labels de viralidad...")
     if df["ER_play"].notna().sum() > 0:
         threshold = df["ER_play"].quantile(0.75)
-        df["label_viral"] = (df["ER_play"] >= threshold).astype("Int64")
+        # 0/1 sin faltantes (ER NaN -> 0): int8 de NumPy, no Int64 enmascarado
+        er = df["ER_play"].to_numpy()
+        df["label_viral"] = (er >= threshold).astype(np.int8)
         print(f"   ✓ Threshold: {threshold:.4f}")
     else:
         df["label_viral"] = pd.NA
         print("   ⚠️  No hay suficientes datos para calcular viralidad")
 
-    # 6. Persistir metadata.parquet
+    # 5. Persistir metadata.parquet
     print("💾 Guardando metadata.parquet...")
     metadata_path = out_dir / "metadata.parquet"
-    df.to_parquet(metadata_path, index=False)
+    # ZSTD + diccionario: texto muy repetido (autores, música, hashtags)
+    df.to_parquet(
+        metadata_path,
+        index=False,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=True
+    )
     print(f"   ✓ {metadata_path}")
 
-    # 7. Persistir labels.csv
+    # 6. Persistir labels.csv
     print("💾 Guardando labels.csv...")
     labels_cols = [
         "id",
@@ -108,43 +147,30 @@ def build_from_items(
     df[labels_cols].to_csv(labels_path, index=False)
     print(f"   ✓ {labels_path}")
 
-    # 8. Persistir manifest.jsonl
+    # 7. Persistir manifest.jsonl
     print("💾 Guardando manifest.jsonl...")
     manifest_path = out_dir / "manifest.jsonl"
-    with manifest_path.open("w", encoding="utf-8") as f:
-        for r in tqdm(
-            df.to_dict(orient="records"),
-            desc="Escribiendo manifest"
-        ):
-            # Determinar imagen preferida
-            if prefer_cover:
-                image = r.get("cover_path") or r.get("avatar_path")
-            else:
-                image = r.get("avatar_path") or r.get("cover_path")
-
-            # Construir objeto para manifest
-            obj = {
-                "id": r["id"],
-                "image": image,
-                "caption": r.get("text"),
-                "duration_s": r.get("duration_s"),
-                "playCount": r.get("playCount"),
-                "diggCount": r.get("diggCount"),
-                "shareCount": r.get("shareCount"),
-                "commentCount": r.get("commentCount"),
-                "collectCount": r.get("collectCount"),
-                "ER_play": r.get("ER_play"),
-                "total_engagement": r.get("total_engagement"),
-                "label_viral": r.get("label_viral"),
-                "webVideoUrl": r.get("webVideoUrl"),
-                "hashtags": r.get("hashtags"),
-                "n_hashtags": r.get("n_hashtags"),
-            }
-            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    first, second = (
+        ("cover_path", "avatar_path") if prefer_cover
+        else ("avatar_path", "cover_path")
+    )
+    manifest = pd.DataFrame({
+        "id": df["id"],
+        "image": df[first].fillna(df[second]),
+        "caption": df["text"],
+        **{col: df[col] for col in MANIFEST_COLUMNS},
+    })
+    with manifest_path.open("wb") as f:
+        f.writelines(
+            orjson.dumps(
+                r, default=_json_default, option=orjson.OPT_APPEND_NEWLINE
+            )
+            for r in manifest.to_dict(orient="records")
+        )
 
     print(f"   ✓ {manifest_path}")
 
-    # 9. Estadísticas finales
+    # 8. Estadísticas finales
     print("\n" + "="*60)
     print("✅ Dataset construido exitosamente!")
     print("="*60)
@@ -171,8 +197,7 @@ def build_from_json(
         **kwargs: Argumentos adicionales para build_from_items
     """
     print(f"📂 Cargando items desde {json_path}...")
-    with open(json_path, "r", encoding="utf-8") as f:
-        items = json.load(f)
+    items = orjson.loads(json_path.read_bytes())
 
     build_from_items(items, out_dir, img_dir, **kwargs)
 
@@ -2,8 +2,13 @@
 Esquemas y funciones de utilidad para validar y manipular items de TikTok
 """
 from __future__ import annotations
+import re
 from typing import Any, Dict, Optional
 
+# Compiladas una vez; las usan extract_* y la versión por columnas
+HASHTAG_RE = re.compile(r"#(\w+)")
+MENTION_RE = re.compile(r"@(\w+)")
+
 
 def dotted_get(
     obj: Dict[str, Any],
@@ -96,8 +101,7 @@ def extract_hashtags(text: Optional[str]) -> list[str]:
     if not text:
         return []
 
-    import re
-    return re.findall(r'#(\w+)', text)
+    return HASHTAG_RE.findall(text)
 
 
 def extract_mentions(text: Optional[str]) -> list[str]:
@@ -117,5 +121,4 @@ def extract_mentions(text: Optional[str]) -> list[str]:
     if not text:
         return []
 
-    import re
-    return re.findall(r'@(\w+)', text)
+    return MENTION_RE.findall(text)
@@ -5,14 +5,27 @@ Incluye cálculo de métricas como Engagement Rate
 from __future__ import annotations
 import math
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import pandas as pd
 from dateutil import parser as dtp
-from .schema import dotted_get, extract_hashtags, extract_mentions
+from .schema import (
+    HASHTAG_RE, MENTION_RE, dotted_get, extract_hashtags, extract_mentions
+)
 
 
 # Regex para detectar URLs
 URL_RE = re.compile(r"^https?://", re.I)
 
+# Métricas base y las que suman al engagement
+COUNT_COLUMNS = [
+    "playCount", "diggCount", "shareCount", "commentCount", "collectCount"
+]
+ENGAGEMENT_COLUMNS = COUNT_COLUMNS[1:]
+
+# Formato de fecha que entrega Apify ("2024-01-02T03:04:05.000Z")
+ISO_UTC_RE = r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d{1,6}))?Z$"
+
 
 def to_float(x: Any) -> float:
     """
@@ -48,6 +61,38 @@ def parse_iso(x: Optional[str]) -> Optional[str]:
         return None
 
 
+def parse_iso_column(values: list) -> pd.Series:
+    """
+    Versión por columnas de parse_iso
+
+    Las fechas en el formato UTC de Apify se validan con pd.to_datetime y
+    se reescriben con operaciones de texto (mismo resultado que
+    dateutil); el resto pasa por parse_iso uno a uno.
+
+    Args:
+        values: Strings de fecha (o None)
+
+    Returns:
+        Serie con fechas ISO normalizadas o None
+    """
+    raw = pd.Series(values, dtype=object)
+    parts = raw.str.extract(ISO_UTC_RE)
+    # strptime acepta el segundo 60; dateutil no
+    valid = pd.to_datetime(
+        parts[0], format="%Y-%m-%dT%H:%M:%S", errors="coerce"
+    ).notna() & (parts[0].str.slice(17, 19) < "60")
+
+    # Fracción a microsegundos; dateutil la omite si es cero
+    micros = parts[1].fillna("").str.ljust(6, "0")
+    fraction = ("." + micros).where(micros != "000000", "")
+    result = (parts[0] + fraction + "+00:00").astype(object).where(valid, None)
+
+    if not valid.all():
+        rest = ~valid
+        result[rest] = [parse_iso(v) for v in raw[rest]]
+    return result
+
+
 def compute_er(
     play: Any,
     like: Any,
@@ -70,13 +115,7 @@ def compute_er(
         Engagement Rate o NaN si no se puede calcular
     """
     plays = to_float(play)
-    parts = [
-        to_float(like),
-        to_float(share),
-        to_float(comment),
-        to_float(collect)
-    ]
-    eng = sum(p for p in parts if not math.isnan(p))
+    eng = compute_total_engagement(like, share, comment, collect)
 
     if plays and plays > 0:
         return eng / plays
@@ -95,13 +134,37 @@ def compute_total_engagement(
     Returns:
         Suma total de interacciones
     """
-    parts = [
-        to_float(like),
-        to_float(share),
-        to_float(comment),
-        to_float(collect)
-    ]
-    return sum(p for p in parts if not math.isnan(p))
+    like, share, comment = to_float(like), to_float(share), to_float(comment)
+    collect = to_float(collect)
+    # x == x es False solo para NaN: los faltantes suman 0
+    return (
+        (like if like == like else 0.0)
+        + (share if share == share else 0.0)
+        + (comment if comment == comment else 0.0)
+        + (collect if collect == collect else 0.0)
+    )
+
+
+def compute_engagement_arrays(
+    play: np.ndarray,
+    *parts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    compute_er y compute_total_engagement sobre columnas completas
+
+    Args:
+        play: Reproducciones (float, NaN si falta)
+        *parts: Likes, shares, comentarios y guardados (float, NaN si falta)
+
+    Returns:
+        (ER_play, total_engagement); NaN en ER si no hay reproducciones
+    """
+    total = np.zeros(play.shape)
+    for part in parts:
+        total += np.where(np.isnan(part), 0.0, part)
+    # Reproducciones <= 0 o NaN -> divisor NaN -> ER NaN
+    er = total / np.where(play > 0, play, np.nan)
+    return er, total
 
 
 def normalize_item(it: Dict[str, Any], item_id: str) -> Dict[str, Any]:
@@ -205,6 +268,104 @@ def normalize_item(it: Dict[str, Any], item_id: str) -> Dict[str, Any]:
     return row
 
 
+def _column(items: List[Dict[str, Any]], key: str, default=None) -> list:
+    """Valores de `key` (notación de puntos) para cada item"""
+    return [dotted_get(it, key, default) for it in items]
+
+
+def _numeric(values: list) -> pd.Series:
+    """Equivalente vectorizado de to_float: lo no numérico queda en NaN"""
+    return pd.to_numeric(
+        pd.Series(values, dtype=object), errors="coerce"
+    ).astype(float)
+
+
+def normalize_items(
+    items: List[Dict[str, Any]],
+    item_ids: List[str]
+) -> pd.DataFrame:
+    """
+    Versión por columnas de normalize_item para un lote de items
+
+    Cada campo se extrae una vez por columna y las métricas (ER, engagement
+    total, hashtags, menciones) se calculan sobre la columna completa.
+
+    Args:
+        items: Items raw de Apify
+        item_ids: ID único de cada item
+
+    Returns:
+        DataFrame con las mismas columnas (y orden) que normalize_item
+    """
+    text = pd.Series([it.get("text") or "" for it in items], dtype=object)
+    counts = {key: _numeric(_column(items, key)) for key in COUNT_COLUMNS}
+
+    er_play, total_engagement = compute_engagement_arrays(
+        counts["playCount"].to_numpy(),
+        *(counts[key].to_numpy() for key in ENGAGEMENT_COLUMNS)
+    )
+
+    hashtags = text.str.findall(HASHTAG_RE)
+    mentions = text.str.findall(MENTION_RE)
+    music_name = _column(items, "musicMeta.musicName")
+    music_original = [
+        bool(v) for v in _column(items, "musicMeta.musicOriginal", False)
+    ]
+
+    return pd.DataFrame({
+        # Identificadores
+        "id": item_ids,
+        "webVideoUrl": _column(items, "webVideoUrl"),
+
+        # Metadatos temporales
+        "createTimeISO": parse_iso_column(_column(items, "createTimeISO")),
+
+        # Contenido
+        "text": text,
+        "text_len": text.str.len(),
+
+        # Autor
+        "author_name": _column(items, "authorMeta.name"),
+        "author_id": _column(items, "authorMeta.id"),
+        "avatar_url": _column(items, "authorMeta.avatar"),
+        "author_verified": [
+            bool(v) for v in _column(items, "authorMeta.verified", False)
+        ],
+
+        # Video metadata
+        "cover_url": [
+            cover or cover_url for cover, cover_url in zip(
+                _column(items, "videoMeta.cover"),
+                _column(items, "videoMeta.coverUrl")
+            )
+        ],
+        "duration_s": _numeric(_column(items, "videoMeta.duration")),
+        "video_url": _column(items, "videoUrl"),
+
+        # Música
+        "music_name": music_name,
+        "music_author": _column(items, "musicMeta.musicAuthor"),
+        "music_original": music_original,
+
+        # Métricas de engagement
+        **counts,
+
+        # Métricas calculadas
+        "ER_play": er_play,
+        "total_engagement": total_engagement,
+
+        # Features extraídas
+        "n_hashtags": hashtags.str.len(),
+        "hashtags": hashtags,
+        "n_mentions": mentions.str.len(),
+        "mentions": mentions,
+
+        # Features adicionales
+        "has_music": [bool(v) for v in music_name],
+        "is_original_music": music_original,
+    })
+
+
 def filter_valid_items(
     items: list[Dict[str, Any]]
 ) -> list[Dict[str, Any]]:
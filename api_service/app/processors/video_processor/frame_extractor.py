@@ -2,33 +2,70 @@
 Frame Extractor - Extrae frames de videos desde URLs
 """
 
-import base64
 import tempfile
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import pybase64 as base64  # Opcional: base64 SIMD, misma API
+except ImportError:
+    import base64
 
 from app.utils.video_utils import extract_frames_from_video
 
 logger = logging.getLogger(__name__)
 
+# Bloques de descarga del video temporal (1 MiB: pocas vueltas del bucle)
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=1)
+def get_video_session() -> requests.Session:
+    """
+    Sesión HTTP compartida por todos los extractores del proceso
+
+    Reutiliza conexiones (sin handshake TLS por video) y reintenta errores
+    transitorios del CDN.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=32, pool_maxsize=64, max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    return session
+
 
 class VideoFrameExtractor:
     """
-    Extrae frames de videos descargándolos temporalmente
+    Extrae frames de videos leyéndolos directo desde la URL, o
+    descargándolos temporalmente si eso falla
     """
 
-    def __init__(self, num_frames: int = 3):
+    def __init__(self, num_frames: int = 3, max_workers: int = 8):
         """
         Args:
             num_frames: Número de frames a extraer por video
+            max_workers: Videos procesados en paralelo por anuncio
         """
         self.num_frames = num_frames
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.max_workers = max_workers
+        self.session = get_video_session()
 
     def download_video_temp(self, video_url: str) -> Optional[Path]:
         """
@@ -48,7 +85,9 @@ class VideoFrameExtractor:
             # Crear archivo temporal
             suffix = '.mp4'
             with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(
+                    chunk_size=DOWNLOAD_CHUNK_SIZE
+                ):
                     tmp_file.write(chunk)
                 temp_path = Path(tmp_file.name)
 
@@ -68,16 +107,32 @@ class VideoFrameExtractor:
             video_path: Path al archivo de video
 
         Returns:
-            Lista de frames con base64 y metadata
+            Lista de frames con el JPEG crudo ('bytes') y metadata
         """
         try:
             frames = extract_frames_from_video(
-                video_path, num_frames=self.num_frames)
+                video_path, num_frames=self.num_frames, return_bytes=True)
             return frames
         except Exception as e:
             logger.error(f"Error extrayendo frames: {e}")
             return []
 
+    def stream_frames(self, video_url: str) -> List[Dict[str, str]]:
+        """
+        Extrae frames leyendo el video directo desde la URL, sin archivo
+        temporal: FFmpeg solo descarga los rangos que necesita
+
+        Returns:
+            Lista de frames con el JPEG crudo ('bytes') y metadata,
+            vacía si no se pudo abrir la URL
+        """
+        try:
+            return extract_frames_from_video(
+                video_url, num_frames=self.num_frames, return_bytes=True)
+        except Exception as e:
+            logger.warning(f"No se pudo leer el video desde la URL: {e}")
+            return []
+
     def process_video_url(
         self,
         video_url: str,
@@ -85,7 +140,8 @@ class VideoFrameExtractor:
         save_dir: Optional[Path] = None
     ) -> List[Dict[str, any]]:
         """
-        Procesa un video: descarga temporal -> extrae frames -> opcionalmente guarda
+        Procesa un video: lee por streaming (o descarga temporal) ->
+        extrae frames -> opcionalmente guarda
 
         Args:
             video_url: URL del video
@@ -97,24 +153,28 @@ class VideoFrameExtractor:
         """
         temp_video = None
         try:
-            # Descargar temporalmente
-            temp_video = self.download_video_temp(video_url)
-            if not temp_video:
-                return []
-
-            # Extraer frames
-            frames = self.extract_frames(temp_video)
+            frames = self.stream_frames(video_url)
+            if not frames:
+                # Respaldo: descarga completa a un archivo temporal
+                temp_video = self.download_video_temp(video_url)
+                if not temp_video:
+                    return []
+                frames = self.extract_frames(temp_video)
             if not frames:
                 return []
 
             processed_frames = []
+            if save_dir:
+                save_dir.mkdir(parents=True, exist_ok=True)
 
-            # Procesar cada frame
+            # Procesar cada frame (secuencial: son pocos y pequeños, y los
+            # videos ya se procesan en paralelo en process_multiple_videos)
             for idx, frame_data in enumerate(frames):
+                frame_bytes = frame_data['bytes']
                 frame_info = {
                     'ad_id': ad_id,
                     'frame_index': idx,
-                    'base64': frame_data['base64'],
+                    'base64': base64.b64encode(frame_bytes).decode('ascii'),
                     'timestamp': frame_data.get('timestamp', 0),
                     'source': 'video',
                     'original_url': video_url
@@ -122,12 +182,10 @@ class VideoFrameExtractor:
 
                 # Guardar en disco si se especifica directorio
                 if save_dir:
-                    save_dir.mkdir(parents=True, exist_ok=True)
                     frame_filename = f"{ad_id}_frame{idx}.jpg"
                     frame_path = save_dir / frame_filename
 
-                    # Decodificar y guardar
-                    frame_bytes = base64.b64decode(frame_data['base64'])
+                    # Guardar el JPEG crudo (sin ida y vuelta por base64)
                     frame_path.write_bytes(frame_bytes)
 
                     frame_info['path'] = str(frame_path)
@@ -170,18 +228,28 @@ class VideoFrameExtractor:
             Lista con todos los frames extraídos
         """
         all_frames = []
+        if not video_urls:
+            return all_frames
 
-        for video_idx, video_url in enumerate(video_urls):
-            logger.info(f"   🎥 Video {video_idx + 1}/{len(video_urls)}")
-
+        def process(indexed_url) -> List[Dict[str, any]]:
+            video_idx, video_url = indexed_url
             frames = self.process_video_url(
                 video_url=video_url,
                 ad_id=f"{ad_id}_{video_idx}",
                 save_dir=save_dir
             )
+            logger.info(
+                f"   🎥 Video {video_idx + 1}/{len(video_urls)}: "
+                f"{len(frames)} frames extraídos"
+            )
+            return frames
 
-            all_frames.extend(frames)
-            logger.info(f"      ✅ {len(frames)} frames extraídos")
+        # Descarga + extracción son I/O y código nativo (sueltan el GIL);
+        # map conserva el orden de los videos
+        workers = min(self.max_workers, len(video_urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for frames in executor.map(process, enumerate(video_urls)):
+                all_frames.extend(frames)
 
         return all_frames
 
@@ -55,11 +55,227 @@ LIMITACIONES Y CONSIDERACIONES:
     - Costos asociados al uso de créditos de Apify por ejecución
 """
 import os
-import json
+import time
+import logging
+import asyncio
 import httpx
-from typing import Dict, Any, List, Optional
+import orjson
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import (
+    AsyncIterator, Callable, Dict, Any, List, Optional, Tuple, Union
+)
 from app.models.schemas import ApifyRequest, ApifyResponse, AdData
 
+logger = logging.getLogger(__name__)
+
+# Estados en los que una ejecución de Apify ya no va a completar
+TERMINAL_FAILURE_STATES = ("FAILED", "TIMED-OUT", "ABORTED")
+MAX_POLL_INTERVAL = 10
+
+# Todas las llamadas van a api.apify.com: HTTP/2 las multiplexa sobre una
+# conexión (requiere h2) y el pool mantiene vivas las del polling
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+APIFY_LIMITS = httpx.Limits(
+    max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0
+)
+APIFY_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Throttling propio para no provocar 429 al ejecutar varias extracciones
+APIFY_MAX_CONCURRENCY = int(os.getenv("APIFY_MAX_CONCURRENCY", "10"))
+APIFY_RATE_LIMIT = int(os.getenv("APIFY_RATE_LIMIT", "30"))  # peticiones/s
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Trabajos pequeños (maxResults <= SYNC_MAX_RESULTS): la propia llamada que
+# lanza el run espera a que termine, sin polling
+SYNC_MAX_RESULTS = int(os.getenv("APIFY_SYNC_MAX_RESULTS", "100"))
+WAIT_FOR_FINISH_SECONDS = 60  # máximo que admite la API de Apify
+
+# Los datasets se piden por páginas para no cargar un único JSON gigante
+DATASET_PAGE_SIZE = 1000
+
+
+def _retry_after_seconds(response: httpx.Response, attempt: int) -> float:
+    """Segundos a esperar tras un 429 (Retry-After en segundos o fecha)"""
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value).timestamp()
+                return max(retry_at - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    return 0.5 * 2 ** attempt
+
+
+def _ads_search_input(
+    pages: List[str],
+    search_terms: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    return {
+        "pages": pages,
+        "searchTerms": search_terms or [],
+        "maxResults": 1000,
+        "includeImages": True,
+        "includeVideos": True
+    }
+
+
+def _facebook_page_input(
+    page_urls: List[str],
+    include_inactive: bool = False
+) -> Dict[str, Any]:
+    return {
+        "pageUrls": page_urls,
+        "includeInactive": include_inactive,
+        "maxResults": 500
+    }
+
+
+def _instagram_input(
+    profiles: List[str],
+    hashtags: List[str] = None,
+    search_terms: Optional[List[str]] = None,
+    max_ads: int = 100
+) -> Dict[str, Any]:
+    return {
+        "profiles": profiles,
+        "hashtags": hashtags or [],
+        "searchTerms": search_terms or [],
+        "maxResults": max_ads,
+        "includeImages": True,
+        "includeVideos": True,
+        "includeStories": True
+    }
+
+
+def _instagram_story_input(
+    profile_urls: List[str],
+    include_highlights: bool = True
+) -> Dict[str, Any]:
+    return {
+        "profileUrls": profile_urls,
+        "includeHighlights": include_highlights,
+        "storiesOnly": True,
+        "maxResults": 200
+    }
+
+
+def _instagram_reel_input(
+    hashtags: List[str],
+    max_reels: int = 50
+) -> Dict[str, Any]:
+    return {
+        "hashtags": hashtags,
+        "reelsOnly": True,
+        "maxResults": max_reels,
+        "includeVideos": True
+    }
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """Cómo lanzar el actor de una plataforma y convertir sus resultados"""
+
+    error_label: str
+    default_platform: List[str]
+    build_input: Callable[..., Dict[str, Any]]
+    # Actor por defecto (variable de entorno o valor fijo); sin él, el
+    # llamador debe indicar actor_id
+    actor_env: Optional[str] = None
+    default_actor: Optional[str] = None
+    # Ignora el publisher_platform de los items
+    fixed_platform: bool = False
+
+
+PLATFORMS: Dict[str, PlatformSpec] = {
+    "facebook": PlatformSpec(
+        "Actor", [], _ads_search_input,
+        actor_env="APIFY_FACEBOOK_NAME",
+        default_actor="curious_coder/facebook-ads-library-scraper"
+    ),
+    "tiktok": PlatformSpec(
+        "TikTok Actor", ["TikTok"], _ads_search_input,
+        actor_env="APIFY_TIKTOK_ACTOR",
+        default_actor="apify/tiktok-ads-scraper"
+    ),
+    "facebook_page": PlatformSpec(
+        "Facebook Page Actor", ["Facebook"], _facebook_page_input
+    ),
+    "instagram": PlatformSpec(
+        "Instagram Actor", ["Instagram"], _instagram_input
+    ),
+    "instagram_story": PlatformSpec(
+        "Instagram Stories Actor", ["Instagram Stories"],
+        _instagram_story_input, fixed_platform=True
+    ),
+    "instagram_reel": PlatformSpec(
+        "Instagram Reels Actor", ["Instagram Reels"],
+        _instagram_reel_input, fixed_platform=True
+    ),
+}
+
+
+def _item_to_ad(
+    item: Dict[str, Any],
+    default_platform: List[str],
+    fixed_platform: bool = False
+) -> AdData:
+    """Construye un AdData sin validar a partir de un item de Apify"""
+    get = item.get
+    if fixed_platform or "publisher_platform" not in item:
+        # copia: model_construct no duplica la lista por instancia
+        platform = list(default_platform)
+    else:
+        platform = item["publisher_platform"]
+    return AdData.model_construct(
+        ad_archive_id=get("ad_archive_id"),
+        page_id=get("page_id"),
+        page_name=get("page_name"),
+        publisher_platform=platform,
+        snapshot=get("snapshot")
+    )
+
+
+class _RateLimiter:
+    """Ventana deslizante: como mucho max_calls peticiones por period segundos"""
+
+    def __init__(self, max_calls: int, period: float = 1.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Bloquea todas las peticiones durante seconds (tras un 429)"""
+        self._paused_until = max(
+            self._paused_until, time.monotonic() + seconds
+        )
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif len(self._calls) >= self.max_calls:
+                    delay = self.period - (now - self._calls[0])
+                else:
+                    self._calls.append(now)
+                    return
+                await asyncio.sleep(delay)
+
 
 class ApifyService:
     """
@@ -98,7 +314,7 @@ class ApifyService:
         Asegúrate de llamar await service.close() al finalizar.
     """
 
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, warm_up: bool = False):
         """
         Inicializa el servicio de Apify con autenticación.
 
@@ -110,6 +326,10 @@ class ApifyService:
             api_token (str): Token de autenticación de Apify obtenido desde
                 el dashboard de usuario en apify.com. Formato típico:
                 "apify_api_" seguido de 40 caracteres alfanuméricos.
+            warm_up (bool): Si hay un event loop en marcha, abre en segundo
+                plano la conexión con api.apify.com. Solo compensa en
+                instancias de larga vida: las peticiones no lo esperan y
+                añade una llamada extra. Defaults to False.
 
         Raises:
             ValueError: Si api_token está vacío, es None, o contiene solo
@@ -134,7 +354,49 @@ class ApifyService:
 
         self.api_token = api_token
         self.base_url = "https://api.apify.com/v2"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=APIFY_TIMEOUT,
+            limits=APIFY_LIMITS,
+            headers={"Authorization": f"Bearer {api_token}"}
+        )
+        self._sem = asyncio.Semaphore(APIFY_MAX_CONCURRENCY)
+        self._limiter = _RateLimiter(APIFY_RATE_LIMIT)
+        # run_id -> (instante de la respuesta, estado)
+        self._status_cache: Dict[str, Tuple[float, str]] = {}
+
+        self._warmup_task: Optional[asyncio.Task] = None
+        if warm_up:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # Sin loop (construcción síncrona): la primera petición
+                # abrirá la conexión
+                pass
+            else:
+                self._warmup_task = loop.create_task(self._warmup())
+
+    async def _warmup(self) -> None:
+        """Abre la conexión con una petición ligera; los errores se ignoran"""
+        try:
+            await self.client.get(f"{self.base_url}/users/me")
+        except httpx.HTTPError as e:
+            logger.debug("Warm-up de Apify fallido: %s", e)
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Envía una petición a Apify respetando el límite de concurrencia y de
+        peticiones por segundo. Ante un 429 espera lo indicado en Retry-After
+        (pausando también al resto de peticiones) y reintenta.
+        """
+        async with self._sem:
+            for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+                await self._limiter.acquire()
+                response = await self.client.request(method, url, **kwargs)
+                if (response.status_code != 429
+                        or attempt == MAX_RATE_LIMIT_RETRIES):
+                    return response
+                self._limiter.pause(_retry_after_seconds(response, attempt))
 
     async def run_actor(self, actor_id: str, input_data: Dict[str, Any]) -> str:
         """
@@ -189,103 +451,253 @@ class ApifyService:
             - Usar get_run_status(run_id) para monitorear progreso
             - Diferentes actors requieren diferentes parámetros en input_data
         """
+        run_id, _ = await self._start_run(actor_id, input_data)
+        return run_id
+
+    async def _start_run(
+        self,
+        actor_id: str,
+        input_data: Dict[str, Any],
+        wait_for_finish: int = 0
+    ) -> Tuple[str, str]:
+        """
+        Lanza un actor y devuelve (run_id, estado). Con wait_for_finish > 0
+        Apify retiene la respuesta hasta que el run termina o pasan esos
+        segundos.
+        """
         url = f"{self.base_url}/acts/{actor_id}/runs"
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
-
-        response = await self.client.post(
-            url,
-            headers=headers,
-            json=input_data
-        )
+        kwargs = {}
+        if wait_for_finish:
+            kwargs["params"] = {"waitForFinish": wait_for_finish}
+            kwargs["timeout"] = httpx.Timeout(
+                wait_for_finish + 30.0, connect=10.0
+            )
+        response = await self._request("POST", url, json=input_data, **kwargs)
 
         if response.status_code != 201:
             raise Exception(f"Error ejecutando actor: {response.text}")
 
-        result = response.json()
-        return result["data"]["id"]
+        data = orjson.loads(response.content)["data"]
+        return data["id"], data["status"]
 
-    async def get_run_status(self, run_id: str) -> str:
+    async def get_run_status(self, run_id: str, ttl_ms: int = 0) -> str:
         """
-        Obtiene el estado de una ejecución
+        Obtiene el estado de una ejecución.
+
+        Con ttl_ms > 0 devuelve el último estado consultado si tiene menos
+        de ttl_ms de antigüedad (para endpoints que sondean el mismo run).
         """
+        if ttl_ms > 0:
+            cached = self._status_cache.get(run_id)
+            if cached and time.monotonic() - cached[0] < ttl_ms / 1000:
+                return cached[1]
+
         url = f"{self.base_url}/actor-runs/{run_id}"
-        headers = {"Authorization": f"Bearer {self.api_token}"}
+        response = await self._request("GET", url)
+        result = orjson.loads(response.content)
 
-        response = await self.client.get(url, headers=headers)
-        result = response.json()
+        status = result["data"]["status"]
+        # Se marca al recibir la respuesta, no al enviar la petición
+        self._status_cache[run_id] = (time.monotonic(), status)
+        return status
 
-        return result["data"]["status"]
+    async def _iter_items(
+        self,
+        url: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        clean: bool = True,
+        page_size: int = DATASET_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorre los items de un endpoint de dataset página a página hasta
+        agotar limit (None = todos) o recibir una página incompleta.
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            params = {
+                "clean": "true" if clean else "false",
+                "offset": offset,
+                "limit": size
+            }
+            response = await self._request("GET", url, params=params)
+            response.raise_for_status()
+
+            page = orjson.loads(response.content)
+            for item in page:
+                yield item
+
+            if len(page) < size:
+                return
+            offset += size
+            if remaining is not None:
+                remaining -= size
+
+    def iter_dataset_items(
+        self,
+        run_id: str,
+        page_size: int = DATASET_PAGE_SIZE,
+        clean: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Itera los resultados de una ejecución sin materializar el dataset
+        completo en memoria.
+        """
+        url = f"{self.base_url}/actor-runs/{run_id}/dataset/items"
+        return self._iter_items(url, clean=clean, page_size=page_size)
 
     async def get_run_results(self, run_id: str) -> List[Dict[str, Any]]:
         """
         Obtiene los resultados de una ejecución completada
         """
-        url = f"{self.base_url}/actor-runs/{run_id}/dataset/items"
-        headers = {"Authorization": f"Bearer {self.api_token}"}
+        return [
+            item async for item in self.iter_dataset_items(run_id, clean=False)
+        ]
+
+    async def _collect_ads(
+        self,
+        run_id: str,
+        default_platform: List[str],
+        fixed_platform: bool = False
+    ) -> List[AdData]:
+        """
+        Convierte los items de una ejecución en AdData.
+
+        Los items vienen del propio actor, así que se construyen con
+        model_construct (sin validación). Con fixed_platform se ignora el
+        publisher_platform del item y se usa siempre default_platform.
+        """
+        return [
+            _item_to_ad(item, default_platform, fixed_platform)
+            async for item in self.iter_dataset_items(run_id)
+        ]
 
-        response = await self.client.get(url, headers=headers)
+    async def _wait_for_completion(
+        self,
+        run_id: str,
+        error_label: str,
+        timeout: Optional[float] = None,
+        poll_interval_start: float = 2
+    ) -> None:
+        """
+        Espera a que termine una ejecución con polling de backoff exponencial
+        (×1.5 desde poll_interval_start, máximo 10s).
 
-        if response.status_code != 200:
-            raise Exception(f"Error obteniendo resultados: {response.text}")
+        Raises:
+            TimeoutError: Si supera timeout (None = sin límite)
+            Exception: Si la ejecución termina en FAILED, TIMED-OUT o ABORTED
+        """
+        start_time = time.monotonic()
+        poll_interval = poll_interval_start
 
-        return response.json()
+        while True:
+            status = await self.get_run_status(run_id)
 
-    async def extract_facebook_ads(
+            if status == "SUCCEEDED":
+                return
+            elif status in TERMINAL_FAILURE_STATES:
+                raise Exception(
+                    f"{error_label} falló con estado {status}. "
+                    f"Run ID: {run_id}"
+                )
+
+            if timeout is not None and (
+                time.monotonic() - start_time > timeout
+            ):
+                raise TimeoutError(
+                    f"Timeout esperando {error_label}. Run ID: {run_id}"
+                )
+
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 1.5, MAX_POLL_INTERVAL)
+
+    async def extract(
         self,
-        pages: List[str],
-        search_terms: Optional[List[str]] = None
+        platform: str,
+        actor_id: Optional[str] = None,
+        **kwargs
     ) -> ApifyResponse:
         """
-        Extrae anuncios de Facebook usando Apify
-        Equivalente al proceso manual del jsonprueba.json
-        """
-        input_data = {
-            "pages": pages,
-            "searchTerms": search_terms or [],
-            "maxResults": 1000,
-            "includeImages": True,
-            "includeVideos": True
-        }
+        Lanza el actor de una plataforma de PLATFORMS, espera a que termine y
+        convierte sus resultados en AdData.
 
-        # Actor ID específico para Facebook Ads Library (configurable vía ENV)
-        actor_id = os.getenv("APIFY_FACEBOOK_NAME",
-                             "curious_coder/facebook-ads-library-scraper")
+        Args:
+            platform: Clave de PLATFORMS (facebook, tiktok, instagram...)
+            actor_id: Actor a ejecutar (por defecto el de la plataforma)
+            **kwargs: Parámetros del build_input de la plataforma
 
-        run_id = await self.run_actor(actor_id, input_data)
+        Raises:
+            KeyError: Si la plataforma no está registrada
+            ValueError: Si la plataforma no tiene actor por defecto y no se
+                indica actor_id
+        """
+        spec = PLATFORMS[platform]
+        if actor_id is None and spec.actor_env:
+            actor_id = os.getenv(spec.actor_env, spec.default_actor)
+        if not actor_id:
+            raise ValueError(f"actor_id es requerido para {platform}")
+
+        input_data = spec.build_input(**kwargs)
+        small_job = (
+            input_data.get("maxResults", SYNC_MAX_RESULTS + 1)
+            <= SYNC_MAX_RESULTS
+        )
+        run_id, status = await self._start_run(
+            actor_id, input_data,
+            WAIT_FOR_FINISH_SECONDS if small_job else 0
+        )
 
         # Esperar a que complete (en producción usar webhooks)
-        import asyncio
-        while True:
-            status = await self.get_run_status(run_id)
-            if status == "SUCCEEDED":
-                break
-            elif status == "FAILED":
-                raise Exception(f"Actor falló: {run_id}")
-            await asyncio.sleep(10)
-
-        results = await self.get_run_results(run_id)
-
-        # Convertir a modelo AdData
-        ads = []
-        for item in results:
-            ad = AdData(
-                ad_archive_id=item.get("ad_archive_id"),
-                page_id=item.get("page_id"),
-                page_name=item.get("page_name"),
-                publisher_platform=item.get("publisher_platform", []),
-                snapshot=item.get("snapshot")
-            )
-            ads.append(ad)
+        if status != "SUCCEEDED":
+            await self._wait_for_completion(run_id, spec.error_label)
 
+        ads = await self._collect_ads(
+            run_id, spec.default_platform, spec.fixed_platform
+        )
         return ApifyResponse(
             run_id=run_id,
             status="SUCCEEDED",
             data=ads
         )
 
+    async def extract_all(
+        self,
+        jobs: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Union[ApifyResponse, BaseException]]:
+        """
+        Ejecuta varias plataformas en paralelo; el tiempo total es el de la
+        más lenta en vez de la suma. Las peticiones siguen pasando por el
+        semáforo y el rate limiter de _request.
+
+        Args:
+            jobs: Plataforma de PLATFORMS -> kwargs de extract()
+                (ej: {"tiktok": {"pages": [...]},
+                      "instagram": {"actor_id": "...", "profiles": [...]}})
+
+        Returns:
+            Plataforma -> ApifyResponse, o la excepción si esa extracción
+            falló (una plataforma caída no cancela las demás)
+        """
+        results = await asyncio.gather(
+            *(self.extract(name, **kwargs) for name, kwargs in jobs.items()),
+            return_exceptions=True
+        )
+        return dict(zip(jobs, results))
+
+    async def extract_facebook_ads(
+        self,
+        pages: List[str],
+        search_terms: Optional[List[str]] = None
+    ) -> ApifyResponse:
+        """
+        Extrae anuncios de Facebook usando Apify
+        Equivalente al proceso manual del jsonprueba.json
+        """
+        return await self.extract(
+            "facebook", pages=pages, search_terms=search_terms
+        )
+
     async def extract_tiktok_ads(
         self,
         pages: List[str],
@@ -294,48 +706,8 @@ class ApifyService:
         """
         Extrae anuncios de TikTok usando Apify
         """
-        input_data = {
-            "pages": pages,
-            "searchTerms": search_terms or [],
-            "maxResults": 1000,
-            "includeImages": True,
-            "includeVideos": True
-        }
-
-        # Actor ID específico para TikTok Ads - usar el configurado en ENV
-        tiktok_actor = os.getenv("APIFY_TIKTOK_ACTOR",
-                                 "apify/tiktok-ads-scraper")
-
-        run_id = await self.run_actor(tiktok_actor, input_data)
-
-        # Esperar a que complete
-        import asyncio
-        while True:
-            status = await self.get_run_status(run_id)
-            if status == "SUCCEEDED":
-                break
-            elif status == "FAILED":
-                raise Exception(f"TikTok Actor falló: {run_id}")
-            await asyncio.sleep(10)
-
-        results = await self.get_run_results(run_id)
-
-        # Convertir a modelo AdData
-        ads = []
-        for item in results:
-            ad = AdData(
-                ad_archive_id=item.get("ad_archive_id"),
-                page_id=item.get("page_id"),
-                page_name=item.get("page_name"),
-                publisher_platform=item.get("publisher_platform", ["TikTok"]),
-                snapshot=item.get("snapshot")
-            )
-            ads.append(ad)
-
-        return ApifyResponse(
-            run_id=run_id,
-            status="SUCCEEDED",
-            data=ads
+        return await self.extract(
+            "tiktok", pages=pages, search_terms=search_terms
         )
 
     async def extract_facebook_page_ads(
@@ -347,43 +719,9 @@ class ApifyService:
         """
         Extrae anuncios específicos de páginas de Facebook
         """
-        input_data = {
-            "pageUrls": page_urls,
-            "includeInactive": include_inactive,
-            "maxResults": 500
-        }
-
-        run_id = await self.run_actor(actor_id, input_data)
-
-        # Monitorear progreso
-        import asyncio
-        while True:
-            status = await self.get_run_status(run_id)
-            if status == "SUCCEEDED":
-                break
-            elif status == "FAILED":
-                raise Exception(f"Facebook Page Actor falló: {run_id}")
-            await asyncio.sleep(10)
-
-        results = await self.get_run_results(run_id)
-
-        # Convertir resultados
-        ads = []
-        for item in results:
-            ad = AdData(
-                ad_archive_id=item.get("ad_archive_id"),
-                page_id=item.get("page_id"),
-                page_name=item.get("page_name"),
-                publisher_platform=item.get(
-                    "publisher_platform", ["Facebook"]),
-                snapshot=item.get("snapshot")
-            )
-            ads.append(ad)
-
-        return ApifyResponse(
-            run_id=run_id,
-            status="SUCCEEDED",
-            data=ads
+        return await self.extract(
+            "facebook_page", actor_id,
+            page_urls=page_urls, include_inactive=include_inactive
         )
 
     async def extract_instagram_ads(
@@ -397,47 +735,9 @@ class ApifyService:
         """
         Extrae anuncios de Instagram usando Apify
         """
-        input_data = {
-            "profiles": profiles,
-            "hashtags": hashtags or [],
-            "searchTerms": search_terms or [],
-            "maxResults": max_ads,
-            "includeImages": True,
-            "includeVideos": True,
-            "includeStories": True
-        }
-
-        run_id = await self.run_actor(actor_id, input_data)
-
-        # Monitorear progreso
-        import asyncio
-        while True:
-            status = await self.get_run_status(run_id)
-            if status == "SUCCEEDED":
-                break
-            elif status == "FAILED":
-                raise Exception(f"Instagram Actor falló: {run_id}")
-            await asyncio.sleep(10)
-
-        results = await self.get_run_results(run_id)
-
-        # Convertir resultados
-        ads = []
-        for item in results:
-            ad = AdData(
-                ad_archive_id=item.get("ad_archive_id"),
-                page_id=item.get("page_id"),
-                page_name=item.get("page_name"),
-                publisher_platform=item.get(
-                    "publisher_platform", ["Instagram"]),
-                snapshot=item.get("snapshot")
-            )
-            ads.append(ad)
-
-        return ApifyResponse(
-            run_id=run_id,
-            status="SUCCEEDED",
-            data=ads
+        return await self.extract(
+            "instagram", actor_id, profiles=profiles, hashtags=hashtags,
+            search_terms=search_terms, max_ads=max_ads
         )
 
     async def extract_instagram_story_ads(
@@ -449,43 +749,9 @@ class ApifyService:
         """
         Extrae anuncios de Stories de Instagram
         """
-        input_data = {
-            "profileUrls": profile_urls,
-            "includeHighlights": include_highlights,
-            "storiesOnly": True,
-            "maxResults": 200
-        }
-
-        run_id = await self.run_actor(actor_id, input_data)
-
-        # Monitorear progreso
-        import asyncio
-        while True:
-            status = await self.get_run_status(run_id)
-            if status == "SUCCEEDED":
-                break
-            elif status == "FAILED":
-                raise Exception(f"Instagram Stories Actor falló: {run_id}")
-            await asyncio.sleep(10)
-
-        results = await self.get_run_results(run_id)
-
-        # Convertir resultados
-        ads = []
-        for item in results:
-            ad = AdData(
-                ad_archive_id=item.get("ad_archive_id"),
-                page_id=item.get("page_id"),
-                page_name=item.get("page_name"),
-                publisher_platform=["Instagram Stories"],
-                snapshot=item.get("snapshot")
-            )
-            ads.append(ad)
-
-        return ApifyResponse(
-            run_id=run_id,
-            status="SUCCEEDED",
-            data=ads
+        return await self.extract(
+            "instagram_story", actor_id,
+            profile_urls=profile_urls, include_highlights=include_highlights
         )
 
     async def extract_instagram_reel_ads(
@@ -497,47 +763,15 @@ class ApifyService:
         """
         Extrae anuncios de Reels de Instagram
         """
-        input_data = {
-            "hashtags": hashtags,
-            "reelsOnly": True,
-            "maxResults": max_reels,
-            "includeVideos": True
-        }
-
-        run_id = await self.run_actor(actor_id, input_data)
-
-        # Monitorear progreso
-        import asyncio
-        while True:
-            status = await self.get_run_status(run_id)
-            if status == "SUCCEEDED":
-                break
-            elif status == "FAILED":
-                raise Exception(f"Instagram Reels Actor falló: {run_id}")
-            await asyncio.sleep(10)
-
-        results = await self.get_run_results(run_id)
-
-        # Convertir resultados
-        ads = []
-        for item in results:
-            ad = AdData(
-                ad_archive_id=item.get("ad_archive_id"),
-                page_id=item.get("page_id"),
-                page_name=item.get("page_name"),
-                publisher_platform=["Instagram Reels"],
-                snapshot=item.get("snapshot")
-            )
-            ads.append(ad)
-
-        return ApifyResponse(
-            run_id=run_id,
-            status="SUCCEEDED",
-            data=ads
+        return await self.extract(
+            "instagram_reel", actor_id, hashtags=hashtags, max_reels=max_reels
         )
 
     async def close(self):
         """Cierra el cliente HTTP"""
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            self._warmup_task = None
         await self.client.aclose()
 
     async def run_actor_sync(
@@ -563,32 +797,48 @@ class ApifyService:
             TimeoutError: Si supera el tiempo de espera
             HTTPException: Si el actor falla o hay errores de API
         """
-        import asyncio
-        import time
-
         run_id = await self.run_actor(actor_id, input_data)
-        start_time = time.time()
-        poll_interval = poll_interval_start
+        await self._wait_for_completion(
+            run_id, f"Actor {actor_id}", timeout, poll_interval_start
+        )
+        return await self.get_run_results(run_id)
 
-        while True:
-            elapsed = time.time() - start_time
-            if elapsed > timeout:
-                raise TimeoutError(
-                    f"Timeout ejecutando actor {actor_id}. "
-                    f"Run ID: {run_id}"
-                )
+    async def run_actor_sync_fast(
+        self,
+        actor_id: str,
+        input_data: Dict[str, Any],
+        timeout: int = 300
+    ) -> List[Dict[str, Any]]:
+        """
+        Ejecuta un actor y devuelve su dataset en una sola petición
+        (run-sync-get-dataset-items), sin polling. Pensado para trabajos
+        pequeños: Apify corta la espera a los 300s.
 
-            status = await self.get_run_status(run_id)
+        Args:
+            actor_id: ID del actor a ejecutar
+            input_data: Datos de entrada del actor
+            timeout: Tiempo maximo de ejecución del run en segundos
 
-            if status == "SUCCEEDED":
-                return await self.get_run_results(run_id)
-            elif status in ["FAILED", "TIMED-OUT", "ABORTED"]:
-                raise Exception(
-                    f"Actor fallo con estado {status}. Run ID: {run_id}"
-                )
+        Returns:
+            Lista de items del dataset
 
-            await asyncio.sleep(poll_interval)
-            poll_interval = min(poll_interval * 1.5, 10)
+        Raises:
+            TimeoutError: Si el run no termina dentro de la espera de Apify
+            Exception: Si el actor falla o hay errores de API
+        """
+        url = f"{self.base_url}/acts/{actor_id}/run-sync-get-dataset-items"
+        response = await self._request(
+            "POST", url, json=input_data,
+            params={"timeout": timeout},
+            timeout=httpx.Timeout(timeout + 30.0, connect=10.0)
+        )
+
+        if response.status_code == 408:
+            raise TimeoutError(f"Timeout ejecutando actor {actor_id}")
+        if response.status_code not in (200, 201):
+            raise Exception(f"Error ejecutando actor: {response.text}")
+
+        return orjson.loads(response.content)
 
     async def run_actor_async(
         self,
@@ -630,14 +880,8 @@ class ApifyService:
             httpx.HTTPStatusError: Si falla la peticion
         """
         url = f"{self.base_url}/datasets/{dataset_id}/items"
-        params = {
-            "token": self.api_token,
-            "clean": "true" if clean else "false",
-            "offset": offset
-        }
-        if limit:
-            params["limit"] = limit
-
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        return [
+            item async for item in self._iter_items(
+                url, offset, limit or None, clean
+            )
+        ]
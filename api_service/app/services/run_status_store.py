@@ -0,0 +1,112 @@
+"""
+Almacen del estado de runs de Apify reportado por webhooks
+
+Usa Redis (REDIS_URL) con TTL; si Redis no esta configurado o falla la
+conexion guarda en memoria del proceso. Los endpoints de estado lo consultan antes de ir a
+Apify, asi los runs ya terminados no generan llamadas salientes.
+"""
+import json
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Segundos que se conserva el estado de un run terminado
+RUN_STATUS_TTL = int(os.getenv("RUN_STATUS_TTL", "86400"))
+# Tras un error de Redis se usa solo memoria durante estos segundos
+REDIS_RETRY_SECONDS = 30
+_KEY_PREFIX = "apify:run:"
+
+
+class RunStatusStore:
+    """Estado de runs por run_id con expiracion (Redis o memoria)"""
+
+    def __init__(self, redis_url: Optional[str] = None,
+                 ttl: int = RUN_STATUS_TTL):
+        self.ttl = ttl
+        # run_id -> (expiracion, estado); en orden de expiracion
+        self._memory: Dict[str, Tuple[float, Dict]] = {}
+        self._redis = None
+        self._redis_down_until = 0.0
+        if redis_url:
+            try:
+                from redis import asyncio as redis_asyncio
+                self._redis = redis_asyncio.from_url(
+                    redis_url, decode_responses=True
+                )
+            except ImportError:
+                logger.warning("redis no instalado, usando memoria")
+
+    def _redis_available(self) -> bool:
+        return (self._redis is not None
+                and time.monotonic() >= self._redis_down_until)
+
+    def _redis_failed(self, action: str, run_id: str, error: Exception) -> None:
+        logger.warning(
+            "Error %s run %s en Redis, usando memoria: %s",
+            action, run_id, error
+        )
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def get(self, run_id: str) -> Optional[Dict]:
+        """Retorna el estado guardado del run o None"""
+        if self._redis_available():
+            try:
+                raw = await self._redis.get(_KEY_PREFIX + run_id)
+                if raw:
+                    return json.loads(raw)
+            except Exception as e:
+                self._redis_failed("leyendo", run_id, e)
+
+        # Memoria: unico almacen sin Redis, o lo guardado mientras fallaba
+        entry = self._memory.get(run_id)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self._memory[run_id]
+            return None
+        return data
+
+    async def set(self, run_id: str, data: Dict) -> None:
+        """Guarda el estado del run con TTL"""
+        if self._redis_available():
+            try:
+                await self._redis.set(
+                    _KEY_PREFIX + run_id, json.dumps(data), ex=self.ttl
+                )
+                return
+            except Exception as e:
+                self._redis_failed("guardando", run_id, e)
+
+        now = time.monotonic()
+        # Todas las entradas tienen el mismo TTL: reinsertando al final el
+        # dict queda ordenado por expiracion y basta podar desde el inicio
+        self._memory.pop(run_id, None)
+        while self._memory:
+            oldest = next(iter(self._memory))
+            if self._memory[oldest][0] >= now:
+                break
+            del self._memory[oldest]
+        self._memory[run_id] = (now + self.ttl, data)
+
+    async def close(self) -> None:
+        """Cierra la conexion a Redis si existe"""
+        if self._redis is not None:
+            await self._redis.close()
+
+
+@lru_cache(maxsize=1)
+def get_run_status_store() -> RunStatusStore:
+    """Instancia compartida por el proceso"""
+    return RunStatusStore(os.getenv("REDIS_URL"))
+
+
+async def close_run_status_store() -> None:
+    """Cierra el store compartido (llamar al apagar la app)"""
+    if get_run_status_store.cache_info().currsize:
+        await get_run_status_store().close()
+    get_run_status_store.cache_clear()
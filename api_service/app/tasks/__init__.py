@@ -0,0 +1,3 @@
+"""
+Tareas Celery del servicio
+"""
@@ -0,0 +1,55 @@
+"""
+Tareas Celery para Apify
+Inician runs fuera del request HTTP (fire-and-forget)
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from apify_client import ApifyClient
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _get_worker_client() -> ApifyClient:
+    """Cliente de Apify compartido por el proceso worker"""
+    token = os.getenv("APIFY_TOKEN")
+    if not token:
+        raise ValueError("APIFY_TOKEN no configurado en variables de entorno")
+    return ApifyClient(token)
+
+
+@celery_app.task(bind=True, max_retries=3)
+def start_apify_run(
+    self,
+    actor_id: str,
+    actor_input: Dict,
+    webhooks: Optional[List[Dict]] = None
+) -> Dict:
+    """
+    Inicia un run de Apify sin esperar resultados (.start())
+
+    Returns:
+        Dict con id, status y defaultDatasetId del run iniciado
+    """
+    client = _get_worker_client()
+    try:
+        run = client.actor(actor_id).start(
+            run_input=actor_input, webhooks=webhooks
+        )
+    except Exception as e:
+        logger.warning(
+            "Error iniciando %s (intento %s): %s",
+            actor_id, self.request.retries + 1, e
+        )
+        raise self.retry(exc=e, countdown=2 ** self.request.retries)
+
+    return {
+        "id": run.get("id"),
+        "status": run.get("status"),
+        "defaultDatasetId": run.get("defaultDatasetId"),
+    }
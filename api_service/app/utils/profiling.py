@@ -0,0 +1,42 @@
+"""
+Utilidades de profiling
+Middleware pyinstrument activable por request con ?profile=1
+"""
+import logging
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+
+logger = logging.getLogger(__name__)
+
+
+def add_profiling_middleware(app: FastAPI) -> bool:
+    """
+    Registra el middleware de profiling en la app.
+
+    Con el middleware activo, cualquier request con ?profile=1 devuelve el
+    perfil HTML de pyinstrument en lugar de la respuesta normal. Solo se
+    llama cuando PROFILING_ENABLED=true (nunca en producción).
+
+    Returns:
+        True si se registró, False si pyinstrument no está instalado
+    """
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        logger.warning("PROFILING_ENABLED sin pyinstrument instalado")
+        return False
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        if request.query_params.get("profile") != "1":
+            return await call_next(request)
+
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        await call_next(request)
+        profiler.stop()
+        return HTMLResponse(profiler.output_html())
+
+    logger.info("Profiling habilitado (?profile=1)")
+    return True
@@ -3,26 +3,53 @@ Utilidades para procesamiento de videos
 Extrae frames de videos para análisis con IA
 """
 import cv2
-import base64
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
+from urllib.parse import urlparse
+
+try:
+    import pybase64 as base64  # Opcional: base64 SIMD, misma API
+except ImportError:
+    import base64
 
 logger = logging.getLogger(__name__)
 
+# Timeout de apertura/lectura al leer videos directo desde una URL
+STREAM_TIMEOUT_MS = 30000
+
+
+def _open_capture(source: Union[Path, str]) -> cv2.VideoCapture:
+    """
+    Abre un archivo local (Path) o una URL (str)
+
+    Las URLs van por el backend FFmpeg, que pide por HTTP solo los rangos
+    que necesita para posicionarse en cada frame.
+    """
+    if isinstance(source, Path):
+        return cv2.VideoCapture(str(source))
+    return cv2.VideoCapture(source, cv2.CAP_FFMPEG, [
+        cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, STREAM_TIMEOUT_MS,
+        cv2.CAP_PROP_READ_TIMEOUT_MSEC, STREAM_TIMEOUT_MS,
+    ])
+
 
 def extract_frames_from_video(
-    video_path: Path,
+    video_path: Union[Path, str],
     num_frames: int = 10,
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    return_bytes: bool = False
 ) -> List[Dict[str, any]]:
     """
     Extrae frames uniformemente distribuidos de un video.
 
     Args:
-        video_path: Ruta al archivo de video
+        video_path: Ruta al archivo de video, o URL (str) para leerlo
+            sin descargarlo completo
         num_frames: Número de frames a extraer (default: 10)
         output_dir: Directorio opcional para guardar frames como imágenes
+        return_bytes: Devolver el JPEG crudo en 'bytes' en lugar de
+            'base64' (para quien lo guarda o codifica por su cuenta)
 
     Returns:
         Lista de diccionarios con información de cada frame:
@@ -30,14 +57,20 @@ def extract_frames_from_video(
             'frame_number': int,
             'timestamp': float (segundos),
             'base64': str (imagen codificada en base64),
+            'bytes': bytes (JPEG, en lugar de 'base64' si return_bytes),
             'file_path': Optional[Path] (si se guardó en disco)
         }
     """
     frames_data = []
+    if isinstance(video_path, Path):
+        video_name, video_stem = video_path.name, video_path.stem
+    else:
+        video_name = video_path[:60]
+        video_stem = Path(urlparse(video_path).path).stem
 
     try:
         # Abrir video
-        cap = cv2.VideoCapture(str(video_path))
+        cap = _open_capture(video_path)
 
         if not cap.isOpened():
             logger.error(f"No se pudo abrir el video: {video_path}")
@@ -49,7 +82,7 @@ def extract_frames_from_video(
         duration = total_frames / fps if fps > 0 else 0
 
         logger.info(
-            f"Video: {video_path.name} - "
+            f"Video: {video_name} - "
             f"{total_frames} frames, {fps:.2f} FPS, {duration:.2f}s"
         )
 
@@ -79,22 +112,24 @@ def extract_frames_from_video(
             # Calcular timestamp
             timestamp = frame_idx / fps if fps > 0 else 0
 
-            # Codificar frame en base64 (formato JPEG)
+            # Codificar frame como JPEG (y en base64 si no se piden bytes)
             _, buffer = cv2.imencode('.jpg', frame)
-            frame_b64 = base64.b64encode(buffer).decode('utf-8')
 
             frame_info = {
                 'frame_number': frame_idx,
                 'timestamp': round(timestamp, 2),
-                'base64': frame_b64,
                 'width': frame.shape[1],
                 'height': frame.shape[0]
             }
+            if return_bytes:
+                frame_info['bytes'] = buffer.tobytes()
+            else:
+                frame_info['base64'] = base64.b64encode(buffer).decode('utf-8')
 
             # Guardar frame como imagen si se especificó directorio
             if output_dir:
                 frame_filename = (
-                    f"{video_path.stem}_frame_{idx:03d}_"
+                    f"{video_stem}_frame_{idx:03d}_"
                     f"t{timestamp:.2f}s.jpg"
                 )
                 frame_path = output_dir / frame_filename
@@ -106,7 +141,7 @@ def extract_frames_from_video(
         cap.release()
 
         logger.info(
-            f"✅ Extraídos {len(frames_data)} frames de {video_path.name}"
+            f"✅ Extraídos {len(frames_data)} frames de {video_name}"
         )
 
     except Exception as e:
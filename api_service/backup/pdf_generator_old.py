@@ -16,6 +16,40 @@ from reportlab.platypus import (
 )
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
 
+# --- Estilos Personalizados (invariantes entre reportes) ---
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'Title',
+    parent=_STYLES['Heading1'],
+    alignment=TA_CENTER,
+    textColor=colors.darkblue
+)
+_SUBTITLE_STYLE = ParagraphStyle(
+    'Subtitle',
+    parent=_STYLES['Heading2'],
+    textColor=colors.black
+)
+_NORMAL_STYLE = ParagraphStyle(
+    'BodyTextJustify',
+    parent=_STYLES['BodyText'],
+    alignment=TA_JUSTIFY
+)
+_SEPARATOR_STYLE = ParagraphStyle(
+    'Separator', parent=_NORMAL_STYLE, alignment=TA_CENTER
+)
+# Encabezado de cada video: verde si es Ganador, rojo si no
+_STATUS_STYLES = {
+    color: ParagraphStyle(
+        f'Status{name}', parent=_STYLES['Heading3'], textColor=color
+    )
+    for name, color in (('G', colors.green), ('R', colors.red))
+}
+_METRICS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+])
+
 
 def generar_reporte_pdf(
     json_data: dict,
@@ -33,22 +67,10 @@ def generar_reporte_pdf(
     """
     doc = SimpleDocTemplate(str(output_path), pagesize=A4)
     elements = []
-    styles = getSampleStyleSheet()
-
-    # --- Estilos Personalizados ---
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        alignment=TA_CENTER,
-        textColor=colors.darkblue
-    )
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Heading2'],
-        textColor=colors.black
-    )
-    normal_style = styles['BodyText']
-    normal_style.alignment = TA_JUSTIFY
+    styles = _STYLES
+    title_style = _TITLE_STYLE
+    subtitle_style = _SUBTITLE_STYLE
+    normal_style = _NORMAL_STYLE
 
     # 1. Título del Reporte
     campaign_name = json_data.get('campaign_name', 'Análisis de Campaña')
@@ -75,14 +97,7 @@ def generar_reporte_pdf(
         status_text = f"{video.get('status', 'Video')} (ID: {video.get('ad_id', 'N/A')})"
 
         elements.append(
-            Paragraph(
-                status_text,
-                ParagraphStyle(
-                    'Status',
-                    parent=styles['Heading3'],
-                    textColor=header_color
-                )
-            )
+            Paragraph(status_text, _STATUS_STYLES[header_color])
         )
 
         # A. Tabla de Métricas Reales
@@ -94,11 +109,7 @@ def generar_reporte_pdf(
             ["Shares", real_metrics.get('shares', 'N/A')]
         ]
         t_metrics = Table(metrics_data, colWidths=[200, 200])
-        t_metrics.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ]))
+        t_metrics.setStyle(_METRICS_TABLE_STYLE)
         elements.append(t_metrics)
         elements.append(Spacer(1, 10))
 
@@ -142,8 +153,7 @@ def generar_reporte_pdf(
         elements.append(
             Paragraph(
                 "- - - - - - - - - - - - - - - - - - - - - - - - -",
-                ParagraphStyle('Separator', parent=normal_style,
-                               alignment=TA_CENTER)
+                _SEPARATOR_STYLE
             )
         )
         elements.append(Spacer(1, 20))
@@ -1,31 +1,29 @@
+import ast
+
 import pandas as pd
-import json
 
 csv_path = r"app\processors\datasets\saved_datasets\facebook\bfMXWLphPQcDmBsrz\bfMXWLphPQcDmBsrz.csv"
-df = pd.read_csv(csv_path)
-
-video_count = 0
-ads_with_videos = []
+df = pd.read_csv(csv_path, usecols=['ad_archive_id', 'snapshot'], dtype=str)
 
-for _, row in df.iterrows():
-    ad_id = str(row.get('ad_archive_id'))
-    snapshot_str = str(row.get('snapshot', '{}'))
 
+def parse_snapshot(snapshot_str: str) -> dict:
+    # El CSV guarda el repr de Python del dict, no JSON
     try:
-        snapshot = eval(snapshot_str)
-        videos = snapshot.get('videos', [])
-        if videos:
-            video_count += 1
-            ads_with_videos.append({
-                'ad_id': ad_id,
-                'num_videos': len(videos),
-                'video_url': videos[0].get('video_hd_url', 'N/A') if videos else 'N/A'
-            })
-    except:
-        pass
+        snapshot = ast.literal_eval(snapshot_str)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return {}
+    return snapshot if isinstance(snapshot, dict) else {}
+
+
+snapshots = df['snapshot'].fillna('{}').map(parse_snapshot)
+videos = snapshots.map(lambda s: s.get('videos') or [])
+mask = videos.map(bool)
+video_count = int(mask.sum())
 
 print(f"Anuncios con videos: {video_count} de {len(df)}")
 print(f"\nPrimeros 5 anuncios con videos:")
-for i, ad in enumerate(ads_with_videos[:5]):
-    print(f"  {i+1}. ID: {ad['ad_id']} - Videos: {ad['num_videos']}")
-    print(f"     URL: {ad['video_url'][:80]}...")
+for i, (ad_id, ad_videos) in enumerate(
+        zip(df.loc[mask, 'ad_archive_id'].head(5), videos[mask].head(5))):
+    video_url = ad_videos[0].get('video_hd_url', 'N/A')
+    print(f"  {i+1}. ID: {ad_id} - Videos: {len(ad_videos)}")
+    print(f"     URL: {video_url[:80]}...")
@@ -62,8 +62,10 @@ MONITOREO:
 import uvicorn
 import logging
 import traceback
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 import os
 from app.config.env_loader import load_env
 
@@ -78,6 +80,13 @@ logging.basicConfig(
 logger = logging.getLogger("ads_analyzer")
 
 
+# orjson: serialización más rápida de listados grandes (si está instalado)
+try:
+    import orjson  # noqa: F401
+    DEFAULT_RESPONSE_CLASS = ORJSONResponse
+except ImportError:
+    DEFAULT_RESPONSE_CLASS = JSONResponse
+
 # Intentar importar routers (con manejo de errores para evitar crashes)
 apify_router = None
 analytics_router = None
@@ -125,12 +134,30 @@ tags_metadata = [
     },
 ]
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cierra los clientes compartidos al apagar la aplicación"""
+    yield
+    # Import diferido: mismos módulos opcionales que los routers
+    try:
+        from app.api.routes.dependencies import close_apify_clients
+        from app.services.run_status_store import close_run_status_store
+    except Exception:
+        logger.exception("Shared clients could not be closed")
+        return
+    await close_apify_clients()
+    await close_run_status_store()
+
+
 # Inicialización de la aplicación FastAPI
 app = FastAPI(
     title="Ads Analyzer API Service",
     description="API para extracción y análisis de anuncios publicitarios",
     version="1.0.0",
     openapi_tags=tags_metadata,
+    default_response_class=DEFAULT_RESPONSE_CLASS,
+    lifespan=lifespan,
 )
 
 # Configuración de CORS para permitir requests desde el frontend
@@ -149,6 +176,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling por request (?profile=1), solo con PROFILING_ENABLED=true
+try:
+    from app.config.settings import get_settings
+    from app.utils.profiling import add_profiling_middleware
+    if get_settings().profiling_enabled:
+        add_profiling_middleware(app)
+except Exception:
+    logger.exception("Profiling middleware not available")
+
 # Incluir routers opcionales solo si están disponibles
 
 if apify_router:
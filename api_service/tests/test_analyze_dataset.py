@@ -0,0 +1,114 @@
+"""
+Tests del análisis de datasets de Facebook (processors/facebook/analyze_dataset.py)
+Verifica agregación por ad_id, deduplicación de URLs y score heurístico
+"""
+import csv
+import json
+import math
+import sys
+from pathlib import Path
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.processors.facebook import analyze_dataset  # noqa: E402
+from app.processors.facebook.analyze_dataset import (  # noqa: E402
+    analyze, analyze_jsonl, _compute_score
+)
+
+SNAP_A = {
+    "images": [{"original_image_url": "https://img/a1.jpg"}],
+    "videos": [{"video_preview_image_url": "https://img/v1.jpg"}],
+    "page_like_count": 1500,
+}
+SNAP_B = {"cards": [{"original_image_url": "https://img/b1.jpg"}]}
+
+ROWS = [
+    {"ad_archive_id": "A", "snapshot": SNAP_A,
+     "reach_estimate": "1,000", "spend": "10"},
+    {"ad_archive_id": "B", "snapshot": SNAP_B,
+     "reach_estimate": "", "spend": ""},
+    {"ad_archive_id": "A", "snapshot": SNAP_A,
+     "reach_estimate": "2000", "spend": "5"},
+    {"ad_archive_id": "", "snapshot": None,
+     "reach_estimate": "", "spend": ""},
+]
+
+
+def _write_csv(path: Path) -> Path:
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["ad_archive_id", "snapshot", "reach_estimate",
+                         "spend", "page_name"])
+        for i, row in enumerate(ROWS):
+            snap = row["snapshot"]
+            # Alternar comillas estilo Python y JSON como en los exports
+            raw = "" if snap is None else (
+                repr(snap) if i % 2 else json.dumps(snap)
+            )
+            writer.writerow([row["ad_archive_id"], raw,
+                             row["reach_estimate"], row["spend"], "x"])
+    return path
+
+
+def _write_jsonl(path: Path) -> Path:
+    with path.open("w", encoding="utf-8") as fh:
+        for row in ROWS:
+            fh.write(json.dumps(row) + "\n")
+        fh.write("no es json\n")
+    return path
+
+
+class TestAnalyzeDataset:
+    """Tests de analyze (CSV) y analyze_jsonl"""
+
+    def _check(self, stats):
+        assert list(stats) == ["A", "B", "unknown"]
+        a = stats["A"]
+        assert a["rows"] == 2
+        assert a["images"] == 2 and a["videos"] == 2
+        assert a["urls"] == ["https://img/a1.jpg", "https://img/v1.jpg"]
+        assert a["reach"] == 2000 and a["spend"] == 10
+        assert a["page_like_count"] == 1500
+        assert math.isclose(a["score"], _compute_score(a, {}))
+
+        b = stats["B"]
+        assert b["reach"] is None and b["spend"] is None
+        assert b["total_media"] == 1
+        assert math.isclose(b["score"], 1.0)
+
+        assert stats["unknown"]["score"] == 0.0
+
+    def test_analyze_csv(self, tmp_path):
+        self._check(analyze(_write_csv(tmp_path / "ds.csv")))
+
+    def test_analyze_jsonl(self, tmp_path):
+        self._check(analyze_jsonl(_write_jsonl(tmp_path / "ds.jsonl")))
+
+    def test_analyze_media_method(self, tmp_path):
+        stats = analyze(_write_csv(tmp_path / "ds.csv"), method="media")
+        assert stats["A"]["score"] == 4.0
+
+    def test_analyze_empty_csv(self, tmp_path):
+        path = tmp_path / "empty.csv"
+        path.write_text("ad_archive_id,snapshot\n", encoding="utf-8")
+        assert analyze(path) == {}
+
+    def test_analyze_blank_csv(self, tmp_path, monkeypatch):
+        """Un run con 0 items (DataFrame vacío a CSV) no tiene cabecera"""
+        path = tmp_path / "blank.csv"
+        for text in ("", "\n"):
+            path.write_text(text, encoding="utf-8")
+            assert analyze(path) == {}
+            monkeypatch.setattr(analyze_dataset, "pa", None)
+            assert analyze(path) == {}
+            monkeypatch.undo()
+
+    def test_analyze_csv_pandas_fallback(self, tmp_path, monkeypatch):
+        """Sin pyarrow el CSV se lee con pandas y el resultado no cambia"""
+        path = _write_csv(tmp_path / "ds.csv")
+        expected = analyze(path)
+        monkeypatch.setattr(analyze_dataset, "pa", None)
+        assert analyze(path) == expected
+        self._check(expected)
@@ -0,0 +1,398 @@
+"""
+Tests del servicio de Apify (services/apify_service)
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.services import apify_service  # noqa: E402
+from app.models.schemas import AdData  # noqa: E402
+from app.services.apify_service import ApifyService  # noqa: E402
+
+
+class TestWaitForCompletion:
+    """Tests del polling con backoff de _wait_for_completion"""
+
+    def _wait(self, monkeypatch, statuses, **kwargs):
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        async def fake_status(run_id):
+            return statuses.pop(0)
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+            service.get_run_status = fake_status
+            try:
+                await service._wait_for_completion("run1", "Actor", **kwargs)
+            finally:
+                await service.close()
+
+        monkeypatch.setattr(apify_service.asyncio, "sleep", fake_sleep)
+        asyncio.run(run())
+        return sleeps
+
+    def test_backoff_until_succeeded(self, monkeypatch):
+        statuses = ["RUNNING"] * 6 + ["SUCCEEDED"]
+        sleeps = self._wait(monkeypatch, statuses)
+        assert sleeps == [2, 3, 4.5, 6.75, 10, 10]
+
+    @pytest.mark.parametrize("status", ["FAILED", "TIMED-OUT", "ABORTED"])
+    def test_terminal_states_raise(self, monkeypatch, status):
+        with pytest.raises(Exception, match=status):
+            self._wait(monkeypatch, ["RUNNING", status])
+
+    def test_timeout(self, monkeypatch):
+        with pytest.raises(TimeoutError):
+            self._wait(monkeypatch, ["RUNNING"] * 3, timeout=-1)
+
+
+class TestApifyClient:
+    """Tests del cliente HTTP compartido"""
+
+    def test_requests_carry_token_header(self):
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"data": {"status": "READY"}})
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+            await service.client.aclose()
+            service.client = httpx.AsyncClient(
+                headers=service.client.headers,
+                transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await service.get_run_status("run1")
+            finally:
+                await service.close()
+
+        assert asyncio.run(run()) == "READY"
+        assert seen[0].headers["Authorization"] == "Bearer token"
+        assert seen[0].url.path == "/v2/actor-runs/run1"
+
+    def test_retries_after_429(self, monkeypatch):
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "7"}),
+            httpx.Response(200, json={"data": {"status": "READY"}}),
+        ]
+        sleeps = []
+        clock = [0.0]
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+            await service.client.aclose()
+            service.client = httpx.AsyncClient(
+                transport=httpx.MockTransport(lambda r: responses.pop(0))
+            )
+            try:
+                return await service.get_run_status("run1")
+            finally:
+                await service.close()
+
+        monkeypatch.setattr(apify_service.asyncio, "sleep", fake_sleep)
+        monkeypatch.setattr(apify_service.time, "monotonic", lambda: clock[0])
+        assert asyncio.run(run()) == "READY"
+        assert sleeps == [7.0]
+
+    def test_status_cache_ttl(self, monkeypatch):
+        calls = []
+        clock = [0.0]
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"data": {"status": "RUNNING"}})
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+            await service.client.aclose()
+            service.client = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            )
+            try:
+                await service.get_run_status("run1", ttl_ms=2000)
+                clock[0] = 1.5
+                await service.get_run_status("run1", ttl_ms=2000)
+                await service.get_run_status("run1")
+                clock[0] = 4.0
+                await service.get_run_status("run1", ttl_ms=2000)
+            finally:
+                await service.close()
+
+        monkeypatch.setattr(apify_service.time, "monotonic", lambda: clock[0])
+        asyncio.run(run())
+        # la segunda llamada sale de caché; ttl_ms=0 siempre consulta
+        assert len(calls) == 3
+
+    def test_dataset_items_paginated(self):
+        items = [{"ad_archive_id": str(i)} for i in range(5)]
+        params = []
+
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            params.append((offset, limit))
+            return httpx.Response(200, json=items[offset:offset + limit])
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+            await service.client.aclose()
+            service.client = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            )
+            try:
+                streamed = [
+                    item async for item in
+                    service.iter_dataset_items("run1", page_size=2)
+                ]
+                limited = await service.get_dataset_items("ds1", limit=3)
+                return streamed, limited
+            finally:
+                await service.close()
+
+        streamed, limited = asyncio.run(run())
+        assert streamed == items and limited == items[:3]
+        assert params == [(0, 2), (2, 2), (4, 2), (0, 3)]
+
+
+class TestItemsToAds:
+    """Tests de la conversión de items de Apify a AdData"""
+
+    def test_item_to_ad(self):
+        item = {"ad_archive_id": "1", "page_id": "2", "snapshot": {"a": 1}}
+        default = ["TikTok"]
+
+        ad = apify_service._item_to_ad(item, default)
+        explicit = apify_service._item_to_ad(
+            {**item, "publisher_platform": ["Facebook"]}, default
+        )
+        fixed = apify_service._item_to_ad(
+            {**item, "publisher_platform": ["Facebook"]},
+            ["Instagram Reels"], fixed_platform=True
+        )
+
+        assert ad == AdData(**item, publisher_platform=["TikTok"])
+        assert ad.publisher_platform is not default
+        assert explicit.publisher_platform == ["Facebook"]
+        assert fixed.publisher_platform == ["Instagram Reels"]
+
+    def test_extract_tiktok_ads(self, monkeypatch):
+        items = [{"ad_archive_id": str(i), "page_id": "p"} for i in range(3)]
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+
+            async def fake_start_run(actor_id, input_data, wait_for_finish):
+                return "run1", "RUNNING"
+
+            async def fake_wait(run_id, error_label):
+                pass
+
+            async def fake_items(run_id):
+                for item in items:
+                    yield item
+
+            service._start_run = fake_start_run
+            service._wait_for_completion = fake_wait
+            service.iter_dataset_items = fake_items
+            try:
+                return await service.extract_tiktok_ads(["page"])
+            finally:
+                await service.close()
+
+        response = asyncio.run(run())
+        assert [ad.ad_archive_id for ad in response.data] == ["0", "1", "2"]
+        assert response.data[0].publisher_platform == ["TikTok"]
+
+    def test_extract_dispatches_platform_spec(self):
+        launched = []
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+
+            async def fake_start_run(actor_id, input_data, wait_for_finish):
+                launched.append((actor_id, input_data, wait_for_finish))
+                return "run1", "RUNNING"
+
+            async def fake_wait(run_id, error_label):
+                pass
+
+            async def fake_items(run_id):
+                yield {"ad_archive_id": "1", "page_id": "p",
+                       "publisher_platform": ["Facebook"]}
+
+            service._start_run = fake_start_run
+            service._wait_for_completion = fake_wait
+            service.iter_dataset_items = fake_items
+            try:
+                reels = await service.extract_instagram_reel_ads(
+                    "me/reels", ["moda"]
+                )
+                with pytest.raises(ValueError):
+                    await service.extract("instagram_reel", hashtags=["x"])
+                return reels
+            finally:
+                await service.close()
+
+        reels = asyncio.run(run())
+        assert launched == [("me/reels", {
+            "hashtags": ["moda"], "reelsOnly": True,
+            "maxResults": 50, "includeVideos": True
+        }, 60)]
+        assert reels.data[0].publisher_platform == ["Instagram Reels"]
+
+
+class TestWarmUp:
+    """Tests del warm-up de la conexión con Apify"""
+
+    def test_first_request_does_not_wait_for_warmup(self, monkeypatch):
+        paths = []
+
+        async def handler(request):
+            paths.append(request.url.path)
+            if request.url.path == "/v2/users/me":
+                # el warm-up no responde hasta que se cierre el servicio
+                await asyncio.Event().wait()
+            return httpx.Response(200, json={"data": {"status": "READY"}})
+
+        transport = httpx.MockTransport(handler)
+        original = httpx.AsyncClient.__init__
+
+        def init(client, *args, **kwargs):
+            original(client, *args, transport=transport, **kwargs)
+
+        monkeypatch.setattr(httpx.AsyncClient, "__init__", init)
+
+        async def run():
+            service = ApifyService("token", warm_up=True)
+            try:
+                return await asyncio.wait_for(
+                    service.get_run_status("run1"), 1
+                )
+            finally:
+                await service.close()
+
+        assert asyncio.run(run()) == "READY"
+        assert paths == ["/v2/users/me", "/v2/actor-runs/run1"]
+
+    def test_no_warmup_by_default(self):
+        async def run():
+            service = ApifyService("token")
+            try:
+                return service._warmup_task
+            finally:
+                await service.close()
+
+        assert asyncio.run(run()) is None
+
+    def test_no_warmup_without_running_loop(self):
+        service = ApifyService("token", warm_up=True)
+        assert service._warmup_task is None
+        asyncio.run(service.close())
+
+
+class TestSyncRuns:
+    """Tests de las ejecuciones sin polling"""
+
+    def _service(self, handler):
+        service = ApifyService("token", warm_up=False)
+        service.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        return service
+
+    def test_small_job_waits_for_finish_on_start(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.method == "POST":
+                return httpx.Response(
+                    201, json={"data": {"id": "run1", "status": "SUCCEEDED"}}
+                )
+            return httpx.Response(200, json=[{"ad_archive_id": "1"}])
+
+        async def run():
+            service = self._service(handler)
+            try:
+                return await service.extract_instagram_reel_ads("me/reels", [])
+            finally:
+                await service.close()
+
+        response = asyncio.run(run())
+        assert [r.method for r in requests] == ["POST", "GET"]
+        assert requests[0].url.params["waitForFinish"] == "60"
+        assert response.run_id == "run1"
+        assert response.data[0].ad_archive_id == "1"
+
+    def test_run_actor_sync_fast(self):
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.path)
+            if request.url.params["timeout"] == "1":
+                return httpx.Response(408)
+            return httpx.Response(201, json=[{"id": 1}, {"id": 2}])
+
+        async def run():
+            service = self._service(handler)
+            try:
+                items = await service.run_actor_sync_fast("me~actor", {})
+                with pytest.raises(TimeoutError):
+                    await service.run_actor_sync_fast("me~actor", {}, 1)
+                return items
+            finally:
+                await service.close()
+
+        assert asyncio.run(run()) == [{"id": 1}, {"id": 2}]
+        assert paths[0] == "/v2/acts/me~actor/run-sync-get-dataset-items"
+
+
+class TestExtractAll:
+    """Tests de extract_all"""
+
+    def test_runs_platforms_concurrently(self):
+        started = []
+
+        async def run():
+            service = ApifyService("token", warm_up=False)
+            both_started = asyncio.Event()
+
+            async def fake_extract(platform, **kwargs):
+                started.append(platform)
+                if len(started) == 2:
+                    both_started.set()
+                # solo termina si la otra plataforma ya arrancó
+                await asyncio.wait_for(both_started.wait(), 1)
+                if platform == "instagram":
+                    raise RuntimeError("actor caído")
+                return kwargs
+
+            service.extract = fake_extract
+            try:
+                return await service.extract_all({
+                    "tiktok": {"pages": ["a"]},
+                    "instagram": {"actor_id": "me/ig", "profiles": ["b"]},
+                })
+            finally:
+                await service.close()
+
+        results = asyncio.run(run())
+        assert list(results) == ["tiktok", "instagram"]
+        assert results["tiktok"] == {"pages": ["a"]}
+        assert isinstance(results["instagram"], RuntimeError)
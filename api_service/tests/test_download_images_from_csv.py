@@ -0,0 +1,290 @@
+"""
+Tests del descargador de media de datasets de Facebook
+(processors/facebook/download_images_from_csv.py)
+"""
+import asyncio
+import csv
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from aiohttp import web  # noqa: E402
+
+from app.processors.facebook import download_images_from_csv  # noqa: E402
+from app.processors.facebook.download_images_from_csv import (  # noqa: E402
+    collect_media_urls, download_all, extract_urls_from_snapshot,
+    iter_csv_snapshot_rows, load_url_cache, main, parse_snapshot_field,
+    save_url_cache
+)
+
+SNAP = {
+    "page_profile_picture_url": "https://img/p.jpg",
+    "images": [{"original_image_url": "https://img/a1.jpg"}],
+    "is_active": True,
+    "extra": None,
+    "title": "it's here",
+}
+
+
+class TestParseSnapshotField:
+    """Tests de parse_snapshot_field"""
+
+    def test_json_and_python_repr(self):
+        assert parse_snapshot_field(json.dumps(SNAP)) == SNAP
+        assert parse_snapshot_field(repr(SNAP)) == SNAP
+
+    def test_invalid_or_empty(self):
+        assert parse_snapshot_field("") is None
+        assert parse_snapshot_field("no es un snapshot") is None
+        assert parse_snapshot_field("[1, 2]") is None
+
+
+class TestExtractUrls:
+    """Tests de extract_urls_from_snapshot"""
+
+    def test_known_keys_then_nested_in_document_order(self):
+        snap = {
+            "extra_links": {"links": ["https://x/1.png", "ftp://x/2.jpg"]},
+            # campos de texto: no se recorren
+            "body": {"text": "https://x/en-el-texto.jpg"},
+            "images": [{"original_image_url": "https://img/a1.jpg"}],
+            "deep": [[{"u": "https://x/3.webp?s=1"}], "https://x/page"],
+            "page_profile_picture_url": "https://img/p.jpg",
+        }
+        assert extract_urls_from_snapshot(snap) == [
+            "https://img/p.jpg",
+            "https://img/a1.jpg",
+            "https://x/1.png",
+            "https://x/3.webp?s=1",
+        ]
+        assert extract_urls_from_snapshot(None) == []
+
+
+class TestIterCsvSnapshotRows:
+    """Tests de iter_csv_snapshot_rows"""
+
+    def _write_csv(self, path: Path) -> Path:
+        with path.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["ad_archive_id", "page_name", "snapshot"])
+            writer.writerow(["A", "x", repr(SNAP)])
+            writer.writerow(["", "y\ncon salto", ""])
+        return path
+
+    def _check(self, rows):
+        assert len(rows) == 2
+        (row_a, snap_a), (row_b, snap_b) = rows
+        assert row_a["ad_archive_id"] == "A" and snap_a == SNAP
+        assert row_b["ad_archive_id"] == "" and snap_b is None
+        assert row_a.get("ad_id") is None
+
+    def test_pyarrow_reader(self, tmp_path):
+        path = self._write_csv(tmp_path / "ds.csv")
+        self._check(list(iter_csv_snapshot_rows(path)))
+
+    def test_dictreader_fallback(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(download_images_from_csv, "pa", None)
+        path = self._write_csv(tmp_path / "ds.csv")
+        self._check(list(iter_csv_snapshot_rows(path)))
+
+
+class TestDownloadAll:
+    """Tests de download_all contra un servidor HTTP local"""
+
+    async def _run(self, items_for, out_dir, rounds=1, revalidate=False,
+                   delay=0.0, timeout=30):
+        self.hits = []
+        self.active = self.max_active = 0
+
+        async def image(request):
+            self.hits.append(request.path_qs)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(delay)
+            self.active -= 1
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.Response(
+                body=b"img-" + request.match_info["name"].encode(),
+                headers={"ETag": '"v1"'},
+            )
+
+        app = web.Application()
+        app.router.add_get("/img/{name}", image)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        items = items_for(f"http://127.0.0.1:{port}")
+        try:
+            results = [await download_all(items, out_dir, workers=2,
+                                          timeout=timeout,
+                                          revalidate=revalidate)
+                       for _ in range(rounds)]
+            return results[0] if rounds == 1 else results
+        finally:
+            await runner.cleanup()
+
+    def test_downloads_in_input_order(self, tmp_path):
+        def items_for(base):
+            return [("A", f"{base}/img/x.jpg"), ("A", f"{base}/img/x.jpg?v=2"),
+                    ("B", f"{base}/missing.jpg")]
+
+        results = asyncio.run(self._run(items_for, tmp_path))
+        (ad1, _, p1), (ad2, _, p2), (ad3, _, p3) = results
+        assert (ad1, ad2, ad3) == ("A", "A", "B")
+        # mismo nombre en el CDN, URLs distintas -> archivos distintos
+        assert p1 != p2
+        assert Path(p1).name.startswith("A_x_") and p1.endswith(".jpg")
+        assert Path(p1).read_bytes() == Path(p2).read_bytes() == b"img-x.jpg"
+        assert p3 is None
+        assert sorted(f.name for f in tmp_path.glob("*.jpg")) == sorted(
+            [Path(p1).name, Path(p2).name]
+        )
+
+    def test_queued_downloads_do_not_time_out(self, tmp_path):
+        def items_for(base):
+            return [("A", f"{base}/img/{i}.jpg") for i in range(12)]
+
+        # 6 tandas de 0.3s superan el timeout de 1s: la espera en cola
+        # no debe contar contra él
+        results = asyncio.run(
+            self._run(items_for, tmp_path, delay=0.3, timeout=1)
+        )
+        assert all(path is not None for _, _, path in results)
+        assert self.max_active == 2
+
+    def test_rerun_skips_finished_files(self, tmp_path):
+        def items_for(base):
+            return [("A", f"{base}/img/x.jpg")]
+
+        media = tmp_path / "media"
+        media.mkdir()
+        [(_, _, first)], [(_, _, second)] = asyncio.run(
+            self._run(items_for, media, rounds=2)
+        )
+        assert second == first
+        assert self.hits == ["/img/x.jpg"]
+        assert Path(first).read_bytes() == b"img-x.jpg"
+        # sin --revalidate no se guardan ETags
+        assert [f.name for f in tmp_path.iterdir()] == ["media"]
+        assert [f.name for f in media.iterdir()] == [Path(first).name]
+
+    def test_revalidate_uses_conditional_get(self, tmp_path):
+        def items_for(base):
+            return [("A", f"{base}/img/x.jpg")]
+
+        media = tmp_path / "media"
+        media.mkdir()
+        [(_, _, first)], [(_, _, second)] = asyncio.run(
+            self._run(items_for, media, rounds=2, revalidate=True)
+        )
+        # la segunda ronda pregunta al servidor y recibe 304
+        assert self.hits == ["/img/x.jpg", "/img/x.jpg"]
+        assert second == first
+        assert Path(first).read_bytes() == b"img-x.jpg"
+        # el ETag queda fuera de media/
+        assert [f.name for f in media.iterdir()] == [Path(first).name]
+        etag = tmp_path / ".etags" / f"{Path(first).name}.etag"
+        assert etag.read_text() == '"v1"'
+
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b"img")
+
+    def log_message(self, *args):
+        pass
+
+
+class TestMain:
+    """Tests del CLI: cada URL se descarga una sola vez"""
+
+    def test_shared_url_fetched_once_and_linked(self, tmp_path):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ImageHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        shared = {"page_profile_picture_url": f"{base}/p.jpg"}
+        run_dir = tmp_path / "run1"
+        run_dir.mkdir()
+        with (run_dir / "run1.csv").open("w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["ad_archive_id", "snapshot"])
+            writer.writerow(["A", json.dumps(shared)])
+            writer.writerow(["B", json.dumps(shared)])
+            writer.writerow(["A", json.dumps(shared)])
+        _ImageHandler.hits = []
+        try:
+            assert main(["--run-id", "run1", "--base-dir", str(tmp_path),
+                         "--report"]) == 0
+        finally:
+            server.shutdown()
+
+        assert _ImageHandler.hits == ["/p.jpg"]
+        media = run_dir / "media"
+        (a_file,) = media.glob("A_p_*.jpg")
+        (b_file,) = media.glob("B_p_*.jpg")
+        assert a_file.read_bytes() == b_file.read_bytes() == b"img"
+        report = json.loads((media / "report.json").read_text())
+        assert report["total_found"] == 2 and report["unique_urls"] == 1
+        assert report["fetched"] == 1 and report["downloaded"] == 2
+
+
+class TestUrlCache:
+    """Tests de la caché de URLs por CSV"""
+
+    def _write_csv(self, path: Path) -> Path:
+        with path.open("w", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["ad_archive_id", "snapshot"])
+            writer.writerow(["A", json.dumps(SNAP)])
+            writer.writerow(["B", json.dumps(SNAP)])
+        return path
+
+    def test_roundtrip_and_invalidation(self, tmp_path):
+        path = self._write_csv(tmp_path / "run.csv")
+        assert load_url_cache(path) is None
+
+        url_to_ads = collect_media_urls(path)
+        save_url_cache(path, url_to_ads)
+        cached = load_url_cache(path)
+        assert list(cached.items()) == list(url_to_ads.items())
+        assert list(cached["https://img/p.jpg"]) == ["A", "B"]
+
+        # cambiar el CSV invalida la caché
+        with path.open("a", newline="") as fh:
+            csv.writer(fh).writerow(["C", ""])
+        assert load_url_cache(path) is None
+
+    def test_process_pool_matches_in_process(self, tmp_path, monkeypatch):
+        path = self._write_csv(tmp_path / "run.csv")
+        monkeypatch.setattr(download_images_from_csv, "PARSE_CHUNK_ROWS", 1)
+        expected = collect_media_urls(path)
+        assert list(collect_media_urls(path, workers=2).items()) == list(
+            expected.items()
+        )
+
+    def test_dry_run_skips_parsing_when_cached(self, tmp_path, monkeypatch):
+        run_dir = tmp_path / "run1"
+        run_dir.mkdir()
+        self._write_csv(run_dir / "run1.csv")
+        args = ["--run-id", "run1", "--base-dir", str(tmp_path), "--dry-run"]
+        assert main(args) == 0
+
+        def fail(_):
+            raise AssertionError("el CSV no debería volver a parsearse")
+
+        monkeypatch.setattr(download_images_from_csv, "collect_media_urls", fail)
+        assert main(args) == 0
@@ -0,0 +1,95 @@
+"""
+Tests de extracción de frames de video (processors/video_processor)
+"""
+import base64
+import functools
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.processors.video_processor import VideoFrameExtractor  # noqa: E402
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _write_video(path: Path, frames: int = 30) -> Path:
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"mp4v"), 10, (64, 48)
+    )
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 8, np.uint8))
+    writer.release()
+    return path
+
+
+class TestVideoFrameExtractor:
+    """Tests de VideoFrameExtractor contra un servidor HTTP local"""
+
+    def _serve(self, directory: Path):
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            functools.partial(_QuietHandler, directory=str(directory))
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_streams_url_without_temp_download(self, tmp_path):
+        _write_video(tmp_path / "v.mp4")
+        server, base = self._serve(tmp_path)
+        extractor = VideoFrameExtractor(num_frames=3)
+        downloads = []
+        extractor.download_video_temp = downloads.append
+        try:
+            frames = extractor.process_video_url(
+                f"{base}/v.mp4", "A", tmp_path / "out"
+            )
+        finally:
+            server.shutdown()
+
+        assert downloads == []
+        assert [f["filename"] for f in frames] == [
+            "A_frame0.jpg", "A_frame1.jpg", "A_frame2.jpg"
+        ]
+        saved = Path(frames[0]["path"]).read_bytes()
+        assert base64.b64decode(frames[0]["base64"]) == saved
+        assert saved[:2] == b"\xff\xd8"
+
+    def test_falls_back_to_temp_download(self, tmp_path):
+        video = _write_video(tmp_path / "v.mp4")
+        extractor = VideoFrameExtractor(num_frames=2)
+        extractor.stream_frames = lambda url: []
+        temp = tmp_path / "temp.mp4"
+
+        def download(url):
+            temp.write_bytes(video.read_bytes())
+            return temp
+
+        extractor.download_video_temp = download
+
+        frames = extractor.process_video_url("http://x/v.mp4", "A")
+
+        assert len(frames) == 2 and not temp.exists()
+
+    def test_session_shared_between_extractors(self):
+        assert VideoFrameExtractor().session is VideoFrameExtractor().session
+
+    def test_multiple_videos_keep_order(self):
+        extractor = VideoFrameExtractor()
+        extractor.process_video_url = (
+            lambda video_url, ad_id, save_dir: [ad_id, video_url]
+        )
+
+        frames = extractor.process_multiple_videos(["u0", "u1", "u2"], "A")
+
+        assert frames == ["A_0", "u0", "A_1", "u1", "A_2", "u2"]
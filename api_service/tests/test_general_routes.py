@@ -0,0 +1,138 @@
+"""
+Tests de los endpoints generales de Apify (actores, datasets, runs)
+Usa un cliente falso en lugar de la API real de Apify
+"""
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.api.routes.apify.general import general_routes  # noqa: E402
+
+
+RUNS = [
+    {
+        "id": "run1", "actId": "act1", "status": "SUCCEEDED",
+        "startedAt": "2025-11-20T10:00:00.000Z",
+        "defaultDatasetId": "ds1"
+    },
+    {"id": "run2", "actId": "act1", "status": "FAILED"},
+]
+ACTORS = [
+    {
+        "id": "act1", "name": "scraper", "username": "me",
+        "createdAt": "2025-01-01T00:00:00.000Z"
+    }
+]
+DATASETS = [{"id": "ds1", "name": "fb", "itemCount": 10}]
+
+
+class FakeCollection:
+    def __init__(self, items, calls):
+        self._items = items
+        self._calls = calls
+
+    def list(self, **kwargs):
+        self._calls.append(kwargs)
+        return SimpleNamespace(items=list(self._items))
+
+
+class FakeApifyClient:
+    def __init__(self):
+        self.calls = []
+
+    def actors(self):
+        return FakeCollection(ACTORS, self.calls)
+
+    def datasets(self):
+        return FakeCollection(DATASETS, self.calls)
+
+    def runs(self):
+        return FakeCollection(RUNS, self.calls)
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeApifyClient()
+    monkeypatch.setattr(general_routes, "get_apify_client", lambda: client)
+    general_routes._list_cache.clear()
+    yield client
+    general_routes._list_cache.clear()
+
+
+@pytest.fixture
+def api():
+    app = FastAPI()
+    app.include_router(general_routes.router, prefix="/general")
+    return TestClient(app)
+
+
+class TestGeneralRoutes:
+    """Tests de los listados generales"""
+
+    def test_list_actors(self, api, fake_client):
+        resp = api.get("/general/actors", params={"limit": 5})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data[0]["id"] == "act1"
+        assert data[0]["createdAt"].startswith("2025-01-01T00:00:00")
+        assert fake_client.calls == [{"my": False, "limit": 5, "offset": 0}]
+
+    def test_list_actors_my(self, api, fake_client):
+        resp = api.get("/general/actors", params={"my": "true"})
+        assert resp.status_code == 200
+        assert fake_client.calls[0]["my"] is True
+
+    def test_list_datasets(self, api, fake_client):
+        resp = api.get("/general/datasets")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data[0]["itemCount"] == 10
+        assert data[0]["cleanItemCount"] == 0
+
+    def test_list_runs(self, api, fake_client):
+        resp = api.get("/general/runs")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [r["id"] for r in data] == ["run1", "run2"]
+        assert data[0]["actId"] == "act1"
+        assert data[0]["defaultDatasetId"] == "ds1"
+
+    def test_list_runs_status_filter_server_side(self, api, fake_client):
+        resp = api.get("/general/runs", params={"status": "failed"})
+        assert resp.status_code == 200
+        assert fake_client.calls == [
+            {"limit": 100, "offset": 0, "status": "FAILED"}
+        ]
+
+    def test_list_runs_stream_ndjson(self, api, fake_client):
+        resp = api.get("/general/runs", params={"stream": "true"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [r["id"] for r in lines] == ["run1", "run2"]
+        assert lines[1]["status"] == "FAILED"
+
+    def test_list_runs_cached(self, api, fake_client):
+        first = api.get("/general/runs", params={"limit": 10})
+        second = api.get("/general/runs", params={"limit": 10})
+        assert first.json() == second.json()
+        assert len(fake_client.calls) == 1
+
+        # Parámetros distintos no comparten entrada de cache
+        api.get("/general/runs", params={"limit": 20})
+        assert len(fake_client.calls) == 2
+
+    def test_list_cache_expires(self, api, fake_client, monkeypatch):
+        monkeypatch.setattr(general_routes, "LIST_CACHE_TTL", -1)
+        api.get("/general/datasets")
+        api.get("/general/datasets")
+        assert len(fake_client.calls) == 2
@@ -0,0 +1,224 @@
+"""
+Tests de los endpoints de Instagram
+Usa httpx.MockTransport en lugar de la API real de Apify
+"""
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.api.routes.apify.instagram import instagram_actor  # noqa: E402
+from app.api.routes.apify.instagram import instagram_routes  # noqa: E402
+from app.api.routes.dependencies import dependencies  # noqa: E402
+from app.config.settings import get_settings  # noqa: E402
+from app.services.run_status_store import (  # noqa: E402
+    RunStatusStore, get_run_status_store
+)
+
+
+RUN = {
+    "id": "run1", "status": "SUCCEEDED",
+    "startedAt": "2025-11-20T10:00:00.000Z",
+    "defaultDatasetId": "ds1"
+}
+ITEMS = [
+    {"id": "p1", "ownerUsername": "nasa", "likesCount": 10},
+    {"id": "p2", "ownerUsername": "nasa", "isVideo": True},
+]
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if request.method == "POST" and path.endswith("/runs"):
+        return httpx.Response(201, json={"data": RUN})
+    if path == "/v2/actor-runs/run1":
+        return httpx.Response(200, json={"data": RUN})
+    if path == "/v2/datasets/ds1/items":
+        return httpx.Response(200, json=ITEMS)
+    return httpx.Response(404, json={"error": {"type": "record-not-found"}})
+
+
+def _actor_factory(handler):
+    def factory():
+        return instagram_actor.InstagramActor(
+            client=object(),
+            http_client=httpx.AsyncClient(
+                base_url=dependencies.APIFY_API_BASE,
+                transport=httpx.MockTransport(handler)
+            )
+        )
+    return factory
+
+
+@pytest.fixture
+def requests_seen(monkeypatch):
+    monkeypatch.setenv("APIFY_TOKEN", "test-token")
+    monkeypatch.delenv("INSTAGRAM_SYNC_CLIENT", raising=False)
+    get_settings.cache_clear()
+    yield []
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def api(requests_seen):
+    def handler(request):
+        requests_seen.append(request)
+        return _handler(request)
+
+    app = FastAPI()
+    app.include_router(instagram_routes.router, prefix="/instagram")
+    # Inyectar un cliente falso en lugar del compartido
+    app.dependency_overrides[instagram_routes.get_instagram_actor] = (
+        _actor_factory(handler)
+    )
+    app.dependency_overrides[get_run_status_store] = RunStatusStore
+    return TestClient(app)
+
+
+class TestInstagramRoutes:
+    """Tests de los endpoints async de Instagram"""
+
+    def test_scrape_starts_run(self, api, requests_seen):
+        resp = api.post("/instagram/scrape", json={"usernames": ["nasa"]})
+        assert resp.status_code == 202
+        assert resp.json()["run_id"] == "run1"
+        request = requests_seen[0]
+        assert request.url.path == "/v2/acts/apify~instagram-scraper/runs"
+        assert request.headers["Authorization"] == "Bearer test-token"
+
+    def test_run_status(self, api, requests_seen):
+        resp = api.get("/instagram/runs/run1")
+        assert resp.status_code == 200
+        assert resp.json()["default_dataset_id"] == "ds1"
+
+    def test_run_status_not_found(self, api, requests_seen):
+        resp = api.get("/instagram/runs/missing")
+        assert resp.status_code == 404
+
+    def test_shared_clients_are_reused(self, requests_seen):
+        dependencies.get_apify_client.cache_clear()
+        try:
+            assert (
+                dependencies.get_apify_client()
+                is dependencies.get_apify_client()
+            )
+        finally:
+            dependencies.get_apify_client.cache_clear()
+
+    def test_run_results(self, api, requests_seen):
+        resp = api.get("/instagram/runs/run1/results", params={"limit": 2})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 2
+        assert data["data"][1]["is_video"] is True
+        assert requests_seen[-1].url.params["limit"] == "2"
+
+    def test_run_status_long_poll(self, api, requests_seen, monkeypatch):
+        statuses = iter(["RUNNING", "RUNNING", "SUCCEEDED"])
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(
+                200, json={"data": {**RUN, "status": next(statuses)}}
+            )
+
+        async def no_sleep(_):
+            return None
+
+        monkeypatch.setattr(instagram_actor.asyncio, "sleep", no_sleep)
+        api.app.dependency_overrides[instagram_routes.get_instagram_actor] = (
+            _actor_factory(handler)
+        )
+        resp = api.get("/instagram/runs/run1", params={"wait": 30})
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "SUCCEEDED"
+        assert len(requests_seen) == 3
+
+    def test_run_status_wait_out_of_range(self, api, requests_seen):
+        resp = api.get("/instagram/runs/run1", params={"wait": 60})
+        assert resp.status_code == 422
+
+    def test_scrape_queued_in_celery(self, api, requests_seen, monkeypatch):
+        pytest.importorskip("celery")
+        from app.tasks import apify_tasks
+
+        queued = []
+
+        def fake_delay(actor_id, actor_input, webhooks=None):
+            queued.append((actor_id, actor_input))
+            return SimpleNamespace(id="task1")
+
+        monkeypatch.setattr(instagram_routes, "CELERY_ENABLED", True)
+        monkeypatch.setattr(apify_tasks.start_apify_run, "delay", fake_delay)
+        resp = api.post("/instagram/scrape", json={"hashtags": ["cars"]})
+        assert resp.status_code == 202
+        assert resp.json()["task_id"] == "task1"
+        assert queued[0][0] == "apify/instagram-scraper"
+        assert requests_seen == []
+
+    def test_task_status_disabled(self, api, requests_seen, monkeypatch):
+        monkeypatch.setattr(instagram_routes, "CELERY_ENABLED", False)
+        assert api.get("/instagram/tasks/task1").status_code == 404
+
+    def test_run_status_from_webhook_store(self, api, requests_seen):
+        store = RunStatusStore()
+        asyncio.run(store.set("run9", {"id": "run9", "status": "FAILED"}))
+        api.app.dependency_overrides[get_run_status_store] = lambda: store
+        resp = api.get("/instagram/runs/run9")
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "FAILED"
+        assert requests_seen == []
+
+    def test_scrape_registers_webhooks(self, api, requests_seen, monkeypatch):
+        monkeypatch.setenv("APIFY_WEBHOOK_URL", "https://example.com/hook")
+        monkeypatch.setenv("APIFY_WEBHOOK_SECRET", "s3cret")
+        dependencies.get_run_webhooks.cache_clear()
+        try:
+            resp = api.post("/instagram/scrape", json={"hashtags": ["cars"]})
+        finally:
+            dependencies.get_run_webhooks.cache_clear()
+        assert resp.status_code == 202
+        assert "webhooks" in requests_seen[0].url.params
+
+    def test_settings_resolved_once(self, requests_seen, monkeypatch):
+        assert get_settings().apify_token == "test-token"
+        monkeypatch.setenv("APIFY_TOKEN", "otro")
+        assert get_settings().apify_token == "test-token"
+        get_settings.cache_clear()
+        assert get_settings().apify_token == "otro"
+
+    def test_run_results_paginated(self, api, requests_seen):
+        dataset = [{"id": f"p{i}"} for i in range(300)]
+
+        def handler(request):
+            requests_seen.append(request)
+            if request.url.path == "/v2/actor-runs/run1":
+                return httpx.Response(200, json={"data": RUN})
+            start = int(request.url.params["offset"])
+            size = int(request.url.params["limit"])
+            return httpx.Response(200, json=dataset[start:start + size])
+
+        api.app.dependency_overrides[instagram_routes.get_instagram_actor] = (
+            _actor_factory(handler)
+        )
+        resp = api.get(
+            "/instagram/runs/run1/results",
+            params={"limit": 1000, "offset": 10}
+        )
+        assert resp.status_code == 200
+        ids = [post["id"] for post in resp.json()["data"]]
+        assert ids == [f"p{i}" for i in range(10, 300)]
+        page_requests = [
+            r for r in requests_seen if r.url.path.endswith("/items")
+        ]
+        assert len(page_requests) == 8
+        assert max(int(r.url.params["limit"]) for r in page_requests) == 125
@@ -0,0 +1,270 @@
+"""
+Tests de preparación de multimedia (processors/media_preparation)
+Verifica codificación base64 de archivos y directorios
+"""
+import asyncio
+import base64
+import gzip
+import io
+import os
+import sys
+from pathlib import Path
+
+from aiohttp import web
+from PIL import Image
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.processors.media_preparation import (  # noqa: E402
+    AsyncMediaEncoder, BatchMediaProcessor, ImageOptimizer, async_encoder,
+    load_media_item
+)
+
+
+def _write_image(path: Path, size=(64, 48), mode="RGB") -> Path:
+    Image.new(mode, size, (200, 10, 10)).save(path, format="PNG")
+    return path
+
+
+class TestImageOptimizer:
+    """Tests de ImageOptimizer"""
+
+    def test_large_jpeg_downscaled(self):
+        for mode in ("RGB", "L", "CMYK"):
+            buf = io.BytesIO()
+            Image.new(mode, (4000, 2000)).save(buf, format="JPEG")
+
+            optimized, metadata = ImageOptimizer(
+                max_width=100, max_height=100
+            ).optimize_image_bytes(buf.getvalue())
+
+            assert metadata["original_dimensions"] == (4000, 2000)
+            assert metadata["final_dimensions"] == (100, 50)
+            img = Image.open(io.BytesIO(optimized))
+            assert img.mode == "RGB" and img.size == (100, 50)
+
+
+    def test_small_jpeg_returned_unchanged(self):
+        optimizer = ImageOptimizer(max_width=100, max_height=100)
+        small, gray = io.BytesIO(), io.BytesIO()
+        Image.new("RGB", (80, 60)).save(small, format="JPEG", quality=95)
+        Image.new("L", (80, 60)).save(gray, format="JPEG")
+
+        optimized, metadata = optimizer.optimize_image_bytes(small.getvalue())
+        assert optimized == small.getvalue() and metadata["unchanged"]
+        assert metadata["final_dimensions"] == (80, 60)
+
+        # gris: se recodifica a RGB como antes
+        optimized, metadata = optimizer.optimize_image_bytes(gray.getvalue())
+        assert "unchanged" not in metadata
+        assert Image.open(io.BytesIO(optimized)).mode == "RGB"
+
+    def test_optimize_flag(self):
+        buf = io.BytesIO()
+        Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3)).save(
+            buf, format="PNG"
+        )
+        sizes = [
+            ImageOptimizer(optimize=flag).optimize_image_bytes(
+                buf.getvalue()
+            )[1]["optimized_size"]
+            for flag in (True, False)
+        ]
+        assert sizes[0] < sizes[1]
+
+    def test_output_buffer_reused_between_images(self):
+        optimizer = ImageOptimizer(max_width=100, max_height=100)
+        big, small = io.BytesIO(), io.BytesIO()
+        Image.frombytes("RGB", (300, 300), os.urandom(300 * 300 * 3)).save(
+            big, format="PNG"
+        )
+        Image.new("RGB", (8, 8)).save(small, format="PNG")
+
+        first, _ = optimizer.optimize_and_encode(big.getvalue())
+        buffer = optimizer._local.buffer
+        second, meta = optimizer.optimize_and_encode(small.getvalue())
+
+        assert optimizer._local.buffer is buffer
+        # la imagen chica no arrastra bytes viejos de la grande
+        assert len(base64.b64decode(second)) == meta["optimized_size"]
+        assert Image.open(io.BytesIO(base64.b64decode(second))).size == (8, 8)
+        assert len(second) < len(first)
+
+
+class TestAsyncMediaEncoder:
+    """Tests de AsyncMediaEncoder"""
+
+    def test_encode_single_file(self, tmp_path):
+        path = _write_image(tmp_path / "a.png", size=(2000, 1000))
+        encoder = AsyncMediaEncoder(max_concurrent=2, max_size=100)
+
+        result = asyncio.run(encoder.encode_single_file(path, {"ad_id": "A"}))
+
+        assert result["status"] == "ok"
+        assert result["metadata"]["filename"] == "a.png"
+        assert result["metadata"]["ad_id"] == "A"
+        assert result["metadata"]["size_kb"] == path.stat().st_size / 1024
+        img = Image.open(io.BytesIO(base64.b64decode(result["base64"])))
+        assert img.format == "JPEG" and img.size == (100, 50)
+
+    def test_encode_single_file_missing(self, tmp_path):
+        encoder = AsyncMediaEncoder()
+        result = asyncio.run(encoder.encode_single_file(tmp_path / "x.jpg"))
+        assert result["status"] == "error" and result["error"]
+
+    def test_encode_batch_order_and_progress(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(async_encoder, "PROGRESS_EVERY", 2)
+        paths = [_write_image(tmp_path / f"{i}.png") for i in range(3)]
+        paths.insert(1, tmp_path / "missing.png")
+        calls = []
+
+        results = asyncio.run(AsyncMediaEncoder(max_concurrent=2).encode_batch(
+            paths, lambda done, total: calls.append((done, total))
+        ))
+
+        assert [r["file_path"] for r in results] == [str(p) for p in paths]
+        assert [r["status"] for r in results] == ["ok", "error", "ok", "ok"]
+        assert calls == [(2, 4), (4, 4)]
+
+    def test_process_pool_for_large_images(self, tmp_path):
+        large = tmp_path / "grande.png"
+        Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3)).save(large)
+        small = _write_image(tmp_path / "chica.png")
+        assert large.stat().st_size >= async_encoder.PROCESS_POOL_MIN_BYTES
+
+        async def run(encoder):
+            async with encoder:
+                results = await encoder.encode_batch([large, small])
+                assert encoder._pool is not None
+            assert encoder._pool is None
+            return results
+
+        results = asyncio.run(run(AsyncMediaEncoder(max_size=100, processes=2)))
+
+        assert [r["status"] for r in results] == ["ok", "ok"]
+        assert results[0]["metadata"]["size_kb"] == large.stat().st_size / 1024
+        img = Image.open(io.BytesIO(base64.b64decode(results[0]["base64"])))
+        assert img.format == "JPEG" and img.size == (100, 100)
+
+    def test_process_pool_uses_encoder_settings(self, tmp_path):
+        large = tmp_path / "grande.png"
+        Image.frombytes("RGB", (200, 200), os.urandom(200 * 200 * 3)).save(large)
+
+        async def run(encoder):
+            async with encoder:
+                return await encoder.encode_single_file(large)
+
+        result = asyncio.run(run(
+            AsyncMediaEncoder(max_size=100, processes=2, optimize=False)
+        ))
+        expected = ImageOptimizer(
+            max_width=100, max_height=100, optimize=False
+        ).optimize_image_bytes(large.read_bytes())[1]
+
+        assert result["status"] == "ok"
+        assert result["metadata"]["optimized_size"] == expected["optimized_size"]
+
+    def test_encode_images_async_closes_encoder(self, tmp_path, monkeypatch):
+        closed = []
+        original = AsyncMediaEncoder.aclose
+
+        async def aclose(encoder):
+            closed.append(encoder)
+            await original(encoder)
+
+        monkeypatch.setattr(AsyncMediaEncoder, "aclose", aclose)
+        path = _write_image(tmp_path / "a.png")
+
+        results = asyncio.run(async_encoder.encode_images_async([path]))
+
+        assert [r["status"] for r in results] == ["ok"]
+        assert len(closed) == 1 and closed[0]._pool is None
+
+    def test_encode_directory(self, tmp_path):
+        _write_image(tmp_path / "a.png")
+        (tmp_path / "notas.txt").write_text("x")
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        _write_image(sub / "b.PNG")
+        encoder = AsyncMediaEncoder()
+
+        flat = asyncio.run(encoder.encode_directory(tmp_path, ('.png',)))
+        deep = asyncio.run(
+            encoder.encode_directory(tmp_path, ('.png',), recursive=True)
+        )
+
+        assert flat["total"] == flat["success_count"] == 1
+        assert sorted(
+            Path(r["file_path"]).name for r in deep["successful"]
+        ) == ["a.png", "b.PNG"]
+
+
+class TestBatchMediaProcessor:
+    """Tests de BatchMediaProcessor contra un servidor HTTP local"""
+
+    async def _prepare(self, processor, paths):
+        buf = io.BytesIO()
+        Image.new("RGB", (32, 32)).save(buf, format="PNG")
+
+        async def image(request):
+            return web.Response(body=buf.getvalue())
+
+        app = web.Application()
+        app.router.add_get("/img/{name}", image)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        try:
+            async with processor:
+                first = await processor.prepare_images_from_urls(
+                    [f"{base}{p}" for p in paths]
+                )
+                client = processor._client
+                await processor.prepare_images_from_urls([f"{base}{paths[0]}"])
+                # el cliente HTTP se reutiliza entre lotes
+                assert processor._client is client
+            assert processor._client is None and client.is_closed
+            return first
+        finally:
+            await runner.cleanup()
+
+    def test_prepare_images_from_urls(self):
+        processor = BatchMediaProcessor(max_concurrent=2)
+        results = asyncio.run(
+            self._prepare(processor, ["/img/a.png", "/missing", "/img/b.png"])
+        )
+        by_url = {r["url"].rsplit("/", 1)[-1]: r for r in results}
+        assert len(results) == 3
+        assert by_url["a.png"]["success"] and by_url["b.png"]["success"]
+        assert by_url["a.png"]["media_type"] == "image/jpeg"
+        assert base64.b64decode(by_url["a.png"]["base64"])[:2] == b"\xff\xd8"
+        assert by_url["missing"]["success"] is False
+
+    def test_process_multiple_ads_streams_base64(self, tmp_path):
+        images = [_write_image(tmp_path / f"{i}.png") for i in range(2)]
+        frames = [_write_image(tmp_path / "f0.png")]
+        ads = [
+            {"ad_id": "A", "image_paths": images},
+            {"ad_id": "B", "frame_paths": frames + [tmp_path / "nada.png"]},
+        ]
+        out_path = tmp_path / "media.jsonl.gz"
+
+        with gzip.open(out_path, "wb", compresslevel=1) as out:
+            result = asyncio.run(BatchMediaProcessor().process_multiple_ads(
+                ads, show_progress=False, out_stream=out
+            ))
+
+        media = result["media_by_ad"]
+        assert [len(media["A"]["images"]), len(media["B"]["frames"])] == [2, 1]
+        assert len(media["B"]["errors"]) == 1
+        refs = media["A"]["images"] + media["B"]["frames"]
+        assert all("base64" not in ref for ref in refs)
+        with gzip.open(out_path, "rb") as stream:
+            for ref in refs:
+                item = load_media_item(stream, ref["offset"])
+                assert item["filename"] == ref["filename"]
+                assert base64.b64decode(item["base64"])[:2] == b"\xff\xd8"
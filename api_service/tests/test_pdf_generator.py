@@ -0,0 +1,156 @@
+"""
+Tests del generador de reportes PDF (utils/pdf_generator.py)
+Verifica la generación individual y en lote a partir de JSON forense y legacy
+"""
+import pytest
+import sys
+from pathlib import Path
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+
+FORENSIC_JSON = {
+    'metadata': {
+        'report_title': 'Análisis Forense de Prueba',
+        'date': '2025-11-20',
+        'analyst': 'Test',
+        'total_assets_analyzed': 1,
+        'campaign_id': 'TEST-001'
+    },
+    'executive_summary': {
+        'overview': 'Resumen general',
+        'key_patterns': 'Patrones',
+        'critical_findings': 'Hallazgos'
+    },
+    'assets_analysis': [
+        {
+            'file_name': 'ad_001.jpg',
+            'asset_id': 'AD-001',
+            'asset_type': 'image',
+            'visual_forensics': {
+                'composition': 'Regla de los tercios',
+                'lighting_color': 'Cálida'
+            },
+            'semiotic_analysis': {'denotation': 'Auto'},
+            'effectiveness_scores': {'overall_score': 8},
+            'optimization_roadmap': [
+                {'priority': 'ALTA', 'action': 'Mejorar CTA'}
+            ]
+        }
+    ],
+    'global_conclusions': {'summary': 'Conclusión'},
+    'strategic_roadmap': {
+        'immediate_actions': ['Pausar AD-005'],
+        'short_term_plan': 'Test A/B',
+        'long_term_strategy': 'Branding'
+    }
+}
+
+LEGACY_JSON = {
+    'campaign_name': 'Campaña Legacy',
+    'executive_summary': 'Resumen legacy',
+    'comparative_analysis': [
+        {
+            'status': 'Ganador',
+            'ad_id': 'AD-002',
+            'real_metrics': {'vtr': '10%', 'ctr': '2%', 'shares': '5'},
+            'forensic_analysis': {'hook_0_3s': 'Hook', 'audio': 'Música'}
+        }
+    ],
+    'general_recommendations': ['Recomendación 1']
+}
+
+
+class TestPDFGenerator:
+    """Tests del generador de PDF forense"""
+
+    def test_generar_reporte_forense(self, tmp_path):
+        """Verifica que se genera un PDF válido desde JSON forense"""
+        from app.api.routes.apify.facebook.utils.pdf_generator import (
+            generar_reporte_pdf
+        )
+        out = generar_reporte_pdf(FORENSIC_JSON, tmp_path / 'forense.pdf')
+        assert out.exists()
+        assert out.read_bytes().startswith(b'%PDF')
+
+    def test_generar_reporte_legacy(self, tmp_path):
+        """Verifica que se genera un PDF válido desde JSON legacy"""
+        from app.api.routes.apify.facebook.utils.pdf_generator import (
+            generar_reporte_pdf
+        )
+        out = generar_reporte_pdf(LEGACY_JSON, tmp_path / 'legacy.pdf')
+        assert out.exists()
+        assert out.read_bytes().startswith(b'%PDF')
+
+    def test_generar_reportes_batch(self, tmp_path):
+        """Verifica que el lote respeta el orden de los jobs"""
+        from app.api.routes.apify.facebook.utils.pdf_generator import (
+            generar_reportes_batch
+        )
+        jobs = [
+            (FORENSIC_JSON, tmp_path / 'a.pdf'),
+            (LEGACY_JSON, tmp_path / 'b.pdf'),
+            (FORENSIC_JSON, tmp_path / 'c.pdf'),
+        ]
+        results = generar_reportes_batch(jobs)
+        assert results == [path for _, path in jobs]
+        assert all(p.exists() for p in results)
+
+    def test_generar_reportes_batch_vacio(self):
+        """Un lote vacío no levanta el pool de procesos"""
+        from app.api.routes.apify.facebook.utils.pdf_generator import (
+            generar_reportes_batch
+        )
+        assert generar_reportes_batch([]) == []
+
+    def test_generar_reporte_fpdf2(self, tmp_path, monkeypatch):
+        """Con PDF_ENGINE=fpdf2 se usa el motor alternativo"""
+        pytest.importorskip('fpdf')
+        from app.api.routes.apify.facebook.utils.pdf_generator import (
+            generar_reporte_pdf
+        )
+        monkeypatch.setenv('PDF_ENGINE', 'fpdf2')
+        for name, data in (('forense', FORENSIC_JSON), ('legacy', LEGACY_JSON)):
+            out = generar_reporte_pdf(data, tmp_path / f'{name}.pdf')
+            assert out.read_bytes().startswith(b'%PDF')
+
+    def test_fpdf2_unicode_and_null_summary(self, tmp_path, monkeypatch):
+        """fpdf2 conserva Unicode y un resumen nulo no se imprime como None"""
+        pytest.importorskip('fpdf')
+        from app.api.routes.apify.facebook.utils import pdf_generator_fpdf2
+
+        if pdf_generator_fpdf2._unicode_fonts() is None:
+            pytest.skip('sin fuente TTF disponible')
+        written = []
+        original = pdf_generator_fpdf2._ReportePDF.paragraph
+
+        def spy(pdf, text, label=None, indent=0):
+            written.append(pdf._txt(text))
+            original(pdf, text, label=label, indent=indent)
+
+        monkeypatch.setattr(pdf_generator_fpdf2._ReportePDF, 'paragraph', spy)
+        data = {**LEGACY_JSON, 'executive_summary': None,
+                'general_recommendations': ['“Hola” — **€9**']}
+        out = pdf_generator_fpdf2.generar_reporte_pdf(data, tmp_path / 'u.pdf')
+        assert out.read_bytes().startswith(b'%PDF')
+        assert 'No disponible' in written and 'None' not in written
+        assert any('“Hola” — **€9**' in text for text in written)
+
+    def test_fpdf2_render_errors_not_masked(self, tmp_path, monkeypatch):
+        """Un ImportError al renderizar con fpdf2 no cae a ReportLab"""
+        pytest.importorskip('fpdf')
+        from app.api.routes.apify.facebook.utils import pdf_generator_fpdf2
+        from app.api.routes.apify.facebook.utils.pdf_generator import (
+            generar_reporte_pdf
+        )
+
+        def broken(json_data, output_path):
+            raise ImportError('módulo opcional de fpdf2')
+
+        monkeypatch.setattr(pdf_generator_fpdf2, 'generar_reporte_pdf', broken)
+        monkeypatch.setenv('PDF_ENGINE', 'fpdf2')
+        with pytest.raises(ImportError, match='módulo opcional'):
+            generar_reporte_pdf(FORENSIC_JSON, tmp_path / 'r.pdf')
+        assert not (tmp_path / 'r.pdf').exists()
@@ -0,0 +1,47 @@
+"""
+Tests del middleware de profiling (utils/profiling.py)
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.utils.profiling import add_profiling_middleware  # noqa: E402
+
+
+@pytest.fixture
+def api():
+    pytest.importorskip("pyinstrument")
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    assert add_profiling_middleware(app)
+    return TestClient(app)
+
+
+class TestProfilingMiddleware:
+    """Tests del perfil por request"""
+
+    def test_without_flag_returns_normal_response(self, api):
+        resp = api.get("/ping")
+        assert resp.json() == {"ok": True}
+
+    def test_profile_flag_returns_html(self, api):
+        resp = api.get("/ping", params={"profile": 1})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/html")
+        assert "pyinstrument" in resp.text.lower()
+
+    @pytest.mark.parametrize("flag", ["0", "false", ""])
+    def test_falsy_flag_returns_normal_response(self, api, flag):
+        resp = api.get("/ping", params={"profile": flag})
+        assert resp.json() == {"ok": True}
@@ -0,0 +1,129 @@
+"""
+Tests del constructor de datasets de TikTok (processors/tiktok)
+"""
+import json
+import math
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.processors.tiktok import (  # noqa: E402
+    build, build_from_items, build_from_json, normalize_item, normalize_items
+)
+from app.processors.tiktok.transform import (  # noqa: E402
+    parse_iso, parse_iso_column
+)
+
+ITEMS = [
+    {
+        "webVideoUrl": "https://www.tiktok.com/@ana/video/1",
+        "text": "hola #fyp #viral @bea",
+        "createTimeISO": "2024-01-02T03:04:05.000Z",
+        "playCount": "200", "diggCount": 10, "shareCount": None,
+        "commentCount": 5, "collectCount": "x",
+        "authorMeta": {"name": "ana", "verified": True, "avatar": "http://a"},
+        "videoMeta": {"coverUrl": "http://c", "duration": 15},
+        "musicMeta": {"musicName": "m", "musicOriginal": True},
+    },
+    {
+        "webVideoUrl": "https://www.tiktok.com/@bea/video/2",
+        "text": None,
+        "createTimeISO": "no es fecha",
+        "playCount": 0, "diggCount": 3,
+        "authorMeta.name": "bea",
+        "videoMeta": {},
+    },
+]
+
+
+def _same(a, b) -> bool:
+    # el DataFrame guarda los faltantes como NaN/None según el dtype
+    if not isinstance(a, list) and pd.isna(a):
+        return b is None or pd.isna(b)
+    return a == b
+
+
+class TestNormalizeItems:
+    """normalize_items debe coincidir con normalize_item fila a fila"""
+
+    def test_matches_row_by_row(self):
+        ids = ["1", "2"]
+        df = normalize_items(ITEMS, ids)
+        expected = [normalize_item(it, i) for it, i in zip(ITEMS, ids)]
+
+        assert list(df.columns) == list(expected[0])
+        for row, exp in zip(df.to_dict(orient="records"), expected):
+            assert all(_same(row[k], exp[k]) for k in exp), (row, exp)
+
+        first = df.iloc[0]
+        assert first["total_engagement"] == 15
+        assert first["ER_play"] == 15 / 200
+        assert first["hashtags"] == ["fyp", "viral"]
+        assert math.isnan(df.iloc[1]["ER_play"])
+
+
+class TestParseIsoColumn:
+    """parse_iso_column debe coincidir con parse_iso (dateutil)"""
+
+    def test_matches_dateutil(self):
+        values = [
+            "2024-01-02T03:04:05.000Z", "2024-01-02T03:04:05.5Z",
+            "2024-01-02T03:04:05Z", "2024-02-30T03:04:05.000Z",
+            "2024-01-02T03:04:60Z", "2024-01-02T03:04:05+02:00",
+            "2024-01-02 03:04:05", "basura", "", None,
+        ]
+        assert parse_iso_column(values).tolist() == [
+            parse_iso(v) for v in values
+        ]
+
+
+class TestBuildFromItems:
+    """Tests de los archivos que escribe build_from_items"""
+
+    def _build(self, tmp_path, monkeypatch, prefer_cover):
+        def fake_download(rows, img_dir, max_workers):
+            for r in rows:
+                if r["avatar_url"]:
+                    r["avatar_path"] = f"{r['id']}_avatar.jpg"
+                if r["cover_url"]:
+                    r["cover_path"] = f"{r['id']}_cover.jpg"
+            return rows
+
+        monkeypatch.setattr(build, "bulk_download", fake_download)
+        out_dir = tmp_path / "out"
+        build_from_items(
+            ITEMS, out_dir, tmp_path / "img", prefer_cover=prefer_cover
+        )
+        with (out_dir / "manifest.jsonl").open(encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_manifest_lines(self, tmp_path, monkeypatch):
+        first, second = self._build(tmp_path, monkeypatch, prefer_cover=True)
+
+        assert first["id"] == "1" and first["image"] == "1_cover.jpg"
+        assert first["caption"] == "hola #fyp #viral @bea"
+        assert first["hashtags"] == ["fyp", "viral"]
+        assert first["shareCount"] is None and first["label_viral"] == 1
+        # sin cover ni avatar: image nulo, NaN escritos como null
+        assert second["image"] is None and second["ER_play"] is None
+
+    def test_manifest_prefers_avatar(self, tmp_path, monkeypatch):
+        first, _ = self._build(tmp_path, monkeypatch, prefer_cover=False)
+        assert first["image"] == "1_avatar.jpg"
+
+    def test_build_from_json(self, tmp_path):
+        json_path = tmp_path / "items.json"
+        json_path.write_text(json.dumps(ITEMS), encoding="utf-8")
+        out_dir = tmp_path / "out"
+
+        build_from_json(
+            json_path, out_dir, tmp_path / "img", download_images=False
+        )
+
+        lines = (out_dir / "manifest.jsonl").read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["1", "2"]
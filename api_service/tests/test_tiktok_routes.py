@@ -0,0 +1,78 @@
+"""
+Tests de los endpoints de TikTok (resultados de un run)
+Usa un ApifyClient falso en lugar de la API real de Apify
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.api.routes.apify.tiktok import tiktok_routes  # noqa: E402
+from app.api.routes.apify.tiktok.tiktok_actor import TikTokActor  # noqa: E402
+from app.config.settings import get_settings  # noqa: E402
+
+ITEMS = [
+    {
+        "id": "v1", "text": "hola",
+        "authorMeta": {"name": "user1", "nickName": "User 1"},
+        "covers": {"default": "https://img/c1.jpg"},
+        "musicMeta": {"musicName": "song", "musicAuthor": "band"},
+        "playCount": 100, "diggCount": 5,
+        "hashtags": [{"name": "cars"}, {"name": "ads"}],
+    },
+    {"id": "v2"},
+]
+
+
+class FakeApifyClient:
+    def run(self, run_id):
+        return SimpleNamespace(get=lambda: {
+            "id": run_id, "status": "SUCCEEDED", "defaultDatasetId": "ds1"
+        })
+
+    def dataset(self, dataset_id):
+        return SimpleNamespace(
+            list_items=lambda limit, offset: SimpleNamespace(
+                items=ITEMS[offset:offset + limit]
+            )
+        )
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setenv("APIFY_TOKEN", "test-token")
+    get_settings.cache_clear()
+    app = FastAPI()
+    app.include_router(tiktok_routes.router, prefix="/tiktok")
+    app.dependency_overrides[tiktok_routes.get_tiktok_actor] = (
+        lambda: TikTokActor(client=FakeApifyClient())
+    )
+    yield TestClient(app)
+    get_settings.cache_clear()
+
+
+class TestTikTokRoutes:
+    """Tests de normalización y resultados de TikTok"""
+
+    def test_normalize_videos_matches_single(self):
+        batch = TikTokActor.normalize_videos(ITEMS)
+        assert batch == [TikTokActor.normalize_video(i) for i in ITEMS]
+        assert batch[0].hashtags == ["cars", "ads"]
+        assert batch[1].author_username is None
+
+    def test_run_results(self, api):
+        resp = api.get("/tiktok/runs/run1/results")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["status"] == "success"
+        assert data["count"] == 2
+        assert data["data"][0]["author_name"] == "User 1"
+        assert data["data"][0]["play_count"] == 100
+        assert data["data"][1]["download_count"] == 0
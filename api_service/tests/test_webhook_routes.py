@@ -0,0 +1,102 @@
+"""
+Tests del endpoint de webhooks de Apify y del store de estado de runs
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Añadir api_service al path
+api_service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(api_service_dir))
+
+from app.api.routes.apify.webhooks import webhook_routes  # noqa: E402
+from app.services import run_status_store  # noqa: E402
+from app.services.run_status_store import (  # noqa: E402
+    RunStatusStore, get_run_status_store
+)
+
+PAYLOAD = {
+    "eventType": "ACTOR.RUN.SUCCEEDED",
+    "resource": {
+        "id": "run1", "status": "SUCCEEDED",
+        "finishedAt": "2025-11-20T10:05:00.000Z",
+        "defaultDatasetId": "ds1"
+    }
+}
+
+
+@pytest.fixture
+def store():
+    return RunStatusStore()
+
+
+@pytest.fixture
+def api(store, monkeypatch):
+    monkeypatch.setenv("APIFY_WEBHOOK_SECRET", "s3cret")
+    app = FastAPI()
+    app.include_router(webhook_routes.router, prefix="/webhook")
+    app.dependency_overrides[get_run_status_store] = lambda: store
+    return TestClient(app)
+
+
+class TestApifyWebhook:
+    """Tests del webhook de fin de run"""
+
+    def test_webhook_stores_run(self, api, store):
+        resp = api.post(
+            "/webhook", json=PAYLOAD,
+            headers={"X-Apify-Webhook-Secret": "s3cret"}
+        )
+        assert resp.status_code == 204
+        data = asyncio.run(store.get("run1"))
+        assert data["status"] == "SUCCEEDED"
+        assert data["defaultDatasetId"] == "ds1"
+
+    def test_webhook_rejects_bad_secret(self, api, store):
+        resp = api.post(
+            "/webhook", json=PAYLOAD,
+            headers={"X-Apify-Webhook-Secret": "otro"}
+        )
+        assert resp.status_code == 401
+
+    def test_webhook_invalid_payload(self, api):
+        resp = api.post(
+            "/webhook", json={"eventType": "x"},
+            headers={"X-Apify-Webhook-Secret": "s3cret"}
+        )
+        assert resp.status_code == 400
+
+    def test_store_expires(self):
+        store = RunStatusStore(ttl=-1)
+        asyncio.run(store.set("run1", {"status": "FAILED"}))
+        assert asyncio.run(store.get("run1")) is None
+
+    def test_store_prunes_expired_on_set(self, monkeypatch):
+        clock = [0.0]
+        monkeypatch.setattr(run_status_store.time, "monotonic", lambda: clock[0])
+        store = RunStatusStore(ttl=10)
+        asyncio.run(store.set("run1", {"status": "FAILED"}))
+        asyncio.run(store.set("run2", {"status": "FAILED"}))
+        clock[0] = 5.0
+        asyncio.run(store.set("run1", {"status": "SUCCEEDED"}))
+        clock[0] = 12.0
+        asyncio.run(store.set("run3", {"status": "RUNNING"}))
+        # run2 expiró y se poda sin leerlo; run1 se renovó a los 5s
+        assert list(store._memory) == ["run1", "run3"]
+
+    def test_store_falls_back_to_memory_when_redis_down(self):
+        class DownRedis:
+            async def get(self, key):
+                raise ConnectionError("redis caído")
+
+            async def set(self, key, value, ex):
+                raise ConnectionError("redis caído")
+
+        store = RunStatusStore()
+        store._redis = DownRedis()
+        asyncio.run(store.set("run1", {"status": "SUCCEEDED"}))
+        assert asyncio.run(store.get("run1")) == {"status": "SUCCEEDED"}